@@ -1,34 +1,56 @@
 import warnings
-warnings.filterwarnings('ignore')
-import argparse
-from pycocotools.coco import COCO
-from pycocotools.cocoeval import COCOeval
-from tidecv import TIDE, datasets
 
+warnings.filterwarnings("ignore")
+import argparse
+from ultralytics.utils.metrics import COCOEvaluator
 
 
 def parse_opt():
     parser = argparse.ArgumentParser()
 
     ## visdrone 2019 dataset
-    parser.add_argument('--anno_json', type=str, default=r'E:\PycharmProject\Datasets\CV\Visdrone2019\Task1\VisDrone2019-DET-test-dev\data.json', help='label coco json path')
-    parser.add_argument('--pred_json', type=str, default='runs/val/visdrone/yolov5l/predictions.json', help='pred coco json path')
-    
+    parser.add_argument("--anno_json", type=str, required=True, help="label coco json path")
+    parser.add_argument(
+        "--pred_json", type=str, default="runs/val/visdrone/yolov5l/predictions.json", help="pred coco json path"
+    )
+    parser.add_argument(
+        "--max_dets", type=int, nargs=3, default=[1, 10, 100], help="maxDets for AR, last one is used for AP"
+    )
+    parser.add_argument(
+        "--pycocotools",
+        action="store_true",
+        help="evaluate with pycocotools COCOeval instead of the built-in evaluator",
+    )
+    parser.add_argument("--tide", action="store_true", help="run TIDE error analysis")
+
     return parser.parse_known_args()[0]
 
-if __name__ == '__main__':
+
+if __name__ == "__main__":
     opt = parse_opt()
     anno_json = opt.anno_json
     pred_json = opt.pred_json
-    
-    anno = COCO(anno_json)  # init annotations api
-    pred = anno.loadRes(pred_json)  # init predictions api
-    eval = COCOeval(anno, pred, 'bbox')
-    eval.evaluate()
-    eval.accumulate()
-    eval.summarize()
-
-    tide = TIDE()
-    tide.evaluate_range(datasets.COCO(anno_json), datasets.COCOResult(pred_json), mode=TIDE.BOX)
-    tide.summarize()
-    tide.plot(out_dir='result')
\ No newline at end of file
+
+    if opt.pycocotools:
+        from pycocotools.coco import COCO
+        from pycocotools.cocoeval import COCOeval
+
+        anno = COCO(anno_json)  # init annotations api
+        pred = anno.loadRes(pred_json)  # init predictions api
+        eval = COCOeval(anno, pred, "bbox")
+        eval.params.maxDets = opt.max_dets
+        eval.evaluate()
+        eval.accumulate()
+        eval.summarize()
+    else:
+        evaluator = COCOEvaluator.from_coco(anno_json, pred_json, max_dets=opt.max_dets)
+        evaluator.evaluate()
+        print(evaluator.summary())
+
+    if opt.tide:
+        from tidecv import TIDE, datasets
+
+        tide = TIDE()
+        tide.evaluate_range(datasets.COCO(anno_json), datasets.COCOResult(pred_json), mode=TIDE.BOX)
+        tide.summarize()
+        tide.plot(out_dir="result")
@@ -2,8 +2,10 @@
 
 import contextlib
 import csv
+import time
 import urllib
 from copy import copy
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
 import cv2
@@ -160,6 +162,89 @@ def test_predict_grey_and_4ch():
         f.unlink()  # cleanup
 
 
+@pytest.mark.parametrize("slice_merge", ["nms", "wbf"])
+def test_predict_sliced(slice_merge):
+    """Test sliced inference on large images returns one full-frame Results object per image."""
+    model = YOLO(CFG)
+    ims = [np.zeros((900, 1200, 3), dtype=np.uint8), np.zeros((200, 300, 3), dtype=np.uint8)]
+    results = model(ims, imgsz=320, slice=True, slice_size=320, slice_merge=slice_merge, conf=0.001)
+    assert len(results) == len(ims)
+    for r, im in zip(results, ims):
+        assert r.orig_shape == im.shape[:2]
+        assert (r.boxes.xyxy[:, 2] <= im.shape[1]).all() and (r.boxes.xyxy[:, 3] <= im.shape[0]).all()
+
+
+def test_predict_preprocess_buffer():
+    """Test letterboxing into the reusable batch buffer matches the stack-and-copy preprocessing path exactly."""
+    model = YOLO(CFG)
+    for shapes in [(480, 640)] * 3, [(480, 640), (300, 500)]:
+        ims = [np.random.randint(0, 255, (*shape, 3), dtype=np.uint8) for shape in shapes]
+        model(ims, imgsz=320)
+        predictor = model.predictor
+        im = np.stack(predictor.pre_transform(ims))
+        expected = torch.from_numpy(np.ascontiguousarray(im[..., ::-1].transpose((0, 3, 1, 2)))).float() / 255
+        assert torch.equal(predictor.preprocess(ims), expected)
+        letterbox = predictor.get_letterbox(ims)
+        assert predictor.ratio_pad == [(r, (pad[2], pad[0])) for r, _, pad in map(letterbox.get_params, shapes)]
+        with ThreadPool(2) as pool:
+            out = np.empty_like(im)
+            letterbox.batch(ims, out, pool=pool)
+            assert np.array_equal(out, im)
+
+
+def test_predict_pipeline():
+    """Test pipelined prediction matches sequential prediction in order and results, and reports pipeline stats."""
+    model = YOLO(CFG)
+    ims = [np.random.randint(0, 255, (320 + 32 * i, 320, 3), dtype=np.uint8) for i in range(5)]
+    sequential = model(ims, imgsz=160, conf=0.001)
+    pipelined = model(ims, imgsz=160, conf=0.001, pipeline=True)
+    assert len(pipelined) == len(ims)
+    for a, b in zip(sequential, pipelined):
+        assert a.orig_shape == b.orig_shape and torch.allclose(a.boxes.data, b.boxes.data)
+        assert {"inference_queue", "inference_util", "postprocess_util"} <= b.speed.keys()
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+def test_predict_pipeline_batch_start():
+    """Test pipelined prediction runs 'on_predict_batch_start' before each batch is inferred, as sequential does."""
+    source = TMP / "pipeline"
+    source.mkdir(parents=True, exist_ok=True)
+    for i in range(4):
+        cv2.imwrite(str(source / f"{i}.jpg"), np.random.randint(0, 255, (96 + 32 * i, 128, 3), dtype=np.uint8))
+    model = YOLO(CFG)
+    events = []
+    model.add_callback("on_predict_batch_start", lambda p: events.append(("start", p.batch[0][0])))
+    model.add_callback("on_predict_postprocess_end", lambda p: events.append(("end", p.batch[0][0])))
+    model.model.register_forward_pre_hook(lambda m, x: events.append(("infer", None)))
+    for pipeline in False, True:
+        events.clear()
+        model.predict(source, imgsz=64, pipeline=pipeline)
+        batches = events[next(i for i, e in enumerate(events) if e[0] == "start") :]  # skip any warmup
+        starts, infers, ends = ([i for i, e in enumerate(batches) if e[0] == k] for k in ("start", "infer", "end"))
+        assert len(starts) == len(infers) == len(ends) == 4
+        assert all(s < i < e for s, i, e in zip(starts, infers, ends))
+        assert [batches[i][1] for i in starts] == [batches[i][1] for i in ends]
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+def test_predict_pipeline_overlap():
+    """Test pipelined prediction preprocesses the next batches while the caller consumes results, keeping their state."""
+    source = TMP / "pipeline_overlap"
+    source.mkdir(parents=True, exist_ok=True)
+    for i in range(8):
+        cv2.imwrite(str(source / f"{i}.jpg"), np.random.randint(0, 255, (64 + 32 * i, 128, 3), dtype=np.uint8))
+    model = YOLO(CFG)
+    consuming, overlapped = [False], []
+    model.add_callback("on_predict_batch_start", lambda p: overlapped.append(consuming[0]))
+    sequential = model.predict(source, imgsz=64, conf=0.001)
+    for a, b in zip(sequential, model.predict(source, imgsz=64, conf=0.001, stream=True, pipeline=True)):
+        consuming[0] = True
+        time.sleep(0.1)  # the caller's loop body
+        consuming[0] = False
+        assert a.path == b.path and a.orig_shape == b.orig_shape and torch.allclose(a.boxes.data, b.boxes.data)
+    assert any(overlapped)  # batches started while the caller held a result
+
+
 @pytest.mark.slow
 @pytest.mark.skipif(not ONLINE, reason="environment is offline")
 @pytest.mark.skipif(is_github_action_running(), reason="No auth https://github.com/JuanBindez/pytubefix/issues/166")
@@ -197,11 +282,195 @@ def test_track_stream():
         model.track(video_url, imgsz=160, tracker=tracker)
 
 
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+def test_track_pipeline_gmc_async():
+    """Test that pipelined tracking submits GMC frames ahead from the preprocess stage and applies them all in order."""
+    from ultralytics.trackers.utils.gmc import GMC
+
+    base = cv2.GaussianBlur(np.random.default_rng(0).integers(0, 255, (200, 240, 3), dtype=np.uint8), (0, 0), 3)
+    writer = cv2.VideoWriter(str(TMP / "gmc.avi"), cv2.VideoWriter_fourcc(*"MJPG"), 30, (160, 128))
+    for t in range(8):
+        writer.write(np.ascontiguousarray(base[4 * t : 4 * t + 128, 6 * t : 6 * t + 160]))
+    writer.release()
+    with open(ROOT / "cfg/trackers/botsort.yaml", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    data.update(gmc_method="klt", gmc_async=True)
+    tracker = TMP / "botsort-gmc-async.yaml"
+    with open(tracker, "w", encoding="utf-8") as f:
+        yaml.safe_dump(data, f)
+
+    from unittest.mock import patch
+
+    events = []  # (method, frame) of each GMC call, holding the frames so that they can be compared by identity
+    submit, apply = GMC.submit, GMC.apply
+
+    def record(method, fn):
+        """Wrap a GMC method to record its calls in 'events'."""
+        return lambda self, frame, *args: events.append((method, frame)) or fn(self, frame, *args)
+
+    model = YOLO(CFG)
+    with patch.object(GMC, "submit", record("submit", submit)), patch.object(GMC, "apply", record("apply", apply)):
+        model.track(TMP / "gmc.avi", imgsz=64, conf=0.001, tracker=tracker, pipeline=True)
+    gmc = model.predictor.trackers[0].gmc
+    submitted, applied = ([x for e, x in events if e == k] for k in ("submit", "apply"))
+    assert len(submitted) == len(applied) == 8 and all(a is b for a, b in zip(submitted, applied))  # in order
+    assert all(next(e for e, y in events if y is x) == "submit" for x in submitted)  # submitted before applied
+    assert "wait" in gmc.times and not gmc._pending
+
+
+def test_track_table():
+    """Test TrackTable slot reuse and growth, and that BYTETracker keeps IDs of moving objects across frames."""
+    from ultralytics.trackers import BYTETracker
+    from ultralytics.trackers.basetrack import TrackState, TrackTable
+    from ultralytics.utils import IterableSimpleNamespace
+
+    table = TrackTable(capacity=2)
+    slots = table.add(3)  # grows beyond capacity
+    table.state[slots] = TrackState.Tracked
+    table.release(slots[:1])
+    assert len(table) == 2 and table.add(1)[0] == slots[0] and table.state[slots[0]] == TrackState.New
+
+    with open(ROOT / "cfg/trackers/bytetrack.yaml", encoding="utf-8") as f:
+        tracker = BYTETracker(IterableSimpleNamespace(**yaml.safe_load(f)), frame_rate=30)
+    xywh = np.array([[50, 50, 20, 40], [200, 100, 30, 30]], dtype=np.float32)
+    for i in range(5):
+        results = IterableSimpleNamespace(conf=np.array([0.9, 0.8]), xywh=xywh + 2 * i, cls=np.zeros(2))
+        tracks = tracker.update(results)
+    assert tracks.shape == (2, 8) and tracks[:, 4].tolist() == [1, 2] and tracks[:, 7].tolist() == [0, 1]
+
+
+def test_multi_stream_tracker():
+    """Test that MultiStreamTracker updates each stream's tracker in order for full and partial batches."""
+    from ultralytics.engine.results import Boxes
+    from ultralytics.trackers.track import MultiStreamTracker
+    from ultralytics.utils import IterableSimpleNamespace
+
+    with open(ROOT / "cfg/trackers/bytetrack.yaml", encoding="utf-8") as f:
+        trackers = MultiStreamTracker(IterableSimpleNamespace(**yaml.safe_load(f)), streams=3)
+    for i, ids in enumerate([[0, 1, 2], [0, 2], [0, 1, 2]]):
+        dets = [Boxes(np.array([[10.0 + i + 100 * j, 10, 50 + i + 100 * j, 60, 0.9, 0]]), (480, 640)) for j in ids]
+        dets[-1] = Boxes(np.zeros((0, 6)), (480, 640))  # stream without detections
+        tracks = trackers.update(dets, [None] * len(ids), ids)
+        assert tracks[-1] is None and all(len(x) == 1 for x in tracks[:-1])
+    assert [trackers[j].frame_id for j in range(len(trackers))] == [3, 2, 0]  # empty frames are not applied
+
+
+def test_kalman_multi_update():
+    """Test batched Kalman filter correction and gating against per-track calls."""
+    from ultralytics.trackers.utils.kalman_filter import KalmanFilterXYAH, KalmanFilterXYWH
+
+    z = np.array([[100, 50, 0.5, 40], [300, 200, 1.5, 20], [20, 400, 1.0, 80]])
+    for kf in KalmanFilterXYAH(), KalmanFilterXYWH():
+        mean, cov = map(np.stack, zip(*(kf.initiate(x) for x in z)))
+        mean, cov = kf.multi_predict(mean, cov)
+        new_mean, new_cov = kf.multi_update(mean, cov, z + 1)
+        for i in range(len(z)):
+            m, c = kf.update(mean[i], cov[i], z[i] + 1)
+            assert np.allclose(new_mean[i], m) and np.allclose(new_cov[i], c)
+            assert np.allclose(kf.multi_gating_distance(mean, cov, z)[i], kf.gating_distance(mean[i], cov[i], z))
+
+
+def test_gmc_klt():
+    """Test that KLT motion compensation recovers a known camera translation, also for frames submitted ahead."""
+    from ultralytics.trackers.utils.gmc import GMC
+
+    base = cv2.GaussianBlur(np.random.default_rng(0).integers(0, 255, (560, 720), dtype=np.uint8), (0, 0), 3)
+    frames = [cv2.cvtColor(base[2 * t : 2 * t + 480, 3 * t : 3 * t + 640], cv2.COLOR_GRAY2BGR) for t in range(4)]
+    for ahead in 0, 1, 3:  # number of frames submitted ahead of apply()
+        gmc = GMC(method="klt")
+        for frame in frames[:ahead]:
+            gmc.submit(frame)
+        for i, frame in enumerate(frames):
+            if ahead and i + ahead < len(frames):
+                gmc.submit(frames[i + ahead])
+            H = gmc.apply(frame, np.array([[100, 100, 200, 300]]))
+            assert np.allclose(H[:, 2], [-3, -2] if i else 0, atol=0.1)
+        assert ("wait" in gmc.times) == bool(ahead) and gmc.times["total"] > 0 and not gmc._pending
+
+
+def test_reid_roi_embeddings():
+    """Test ROI-align pooling of ReID embeddings from feature maps at the letterboxed box locations."""
+    from ultralytics.trackers.utils.reid import roi_embeddings
+
+    feats = []
+    for s in 8, 16, 32:  # channels hold the x and y input pixel coordinates of each cell center
+        yx = torch.meshgrid(torch.arange(640 // s), torch.arange(640 // s), indexing="ij")
+        feats.append(torch.stack(yx[::-1])[None].float().add(0.5).mul(s).repeat(2, 1, 1, 1))
+    boxes = [np.array([[80, 180, 120, 220]]), np.zeros((0, 4))]
+    emb = roi_embeddings(feats, [8, 16, 32], boxes, [(480, 640), (480, 640)])  # 80 pixels of top padding
+    assert emb[0].shape == (1, 6) and emb[1].shape == (0, 6)
+    assert np.allclose(emb[0][0, :2], np.array([100, 280]) / np.hypot(100, 280), atol=1e-3)
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+@pytest.mark.parametrize("policy", ["buffer", "drop_oldest"])
+def test_load_streams_scheduler(policy):
+    """Test LoadStreams partial batches with a latency budget, priorities and per-stream lag and drop counters."""
+    from unittest.mock import patch
+
+    from ultralytics.data.loaders import LoadStreams
+
+    for name in "ab":
+        writer = cv2.VideoWriter(str(TMP / f"{name}.avi"), cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+        for k in range(40):
+            writer.write(np.full((48, 64, 3), k, dtype=np.uint8))
+        writer.release()
+    (TMP / "ab.streams").write_text(f"{TMP / 'a.avi'}\n{TMP / 'b.avi'}\n")
+
+    with patch("cv2.waitKey", return_value=-1), patch("cv2.destroyAllWindows"):  # headless OpenCV
+        dataset = LoadStreams(str(TMP / "ab.streams"), policy=policy, latency=0.01, priority=[1, 0], batch=1)
+        batches = list(dataset)
+    assert all(len(paths) == len(im0s) == len(s) == 1 for paths, im0s, s in batches)
+    assert sum(dataset.dropped) + len(batches) == 80  # every frame is either batched or dropped
+    assert policy == "drop_oldest" or not any(dataset.dropped)
+    assert all(lag >= 0 for lag in dataset.lag)
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+def test_load_streams_close():
+    """Test LoadStreams stops promptly when one stream ends while another is still buffering frames."""
+    from unittest.mock import patch
+
+    from ultralytics.data.loaders import LoadStreams
+
+    for name, n in ("short", 5), ("long", 200):
+        writer = cv2.VideoWriter(str(TMP / f"{name}.avi"), cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+        for k in range(n):
+            writer.write(np.full((48, 64, 3), k, dtype=np.uint8))
+        writer.release()
+    (TMP / "close.streams").write_text(f"{TMP / 'short.avi'}\n{TMP / 'long.avi'}\n")
+
+    with patch("cv2.waitKey", return_value=-1), patch("cv2.destroyAllWindows"):  # headless OpenCV
+        dataset = LoadStreams(str(TMP / "close.streams"), buffer=True)
+        t = time.perf_counter()
+        batches = list(dataset)
+        t = time.perf_counter() - t
+    assert len(batches) <= 5 and t < 2  # the long stream's reader thread is joined without waiting out its timeout
+
+
 def test_val():
     """Test the validation mode of the YOLO model."""
     YOLO(MODEL).val(data="coco8.yaml", imgsz=32, save_hybrid=True)
 
 
+def _shard_val_worker(rank, world_size, queue, kwargs):
+    """Validate one shard of coco8 in a CPU 'gloo' process group and report the results of this rank."""
+    torch.distributed.init_process_group("gloo", init_method="tcp://127.0.0.1:29517", rank=rank, world_size=world_size)
+    metrics = YOLO(MODEL).val(**kwargs, shard_val=True, name=f"shard_val{rank}", exist_ok=True)
+    queue.put(metrics.results_dict)
+    torch.distributed.destroy_process_group()
+
+
+def test_val_shard():
+    """Test that validation sharded across DDP ranks gives the same metrics as single-process validation."""
+    kwargs = dict(data="coco8.yaml", imgsz=64, batch=3, device="cpu", workers=0, plots=False, project=TMP)
+    expected = YOLO(MODEL).val(**kwargs).results_dict
+    queue = torch.multiprocessing.get_context("spawn").SimpleQueue()
+    torch.multiprocessing.spawn(_shard_val_worker, args=(2, queue, kwargs), nprocs=2)
+    for _ in range(2):
+        assert queue.get() == expected
+
+
 def test_train_scratch():
     """Test training the YOLO model from scratch using the provided configuration."""
     model = YOLO(CFG)
@@ -333,6 +602,190 @@ def test_data_converter():
     coco80_to_coco91_class()
 
 
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+def test_data_label_cache():
+    """Test the memory-mapped label cache is reused and only re-verifies label files changed since it was saved."""
+    from unittest import mock
+
+    from ultralytics.data import YOLODataset
+    from ultralytics.data import dataset as dataset_module
+    from ultralytics.data.utils import LabelStore
+
+    (TMP / "cache" / "images").mkdir(parents=True, exist_ok=True)
+    (TMP / "cache" / "labels").mkdir(parents=True, exist_ok=True)
+    for i in range(4):
+        cv2.imwrite(str(TMP / "cache" / "images" / f"{i}.jpg"), np.full((48, 64, 3), 50 * i, dtype=np.uint8))
+        (TMP / "cache" / "labels" / f"{i}.txt").write_text(
+            "".join(f"{j % 2} 0.5 0.5 0.{j + 1} 0.3\n" for j in range(i))
+        )
+
+    def build():
+        """Build the dataset counting how many files are verified."""
+        with mock.patch.object(dataset_module, "verify_image_label", wraps=dataset_module.verify_image_label) as m:
+            dataset = YOLODataset(img_path=TMP / "cache" / "images", data={"names": {0: "a", 1: "b"}}, augment=False)
+        return dataset, m.call_count
+
+    dataset, verified = build()
+    assert verified == 4 and isinstance(dataset.labels, LabelStore) and dataset.labels.path is not None
+    assert [len(lb["cls"]) for lb in dataset.labels] == [0, 1, 2, 3]
+    assert build()[1] == 0  # cache up to date
+
+    (TMP / "cache" / "labels" / "2.txt").write_text("1 0.5 0.5 0.4 0.4\n1 0.1 0.1 0.1 0.1\n0 0.2 0.2 0.1 0.1\n")
+    dataset, verified = build()
+    assert verified == 1
+    assert dataset.labels[2]["cls"][:, 0].tolist() == [1, 1, 0]
+    assert np.allclose(dataset.labels[3]["bboxes"], [[0.5, 0.5, 0.1, 0.3], [0.5, 0.5, 0.2, 0.3], [0.5, 0.5, 0.3, 0.3]])
+    assert len(dataset[2]["cls"]) == 3
+
+    (TMP / "cache" / "images" / "0.jpg").unlink()
+    dataset, verified = build()
+    assert verified == 0 and len(dataset) == 3
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+@pytest.mark.parametrize("cache", ["shm", "pack"])
+def test_data_image_cache(cache):
+    """Test images cached in shared memory or a pack file match uncached images and are attached again when pickled."""
+    import pickle
+
+    from ultralytics.data import YOLODataset
+
+    (TMP / cache / "images").mkdir(parents=True, exist_ok=True)
+    (TMP / cache / "labels").mkdir(parents=True, exist_ok=True)
+    for i in range(3):
+        cv2.imwrite(
+            str(TMP / cache / "images" / f"{i}.png"), np.random.randint(0, 255, (90 * i + 50, 120, 3), np.uint8)
+        )
+        (TMP / cache / "labels" / f"{i}.txt").write_text("0 0.5 0.5 0.2 0.2\n")
+    kwargs = dict(img_path=TMP / cache / "images", data={"names": {0: "a"}}, imgsz=96, augment=False)
+    dataset, reference = YOLODataset(cache=cache, **kwargs), YOLODataset(cache=False, **kwargs)
+    assert dataset.cache == cache
+    for i in range(3):
+        im, hw0, hw = dataset.load_image(i)
+        assert not im.flags.writeable and hw0 == reference.load_image(i)[1] and hw == im.shape[:2]
+        assert np.array_equal(im, reference.load_image(i)[0])
+    attached = pickle.loads(pickle.dumps(dataset))
+    assert all(not im.flags.owndata for im in attached.ims) and np.array_equal(attached.ims[2], dataset.ims[2])
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+@pytest.mark.parametrize("cache", ["shm", "pack"])
+def test_data_image_cache_mosaic(cache):
+    """Test augmented datasets attached to an existing image cache seed the mosaic buffer with the cached images."""
+    import pickle
+
+    from ultralytics.data import YOLODataset
+
+    path = TMP / f"{cache}-mosaic"
+    (path / "images").mkdir(parents=True, exist_ok=True)
+    (path / "labels").mkdir(parents=True, exist_ok=True)
+    for i in range(4):
+        cv2.imwrite(str(path / "images" / f"{i}.png"), np.random.randint(0, 255, (30 * i + 50, 120, 3), np.uint8))
+        (path / "labels" / f"{i}.txt").write_text("0 0.5 0.5 0.2 0.2\n")
+    kwargs = dict(img_path=path / "images", data={"names": {0: "a"}}, imgsz=96, augment=True, batch_size=2)
+    datasets = [YOLODataset(cache=cache, hyp=copy(DEFAULT_CFG), **kwargs) for _ in range(2)]  # build, then reuse
+    datasets.append(pickle.loads(pickle.dumps(datasets[0])))  # attached again, as in dataloader workers
+    for dataset in datasets:
+        assert dataset.cache == cache and sorted(dataset.buffer) == [0, 1, 2, 3]
+        assert dataset[0]["img"].shape == (3, 96, 96)  # mosaic draws from the buffer
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+@pytest.mark.parametrize("decoder", ["turbo", "pil"])
+def test_data_decode_image(decoder):
+    """Test reduced JPEG decoding picks the largest power-of-two reduction that still covers the target size."""
+    from ultralytics.data.utils import decode_image
+
+    f = TMP / "decode.jpg"
+    cv2.imwrite(str(f), cv2.resize(cv2.imread(str(SOURCE)), (3000, 2000)))
+    im, shape = decode_image(f, 640, decoder)
+    assert im.shape[:2] == (500, 750) and shape == (2000, 3000)  # 1/4, as 1/8 would be 375x250
+    assert decode_image(f, (640, 640), decoder, stretch=True)[0].shape[:2] == (1000, 1500)
+    assert decode_image(f, None, decoder)[0].shape[:2] == (2000, 3000)
+    full = cv2.resize(decode_image(f)[0], (750, 500), interpolation=cv2.INTER_AREA)
+    assert np.abs(im.astype(int) - full).mean() < 2
+    assert YOLO(CFG).predict(f, imgsz=160, decoder=decoder)[0].orig_shape == (2000, 3000)  # full decode to predict
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+@pytest.mark.parametrize("n", [4, 9])
+def test_data_mosaic_fuse(n):
+    """Test warping mosaic tiles directly matches warping the mosaic canvas up to interpolation along tile seams."""
+    import random
+
+    from ultralytics.data import YOLODataset
+    from ultralytics.data.augment import Compose, Mosaic, RandomPerspective
+
+    (TMP / "mosaic" / "images").mkdir(parents=True, exist_ok=True)
+    (TMP / "mosaic" / "labels").mkdir(parents=True, exist_ok=True)
+    for i in range(4):
+        cv2.imwrite(str(TMP / "mosaic" / "images" / f"{i}.png"), np.full((60 + 20 * i, 96, 3), 60 * i, np.uint8))
+        (TMP / "mosaic" / "labels" / f"{i}.txt").write_text(f"0 0.5 0.5 0.{i + 2} 0.4\n")
+    dataset = YOLODataset(img_path=TMP / "mosaic" / "images", data={"names": {0: "a"}}, imgsz=96, augment=False)
+    dataset.buffer = list(range(4))  # mosaic candidates
+    affine = RandomPerspective(degrees=10.0, translate=0.1, scale=0.5, shear=2.0)
+    results = []
+    for fuse in False, True:
+        random.seed(0)
+        transform = Compose([Mosaic(dataset, imgsz=96, n=n, fuse=fuse), affine])
+        results.append([transform(dataset.get_image_and_label(i)) for i in range(4)])
+    for a, b in zip(*results):
+        assert a["img"].shape == b["img"].shape == (96, 96, 3)
+        assert np.array_equal(a["cls"], b["cls"]) and np.allclose(a["instances"].bboxes, b["instances"].bboxes)
+        assert (a["img"] != b["img"]).mean() < 0.05  # tile seams only
+
+
+def test_data_batch_augment():
+    """Test device-side batch augmentation keeps boxes and masks on their objects and drops vanished instances."""
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data.augment import BatchAugment
+
+    hyp = {"degrees": 30.0, "shear": 5.0, "flipud": 0.5, "fliplr": 0.5, "hsv_h": 0.0, "hsv_s": 0.0, "hsv_v": 0.0}
+    augment = BatchAugment(get_cfg(overrides=hyp))
+    img, masks = torch.zeros(4, 3, 128, 128, dtype=torch.uint8), torch.zeros(4, 32, 32, dtype=torch.uint8)
+    bboxes = []
+    for i in range(4):
+        x1, y1 = 24 + 8 * i, 40 - 4 * i
+        img[i, :, y1 : y1 + 32, x1 : x1 + 48] = 255
+        masks[i, y1 // 4 : y1 // 4 + 8, x1 // 4 : x1 // 4 + 12] = 1
+        bboxes.append([(x1 + 24) / 128, (y1 + 16) / 128, 48 / 128, 32 / 128])
+    bboxes.insert(1, [0.9, 0.9, 0.01, 0.01])  # too small to survive as a box
+    masks[0, 30, 30] = 2
+    batch = {
+        "img": img,
+        "bboxes": torch.tensor(bboxes),
+        "cls": torch.zeros(5, 1),
+        "batch_idx": torch.tensor([0.0, 0.0, 1.0, 2.0, 3.0]),
+        "masks": masks,
+    }
+    batch = augment(batch)
+    assert batch["bboxes"].shape == (4, 4) and batch["batch_idx"].tolist() == [0, 1, 2, 3]
+    assert batch["masks"].max() == 1  # vanished instance removed from the overlap mask
+    for i, box in enumerate(batch["bboxes"] * 128):
+        y, x = torch.nonzero(batch["img"][i, 0] > 200, as_tuple=True)
+        content = torch.stack([x.min(), y.min(), x.max() + 1, y.max() + 1]).float()
+        assert torch.allclose(torch.cat([box[:2] - box[2:] / 2, box[:2] + box[2:] / 2]), content, atol=2)
+
+
+def test_data_batch_augment_obb_hsv():
+    """Test device-side refitting of oriented boxes against cv2.minAreaRect() and the multiplicative hue gain."""
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data.augment import BatchAugment
+    from ultralytics.utils.ops import xywhr2xyxyxyxy, xyxyxyxy2xywhr
+
+    torch.manual_seed(0)
+    rboxes = torch.cat((torch.rand(64, 2) * 100, torch.rand(64, 2) * 40 + 2, torch.rand(64, 1) * 1.5), 1)
+    corners = xywhr2xyxyxyxy(rboxes) + torch.randn(64, 4, 2)  # transformed quadrilaterals
+    fit, ref = BatchAugment._fit_rboxes(corners), xyxyxyxy2xywhr(corners.view(-1, 8))
+    assert torch.allclose(fit[:, 2] * fit[:, 3], ref[:, 2] * ref[:, 3], rtol=1e-3)
+    assert torch.allclose(BatchAugment._fit_rboxes(xywhr2xyxyxyxy(rboxes)), rboxes, atol=1e-3)
+
+    augment = BatchAugment(get_cfg(overrides={"hsv_h": 0.5, "hsv_s": 0.0, "hsv_v": 0.0}))
+    img = torch.zeros(4, 3, 8, 8, dtype=torch.uint8)
+    img[:, 0] = 255  # hue 0 is unchanged by a hue gain
+    assert torch.equal(augment.hsv(img), img)
+
+
 def test_data_annotator():
     """Test automatic annotation of data using detection and segmentation models."""
     from ultralytics.data.annotator import auto_annotate
@@ -438,6 +891,209 @@ def test_utils_ops():
     torch.allclose(boxes, xyxyxyxy2xywhr(xywhr2xyxyxyxy(boxes)), rtol=1e-3)
 
 
+@pytest.mark.parametrize(
+    "nm, rotated, multi_label", [(0, False, False), (0, False, True), (32, False, False), (0, True, False)]
+)
+def test_utils_ops_batched_nms(nm, rotated, multi_label):
+    """Test batched non_max_suppression() matches the per-image loop for detect, segment and OBB predictions."""
+    from ultralytics.utils.ops import non_max_suppression
+
+    nc, bs, n = 8, 4, 2000
+    x = torch.rand(bs, 4 + nc + nm + rotated, n)
+    x[:, :2] *= 320  # xy
+    x[:, 2:4] = x[:, 2:4] * 64 + 4  # wh
+    x[:, 4 : 4 + nc] = torch.randperm(bs * nc * n).view(bs, nc, n) / (bs * nc * n)  # unique scores
+    kwargs = dict(conf_thres=0.9, iou_thres=0.5, nc=nc, multi_label=multi_label, max_det=50, rotated=rotated)
+    for a, b in zip(non_max_suppression(x.clone(), **kwargs), non_max_suppression(x.clone(), batched=True, **kwargs)):
+        assert torch.equal(a[a[:, 4].argsort()], b[b[:, 4].argsort()])
+
+
+@pytest.mark.parametrize("threshold", [0.05, 0.45, 0.9])
+def test_utils_ops_nms_rotated_sparse(threshold):
+    """Test sparse nms_rotated() keeps exactly the same boxes as the dense probiou matrix, including when chunked."""
+    from ultralytics.utils.ops import nms_rotated
+
+    boxes = torch.rand(1500, 5)
+    boxes[:, :2] *= 1024  # xy
+    boxes[:, 2:4] = boxes[:, 2:4] * 60 + 4  # wh
+    boxes[:, 4] = (boxes[:, 4] - 0.5) * 3.1416  # r
+    scores = torch.rand(1500)
+    dense = nms_rotated(boxes, scores, threshold, sparse=False)
+    assert torch.equal(nms_rotated(boxes, scores, threshold), dense)
+    assert torch.equal(nms_rotated(boxes, scores, threshold, chunk=1000), dense)
+    assert len(nms_rotated(boxes[:0], scores[:0], threshold)) == 0
+
+
+def test_utils_match_predictions():
+    """Test vectorized match_predictions greedy matching and batched DetectionValidator matching."""
+    from ultralytics.models.yolo.detect import DetectionValidator
+
+    validator = DetectionValidator()
+    gt = torch.tensor([[0.0, 0, 10, 10], [20, 20, 30, 30]])
+    det = torch.tensor(
+        [[0.0, 0, 10, 9, 0.9, 0], [0, 0, 10, 10, 0.8, 0], [20, 20, 30, 30, 0.7, 1], [20, 20, 30, 27, 0.6, 1]]
+    )
+    correct = validator._process_batch(det, gt, torch.tensor([0.0, 1]))
+    assert correct.tolist() == [[True] * 9 + [False], [False] * 9 + [True], [True] * 10, [False] * 10]
+
+    detections, gt_bboxes, gt_cls = [], [], []
+    for n, m in (5, 3), (0, 2), (40, 0), (300, 60):
+        xy = torch.rand(n + m, 2) * 100
+        boxes = torch.cat([xy, xy + torch.rand(n + m, 2) * 40 + 1], 1)
+        detections.append(
+            torch.cat([boxes[:n], torch.rand(n, 1).sort(0, descending=True)[0], torch.randint(0, 3, (n, 1))], 1)
+        )
+        gt_bboxes.append(boxes[n:])
+        gt_cls.append(torch.randint(0, 3, (m,)).float())
+    for c, d, b, cls in zip(validator._process_batches(detections, gt_bboxes, gt_cls), detections, gt_bboxes, gt_cls):
+        assert torch.equal(c, validator._process_batch(d, b, cls))
+
+
+@pytest.mark.parametrize("obb", [False, True])
+def test_utils_confusion_matrix(obb):
+    """Test vectorized ConfusionMatrix.process_batch counts matches, duplicates, misses and background for boxes/OBB."""
+    from ultralytics.utils.metrics import ConfusionMatrix, batch_probiou, box_iou
+    from ultralytics.utils.ops import xyxy2xywh
+
+    gt = torch.tensor([[0.0, 0, 10, 10], [20, 20, 30, 30], [50, 50, 60, 60]])
+    det = torch.tensor([[0.0, 0, 10, 10], [0, 0, 10, 9], [20, 20, 30, 29], [80, 80, 90, 90], [50, 50, 60, 60]])
+    conf_cls = torch.tensor([[0.9, 0], [0.8, 1], [0.7, 2], [0.6, 1], [0.1, 2]])  # last one below conf
+    if obb:
+        gt, det = torch.cat([xyxy2xywh(gt), torch.zeros(3, 1)], 1), xyxy2xywh(det)
+    det = torch.cat([det, conf_cls] + ([torch.zeros(5, 1)] if obb else []), 1)
+
+    cm = ConfusionMatrix(nc=3)
+    cm.process_batch(det, gt, torch.tensor([0.0, 1, 2]))
+    cm.process_batch(None, gt[:1], torch.tensor([1.0]))  # missed ground truth
+    cm.process_batch(det, gt[:0], torch.zeros(0))  # no labels, all detections above conf are false positives
+    expected = [[1, 0, 0, 1], [0, 0, 0, 4], [0, 1, 0, 1], [0, 1, 1, 0]]  # rows predicted, columns true, last background
+    assert cm.matrix.tolist() == expected
+
+    def reference(matrix, detections, gt_bboxes, gt_cls):
+        """Per-element matching and counting, as ConfusionMatrix.process_batch did before it was vectorized."""
+        detections = detections[detections[:, 4] > cm.conf]
+        iou = (
+            batch_probiou(gt_bboxes, torch.cat([detections[:, :4], detections[:, -1:]], -1))
+            if obb
+            else box_iou(gt_bboxes, detections[:, :4])
+        )
+        i, j = torch.where(iou > cm.iou_thres)
+        matches = torch.stack([i, j, iou[i, j]], 1).numpy()
+        for k in 1, 0:  # keep the highest IoU match of each detection, then of each ground truth
+            matches = matches[matches[:, 2].argsort()[::-1]]
+            matches = matches[np.unique(matches[:, k], return_index=True)[1]]
+        m0, m1 = matches[:, :2].T.astype(int)
+        dc = detections[:, 5].int()
+        for g, gc in enumerate(gt_cls.int()):
+            matrix[(dc[m1[m0 == g]].item(), gc) if (m0 == g).sum() == 1 else (cm.nc, gc)] += 1
+        for d, c in enumerate(dc):
+            matrix[c, cm.nc] += d not in m1
+
+    cm, matrix = ConfusionMatrix(nc=5), np.zeros((6, 6))
+    for m, n in (0, 8), (6, 0), (30, 60), (80, 200):  # random scenes with jittered duplicate detections
+        gt = torch.rand(m, 2) * 512
+        gt = torch.cat([gt, gt + torch.rand(m, 2) * 60 + 4], 1)
+        det = gt[torch.randint(0, max(m, 1), (n,))] if m else torch.rand(n, 4) * 512
+        det = det + torch.randn(n, 4) * 4
+        det[:, 2:] = torch.maximum(det[:, 2:], det[:, :2] + 1)
+        if obb:
+            gt = torch.cat([xyxy2xywh(gt), torch.rand(m, 1)], 1)
+            det = xyxy2xywh(det)
+        det = torch.cat([det, torch.rand(n, 1), torch.randint(0, 5, (n, 1))] + ([torch.rand(n, 1)] if obb else []), 1)
+        gt_cls = torch.randint(0, 5, (m,)).float()
+        cm.process_batch(det, gt, gt_cls)
+        reference(matrix, det, gt, gt_cls)
+    assert np.array_equal(cm.matrix, matrix)
+
+
+def test_utils_metrics_ap_per_class():
+    """Test the vectorized ap_per_class matches a per-class compute_ap() and np.interp() loop, including ties."""
+    from ultralytics.utils.metrics import ap_per_class, compute_ap
+
+    rng = np.random.default_rng(0)
+    n, nc = 3000, 20
+    conf, pred_cls, target_cls = rng.random(n).round(2), rng.integers(0, nc + 2, n), rng.integers(0, nc, n // 2)
+    tp = rng.random((n, 10)) < np.linspace(0.7, 0.1, 10)
+    for c in range(nc + 2):  # at most one true positive per label
+        tp[pred_cls == c] &= tp[pred_cls == c].cumsum(0) <= (target_cls == c).sum()
+    results = ap_per_class(tp, conf, pred_cls, target_cls)
+
+    i = np.argsort(-conf)
+    tp, conf, pred_cls = tp[i], conf[i], pred_cls[i]
+    x, ap, p, r, prec_values = np.linspace(0, 1, 1000), [], [], [], []
+    for c in np.unique(target_cls):
+        k, n_l = pred_cls == c, (target_cls == c).sum()
+        tpc, fpc = tp[k].cumsum(0), (1 - tp[k]).cumsum(0)
+        recall, precision = tpc / (n_l + 1e-16), tpc / (tpc + fpc)
+        r.append(np.interp(-x, -conf[k], recall[:, 0], left=0))
+        p.append(np.interp(-x, -conf[k], precision[:, 0], left=1))
+        ap.append([compute_ap(recall[:, j], precision[:, j])[0] for j in range(10)])
+        _, mpre, mrec = compute_ap(recall[:, 0], precision[:, 0])
+        prec_values.append(np.interp(x, mrec, mpre))
+    for i, expected in (5, ap), (7, p), (8, r), (11, prec_values):  # AP, P, R and PR curves
+        np.testing.assert_allclose(results[i], expected, rtol=0, atol=1e-12)
+
+
+def test_utils_metrics_ap_accumulator():
+    """Test merged streaming APAccumulator histograms reproduce ap_per_class metrics within binning error."""
+    from ultralytics.utils.metrics import APAccumulator, ap_per_class
+
+    rng = np.random.default_rng(0)
+    n, nc = 20000, 5
+    conf, pred_cls, target_cls = rng.random(n) ** 2, rng.integers(0, nc, n), rng.integers(0, nc, n // 3)
+    tp = np.stack([rng.random(n) < conf * (1 - j / 12) for j in range(10)], 1)
+    a, b = APAccumulator(nc), APAccumulator(nc)
+    a.update(tp[::2], conf[::2], pred_cls[::2], target_cls[: n // 6])
+    b.update(tp[1::2], conf[1::2], pred_cls[1::2], target_cls[n // 6 :])
+    results, expected = a.merge(b).results(), ap_per_class(tp, conf, pred_cls, target_cls)
+    assert a.n.sum() == n and a.nt.sum() == len(target_cls)
+    for i in 2, 3, 5:  # precision, recall, AP
+        assert np.allclose(results[i], expected[i], atol=5e-3)
+
+
+@pytest.mark.skipif(not checks.check_requirements("pycocotools", install=False), reason="pycocotools not installed")
+@pytest.mark.parametrize("memory", [2**26, 4096])
+def test_utils_metrics_coco_evaluator(memory):
+    """Test COCOEvaluator reproduces pycocotools COCOeval precision, recall and stats on a synthetic dataset."""
+    from pycocotools.coco import COCO
+    from pycocotools.cocoeval import COCOeval
+
+    from ultralytics.utils.metrics import COCOEvaluator
+
+    rng = np.random.default_rng(0)
+    images, anns, dets = [], [], []
+    for i in range(1, 101):
+        images.append({"id": i})
+        for _ in range(rng.integers(0, 20)):
+            box = np.r_[rng.integers(0, 400, 2), rng.integers(4, 200, 2)] * 0.5  # xywh on a 0.5 grid
+            c = int(rng.integers(1, 6))
+            crowd = int(rng.random() < 0.05)
+            anns.append(dict(id=len(anns) + 1, image_id=i, category_id=c, bbox=box.tolist(), iscrowd=crowd))
+            anns[-1]["area"] = float(box[2] * box[3])
+            for _ in range(rng.integers(0, 4)):  # jittered detections, some with the wrong class
+                b = box + np.r_[rng.integers(-8, 8, 4)] * 0.5
+                c = c if rng.random() < 0.8 else int(rng.integers(1, 7))
+                dets.append(dict(image_id=i, category_id=c, bbox=b.clip(1).tolist(), score=float(rng.random())))
+        for _ in range(rng.integers(0, 60)):  # background detections, tied scores and > maxDets per class
+            b = np.r_[rng.integers(0, 400, 2), rng.integers(2, 200, 2)] * 0.5
+            c = int(rng.integers(1, 3))
+            dets.append(dict(image_id=i, category_id=c, bbox=b.tolist(), score=int(rng.integers(0, 10)) / 10))
+    anno = {"images": images, "annotations": anns, "categories": [{"id": c} for c in range(1, 6)]}
+
+    with contextlib.redirect_stdout(None):
+        gt = COCO()
+        gt.dataset = anno
+        gt.createIndex()
+        coco = COCOeval(gt, gt.loadRes(dets), "bbox")
+        coco.evaluate()
+        coco.accumulate()
+        coco.summarize()
+    evaluator = COCOEvaluator.from_coco(anno, dets, memory=memory)
+    assert np.allclose(evaluator.evaluate(), coco.stats)
+    assert np.allclose(evaluator.precision, coco.eval["precision"])
+    assert np.allclose(evaluator.recall, coco.eval["recall"])
+
+
 def test_utils_files():
     """Test file handling utilities including file age, date, and paths with spaces."""
     from ultralytics.utils.files import file_age, file_date, get_latest_run, spaces_in_path
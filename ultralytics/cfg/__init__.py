@@ -158,6 +158,7 @@ CFG_FLOAT_KEYS = frozenset(
         "shear",
         "time",
         "workspace",
+        "stream_latency",
         "batch",
     }
 )
@@ -185,6 +186,7 @@ CFG_FRACTION_KEYS = frozenset(
         "conf",
         "iou",
         "fraction",
+        "slice_overlap",
     }
 )
 CFG_INT_KEYS = frozenset(
@@ -200,6 +202,8 @@ CFG_INT_KEYS = frozenset(
         "line_width",
         "nbs",
         "save_period",
+        "slice_size",
+        "ap_bins",
     }
 )
 CFG_BOOL_KEYS = frozenset(
@@ -212,8 +216,11 @@ CFG_BOOL_KEYS = frozenset(
         "rect",
         "cos_lr",
         "overlap_mask",
+        "batch_augment",
         "val",
         "save_json",
+        "coco_eval",
+        "shard_val",
         "save_hybrid",
         "half",
         "dnn",
@@ -238,6 +245,9 @@ CFG_BOOL_KEYS = frozenset(
         "nms",
         "profile",
         "multi_scale",
+        "slice",
+        "slice_full",
+        "pipeline",
     }
 )
 
@@ -15,7 +15,8 @@ from ultralytics.utils import LOGGER, colorstr
 from ultralytics.utils.checks import check_version
 from ultralytics.utils.instance import Instances
 from ultralytics.utils.metrics import bbox_ioa
-from ultralytics.utils.ops import segment2box, xyxyxyxy2xywhr
+from ultralytics.utils.ops import regularize_rboxes, segment2box, xywhr2xyxyxyxy, xyxyxyxy2xywhr
+from ultralytics.utils.tal import TORCH_1_10
 from ultralytics.utils.torch_utils import TORCHVISION_0_10, TORCHVISION_0_11, TORCHVISION_0_13
 
 DEFAULT_MEAN = (0.0, 0.0, 0.0)
@@ -500,6 +501,7 @@ class Mosaic(BaseMixTransform):
         p (float): Probability of applying the mosaic augmentation. Must be in the range 0-1.
         n (int): The grid size, either 4 (for 2x2) or 9 (for 3x3).
         border (Tuple[int, int]): Border size for width and height.
+        fuse (bool): Whether the tiles are passed on to the following RandomPerspective instead of a mosaic canvas.
 
     Methods:
         get_indexes: Returns a list of random indexes from the dataset.
@@ -517,7 +519,7 @@ class Mosaic(BaseMixTransform):
         >>> augmented_labels = mosaic_aug(original_labels)
     """
 
-    def __init__(self, dataset, imgsz=640, p=1.0, n=4):
+    def __init__(self, dataset, imgsz=640, p=1.0, n=4, fuse=False):
         """
         Initializes the Mosaic augmentation object.
 
@@ -529,6 +531,9 @@ class Mosaic(BaseMixTransform):
             imgsz (int): Image size (height and width) after mosaic pipeline of a single image.
             p (float): Probability of applying the mosaic augmentation. Must be in the range 0-1.
             n (int): The grid size, either 4 (for 2x2) or 9 (for 3x3).
+            fuse (bool): If True, the mosaic must be followed directly by RandomPerspective. Instead of pasting the
+                images into a canvas, the visible tiles and their offsets are returned under 'mosaic_tiles' and the
+                warp samples them directly, so the canvas is never allocated, filled or copied.
 
         Examples:
             >>> from ultralytics.data.augment import Mosaic
@@ -541,6 +546,7 @@ class Mosaic(BaseMixTransform):
         self.imgsz = imgsz
         self.border = (-imgsz // 2, -imgsz // 2)  # width, height
         self.n = n
+        self.fuse = fuse
 
     def get_indexes(self, buffer=True):
         """
@@ -623,7 +629,7 @@ class Mosaic(BaseMixTransform):
             >>> print(result["img"].shape)
             (640, 640, 3)
         """
-        mosaic_labels = []
+        mosaic_labels, tiles = [], []
         s = self.imgsz
         for i in range(3):
             labels_patch = labels if i == 0 else labels["mix_labels"][i - 1]
@@ -633,7 +639,7 @@ class Mosaic(BaseMixTransform):
 
             # Place img in img3
             if i == 0:  # center
-                img3 = np.full((s * 3, s * 3, img.shape[2]), 114, dtype=np.uint8)  # base image with 3 tiles
+                img3 = None if self.fuse else np.full((s * 3, s * 3, img.shape[2]), 114, dtype=np.uint8)  # 3 tiles
                 h0, w0 = h, w
                 c = s, s, s + w, s + h  # xmin, ymin, xmax, ymax (base) coordinates
             elif i == 1:  # right
@@ -644,15 +650,20 @@ class Mosaic(BaseMixTransform):
             padw, padh = c[:2]
             x1, y1, x2, y2 = (max(x, 0) for x in c)  # allocate coordinates
 
-            img3[y1:y2, x1:x2] = img[y1 - padh :, x1 - padw :]  # img3[ymin:ymax, xmin:xmax]
+            if self.fuse:
+                tiles.append(self._crop_tile(img, c, s * 3))
+            else:
+                img3[y1:y2, x1:x2] = img[y1 - padh :, x1 - padw :]  # img3[ymin:ymax, xmin:xmax]
             # hp, wp = h, w  # height, width previous for next iteration
 
             # Labels assuming imgsz*2 mosaic size
             labels_patch = self._update_labels(labels_patch, padw + self.border[0], padh + self.border[1])
             mosaic_labels.append(labels_patch)
         final_labels = self._cat_labels(mosaic_labels)
-
-        final_labels["img"] = img3[-self.border[0] : self.border[0], -self.border[1] : self.border[1]]
+        if self.fuse:
+            final_labels["mosaic_tiles"] = tiles
+        else:
+            final_labels["img"] = img3[-self.border[0] : self.border[0], -self.border[1] : self.border[1]]
         return final_labels
 
     def _mosaic4(self, labels):
@@ -679,7 +690,7 @@ class Mosaic(BaseMixTransform):
             >>> result = mosaic._mosaic4(labels)
             >>> assert result["img"].shape == (1280, 1280, 3)
         """
-        mosaic_labels = []
+        mosaic_labels, tiles = [], []
         s = self.imgsz
         yc, xc = (int(random.uniform(-x, 2 * s + x)) for x in self.border)  # mosaic center x, y
         for i in range(4):
@@ -690,7 +701,7 @@ class Mosaic(BaseMixTransform):
 
             # Place img in img4
             if i == 0:  # top left
-                img4 = np.full((s * 2, s * 2, img.shape[2]), 114, dtype=np.uint8)  # base image with 4 tiles
+                img4 = None if self.fuse else np.full((s * 2, s * 2, img.shape[2]), 114, dtype=np.uint8)  # 4 tiles
                 x1a, y1a, x2a, y2a = max(xc - w, 0), max(yc - h, 0), xc, yc  # xmin, ymin, xmax, ymax (large image)
                 x1b, y1b, x2b, y2b = w - (x2a - x1a), h - (y2a - y1a), w, h  # xmin, ymin, xmax, ymax (small image)
             elif i == 1:  # top right
@@ -703,14 +714,20 @@ class Mosaic(BaseMixTransform):
                 x1a, y1a, x2a, y2a = xc, yc, min(xc + w, s * 2), min(s * 2, yc + h)
                 x1b, y1b, x2b, y2b = 0, 0, min(w, x2a - x1a), min(y2a - y1a, h)
 
-            img4[y1a:y2a, x1a:x2a] = img[y1b:y2b, x1b:x2b]  # img4[ymin:ymax, xmin:xmax]
+            if self.fuse:
+                tiles.append((img[y1b:y2b, x1b:x2b], x1a, y1a))
+            else:
+                img4[y1a:y2a, x1a:x2a] = img[y1b:y2b, x1b:x2b]  # img4[ymin:ymax, xmin:xmax]
             padw = x1a - x1b
             padh = y1a - y1b
 
             labels_patch = self._update_labels(labels_patch, padw, padh)
             mosaic_labels.append(labels_patch)
         final_labels = self._cat_labels(mosaic_labels)
-        final_labels["img"] = img4
+        if self.fuse:
+            final_labels["mosaic_tiles"] = tiles
+        else:
+            final_labels["img"] = img4
         return final_labels
 
     def _mosaic9(self, labels):
@@ -739,7 +756,7 @@ class Mosaic(BaseMixTransform):
             >>> mosaic_result = mosaic._mosaic9(input_labels)
             >>> mosaic_image = mosaic_result["img"]
         """
-        mosaic_labels = []
+        mosaic_labels, tiles = [], []
         s = self.imgsz
         hp, wp = -1, -1  # height, width previous
         for i in range(9):
@@ -750,7 +767,7 @@ class Mosaic(BaseMixTransform):
 
             # Place img in img9
             if i == 0:  # center
-                img9 = np.full((s * 3, s * 3, img.shape[2]), 114, dtype=np.uint8)  # base image with 4 tiles
+                img9 = None if self.fuse else np.full((s * 3, s * 3, img.shape[2]), 114, dtype=np.uint8)  # 9 tiles
                 h0, w0 = h, w
                 c = s, s, s + w, s + h  # xmin, ymin, xmax, ymax (base) coordinates
             elif i == 1:  # top
@@ -774,17 +791,45 @@ class Mosaic(BaseMixTransform):
             x1, y1, x2, y2 = (max(x, 0) for x in c)  # allocate coordinates
 
             # Image
-            img9[y1:y2, x1:x2] = img[y1 - padh :, x1 - padw :]  # img9[ymin:ymax, xmin:xmax]
+            if self.fuse:
+                tiles.append(self._crop_tile(img, c, s * 3))
+            else:
+                img9[y1:y2, x1:x2] = img[y1 - padh :, x1 - padw :]  # img9[ymin:ymax, xmin:xmax]
             hp, wp = h, w  # height, width previous for next iteration
 
             # Labels assuming imgsz*2 mosaic size
             labels_patch = self._update_labels(labels_patch, padw + self.border[0], padh + self.border[1])
             mosaic_labels.append(labels_patch)
         final_labels = self._cat_labels(mosaic_labels)
-
-        final_labels["img"] = img9[-self.border[0] : self.border[0], -self.border[1] : self.border[1]]
+        if self.fuse:
+            final_labels["mosaic_tiles"] = tiles
+        else:
+            final_labels["img"] = img9[-self.border[0] : self.border[0], -self.border[1] : self.border[1]]
         return final_labels
 
+    def _crop_tile(self, img, c, size):
+        """
+        Crops an image placed on a mosaic canvas to the part that remains after the mosaic border is removed.
+
+        Args:
+            img (np.ndarray): Image placed on the canvas.
+            c (Tuple[int, int, int, int]): Unclipped xyxy placement of the image on the canvas.
+            size (int): Size of the square canvas before the border crop.
+
+        Returns:
+            (Tuple[np.ndarray, int, int]): View of the visible part of the image and its x, y offset in the cropped
+                mosaic.
+
+        Examples:
+            >>> mosaic = Mosaic(dataset, imgsz=640, n=9, fuse=True)
+            >>> tile, x, y = mosaic._crop_tile(np.zeros((480, 640, 3), dtype=np.uint8), (-100, 640, 540, 1120), 1920)
+            >>> tile.shape, x, y
+            ((480, 220, 3), 0, 320)
+        """
+        (bh, bw), (x1, y1, x2, y2) = self.border, c
+        x1a, y1a, x2a, y2a = max(x1, -bw), max(y1, -bh), min(x2, size + bw), min(y2, size + bh)
+        return img[y1a - y1 : max(y2a - y1, 0), x1a - x1 : max(x2a - x1, 0)], x1a + bw, y1a + bh
+
     @staticmethod
     def _update_labels(labels, padw, padh):
         """
@@ -967,7 +1012,9 @@ class RandomPerspective:
         pre_transform (Callable | None): Optional transform to apply before the random perspective.
 
     Methods:
+        get_matrix: Samples a random transformation matrix for an image shape.
         affine_transform: Applies affine transformations to the input image.
+        warp_tiles: Warps mosaic tiles directly into the transformed image.
         apply_bboxes: Transforms bounding boxes using the affine matrix.
         apply_segments: Transforms segments and generates new bounding boxes.
         apply_keypoints: Transforms keypoints using the affine matrix.
@@ -1014,35 +1061,31 @@ class RandomPerspective:
         self.border = border  # mosaic border
         self.pre_transform = pre_transform
 
-    def affine_transform(self, img, border):
+    def get_matrix(self, shape):
         """
-        Applies a sequence of affine transformations centered around the image center.
+        Samples a random transformation matrix centered around the center of an image of the given shape.
 
-        This function performs a series of geometric transformations on the input image, including
-        translation, perspective change, rotation, scaling, and shearing. The transformations are
-        applied in a specific order to maintain consistency.
+        The matrix combines translation, perspective change, rotation, scaling, and shearing, applied in a specific
+        order to maintain consistency. The output size is taken from `self.size`.
 
         Args:
-            img (np.ndarray): Input image to be transformed.
-            border (Tuple[int, int]): Border dimensions for the transformed image.
+            shape (Tuple[int, int]): Shape (height, width) of the input image.
 
         Returns:
-            (Tuple[np.ndarray, np.ndarray, float]): A tuple containing:
-                - np.ndarray: Transformed image.
+            (Tuple[np.ndarray, float]): A tuple containing:
                 - np.ndarray: 3x3 transformation matrix.
                 - float: Scale factor applied during the transformation.
 
         Examples:
-            >>> import numpy as np
-            >>> img = np.random.rand(100, 100, 3)
-            >>> border = (10, 10)
-            >>> transformed_img, matrix, scale = affine_transform(img, border)
+            >>> transform = RandomPerspective(degrees=10.0)
+            >>> transform.size = (640, 640)
+            >>> M, scale = transform.get_matrix((1280, 1280))
         """
         # Center
         C = np.eye(3, dtype=np.float32)
 
-        C[0, 2] = -img.shape[1] / 2  # x translation (pixels)
-        C[1, 2] = -img.shape[0] / 2  # y translation (pixels)
+        C[0, 2] = -shape[1] / 2  # x translation (pixels)
+        C[1, 2] = -shape[0] / 2  # y translation (pixels)
 
         # Perspective
         P = np.eye(3, dtype=np.float32)
@@ -1068,7 +1111,34 @@ class RandomPerspective:
         T[1, 2] = random.uniform(0.5 - self.translate, 0.5 + self.translate) * self.size[1]  # y translation (pixels)
 
         # Combined rotation matrix
-        M = T @ S @ R @ P @ C  # order of operations (right to left) is IMPORTANT
+        return T @ S @ R @ P @ C, s  # order of operations (right to left) is IMPORTANT
+
+    def affine_transform(self, img, border):
+        """
+        Applies a sequence of affine transformations centered around the image center.
+
+        This function performs a series of geometric transformations on the input image, including
+        translation, perspective change, rotation, scaling, and shearing. The transformations are
+        applied in a specific order to maintain consistency.
+
+        Args:
+            img (np.ndarray): Input image to be transformed.
+            border (Tuple[int, int]): Border dimensions for the transformed image.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray, float]): A tuple containing:
+                - np.ndarray: Transformed image.
+                - np.ndarray: 3x3 transformation matrix.
+                - float: Scale factor applied during the transformation.
+
+        Examples:
+            >>> import numpy as np
+            >>> img = np.random.rand(100, 100, 3)
+            >>> border = (10, 10)
+            >>> transformed_img, matrix, scale = affine_transform(img, border)
+        """
+        M, s = self.get_matrix(img.shape[:2])
+
         # Affine image
         if (border[0] != 0) or (border[1] != 0) or (M != np.eye(3)).any():  # image changed
             if self.perspective:
@@ -1077,6 +1147,51 @@ class RandomPerspective:
                 img = cv2.warpAffine(img, M[:2], dsize=self.size, borderValue=(114, 114, 114))
         return img, M, s
 
+    def warp_tiles(self, tiles, shape):
+        """
+        Applies a random transformation to a mosaic given as tiles, without composing the mosaic canvas first.
+
+        Each tile is warped straight into the output with its placement offset folded into the transformation matrix.
+        Pixels outside the tiles keep the gray fill, so the result matches warping the full mosaic canvas up to
+        interpolation along the tile seams. Affine warps are restricted to the output region covered by each tile.
+
+        Args:
+            tiles (List[Tuple[np.ndarray, int, int]]): Tile images with their x, y offsets on the mosaic canvas.
+            shape (Tuple[int, int]): Shape (height, width) of the mosaic canvas.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray, float]): A tuple containing:
+                - np.ndarray: Transformed image.
+                - np.ndarray: 3x3 transformation matrix.
+                - float: Scale factor applied during the transformation.
+
+        Examples:
+            >>> transform = RandomPerspective(degrees=10.0)
+            >>> transform.size = (640, 640)
+            >>> tiles = [(np.zeros((640, 640, 3), dtype=np.uint8), 0, 0), (np.ones((480, 640, 3), np.uint8), 640, 0)]
+            >>> img, M, scale = transform.warp_tiles(tiles, (1280, 1280))
+        """
+        M, s = self.get_matrix(shape)
+        w, h = self.size
+        img = np.full((h, w, tiles[0][0].shape[2]), 114, dtype=np.uint8)
+        for tile, x, y in tiles:
+            th, tw = tile.shape[:2]
+            if th == 0 or tw == 0:
+                continue
+            Mt = M @ np.array([[1, 0, x], [0, 1, y], [0, 0, 1]], dtype=M.dtype)  # tile to output
+            if self.perspective:
+                cv2.warpPerspective(tile, Mt, (w, h), dst=img, borderMode=cv2.BORDER_TRANSPARENT)
+                continue
+            xy = Mt[:2] @ np.array([[0, tw, tw, 0], [0, 0, th, th], [1, 1, 1, 1]], dtype=M.dtype)  # corners
+            x1, y1 = (max(math.floor(v) - 1, 0) for v in xy.min(1))
+            x2, y2 = min(math.ceil(xy[0].max()) + 1, w), min(math.ceil(xy[1].max()) + 1, h)
+            if x2 > x1 and y2 > y1:
+                Mt[:2, 2] -= (x1, y1)  # output region origin
+                cv2.warpAffine(
+                    tile, Mt[:2], (x2 - x1, y2 - y1), dst=img[y1:y2, x1:x2], borderMode=cv2.BORDER_TRANSPARENT
+                )
+        return img, M, s
+
     def apply_bboxes(self, bboxes, M):
         """
         Apply affine transformation to bounding boxes.
@@ -1198,6 +1313,8 @@ class RandomPerspective:
                     'instances' (Instances): Object instances with bounding boxes, segments, and keypoints.
                 May include:
                     'mosaic_border' (Tuple[int, int]): Border size for mosaic augmentation.
+                    'mosaic_tiles' (List[Tuple[np.ndarray, int, int]]): Mosaic tiles and their offsets on a canvas
+                        of shape 'resized_shape', used instead of 'img'.
 
         Returns:
             (Dict): Transformed labels dictionary containing:
@@ -1221,18 +1338,22 @@ class RandomPerspective:
             labels = self.pre_transform(labels)
         labels.pop("ratio_pad", None)  # do not need ratio pad
 
-        img = labels["img"]
+        tiles = labels.pop("mosaic_tiles", None)  # from Mosaic(fuse=True)
+        h, w = labels["resized_shape"] if tiles is not None else labels["img"].shape[:2]
         cls = labels["cls"]
         instances = labels.pop("instances")
         # Make sure the coord formats are right
         instances.convert_bbox(format="xyxy")
-        instances.denormalize(*img.shape[:2][::-1])
+        instances.denormalize(w, h)
 
         border = labels.pop("mosaic_border", self.border)
-        self.size = img.shape[1] + border[1] * 2, img.shape[0] + border[0] * 2  # w, h
+        self.size = w + border[1] * 2, h + border[0] * 2  # w, h
         # M is affine matrix
         # Scale for func:`box_candidates`
-        img, M, scale = self.affine_transform(img, border)
+        if tiles is not None:
+            img, M, scale = self.warp_tiles(tiles, (h, w))
+        else:
+            img, M, scale = self.affine_transform(labels["img"], border)
 
         bboxes = self.apply_bboxes(instances.bboxes, M)
 
@@ -1493,6 +1614,8 @@ class LetterBox:
 
     Methods:
         __call__: Resize and pad image, update labels and bounding boxes.
+        batch: Letterbox a batch of images into slices of one preallocated batch array.
+        get_params: Compute the scale ratio, resized shape and padding for an image shape.
 
     Examples:
         >>> transform = LetterBox(new_shape=(640, 640))
@@ -1534,7 +1657,7 @@ class LetterBox:
         self.stride = stride
         self.center = center  # Put the image in the middle or top-left
 
-    def __call__(self, labels=None, image=None):
+    def __call__(self, labels=None, image=None, out=None):
         """
         Resizes and pads an image for object detection, instance segmentation, or pose estimation tasks.
 
@@ -1544,6 +1667,8 @@ class LetterBox:
         Args:
             labels (Dict | None): A dictionary containing image data and associated labels, or empty dict if None.
             image (np.ndarray | None): The input image as a numpy array. If None, the image is taken from 'labels'.
+            out (np.ndarray | None): Preallocated (h, w, 3) uint8 array of the letterboxed shape to resize and pad the
+                image into without intermediate copies, i.e. a slice of a batch buffer.
 
         Returns:
             (Dict | Tuple): If 'labels' is provided, returns an updated dictionary with the resized and padded image,
@@ -1561,6 +1686,95 @@ class LetterBox:
         img = labels.get("img") if image is None else image
         shape = img.shape[:2]  # current shape [height, width]
         new_shape = labels.pop("rect_shape", self.new_shape)
+        ratio, new_unpad, (top, bottom, left, right) = self.get_params(shape, new_shape)
+
+        if out is not None:  # write into preallocated array
+            img = self._fill(img, out, new_unpad, (top, bottom, left, right))
+        else:
+            if shape[::-1] != new_unpad:  # resize
+                img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
+            img = cv2.copyMakeBorder(
+                img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
+            )  # add border
+        if labels.get("ratio_pad"):
+            labels["ratio_pad"] = (labels["ratio_pad"], (left, top))  # for evaluation
+
+        if len(labels):
+            labels = self._update_labels(labels, ratio, left, top)
+            labels["img"] = img
+            labels["resized_shape"] = new_shape
+            return labels
+        else:
+            return img
+
+    def batch(self, images, out, pool=None):
+        """
+        Letterbox a batch of images into slices of one preallocated batch array.
+
+        The letterbox geometry is computed once per distinct image shape, so a batch of same-shape frames, i.e. from
+        several cameras of one model, computes it once and then only resizes each frame into its slice of the batch.
+
+        Args:
+            images (List[np.ndarray]): Images of shape [(h, w, 3) x N].
+            out (np.ndarray): Preallocated uint8 batch array of shape (N, h, w, 3) matching the letterboxed shape.
+            pool (multiprocessing.pool.ThreadPool | None): Optional thread pool to resize images in parallel.
+
+        Returns:
+            (List[Tuple]): Per-image (ratio, (left_pad, top_pad)) metadata, as taken by `ops.scale_boxes()`.
+
+        Examples:
+            >>> letterbox = LetterBox(new_shape=(640, 640))
+            >>> images = [np.zeros((480, 640, 3), dtype=np.uint8)] * 4
+            >>> out = np.empty((4, 640, 640, 3), dtype=np.uint8)
+            >>> ratio_pad = letterbox.batch(images, out)
+        """
+        params = {}
+        for x in images:
+            if x.shape[:2] not in params:
+                params[x.shape[:2]] = self.get_params(x.shape[:2])
+        args = [(x, y, *params[x.shape[:2]][1:]) for x, y in zip(images, out)]
+        if pool is None:
+            for a in args:
+                self._fill(*a)
+        else:
+            pool.starmap(self._fill, args)
+        return [(ratio, (pad[2], pad[0])) for ratio, _, pad in (params[x.shape[:2]] for x in images)]  # left, top
+
+    @staticmethod
+    def _fill(img, out, new_unpad, pad):
+        """Resize an image into a preallocated letterboxed array of new_unpad (w, h) plus (top, bottom, left, right)."""
+        (w, h), (top, bottom, left, right) = new_unpad, pad
+        if out.shape[:2] != (top + h + bottom, left + w + right):
+            raise ValueError(
+                f"LetterBox output shape {out.shape[:2]} does not match {(top + h + bottom, left + w + right)}"
+            )
+        roi = out[top : top + h, left : left + w]
+        if img.shape[1::-1] != new_unpad:  # resize
+            cv2.resize(img, new_unpad, dst=roi, interpolation=cv2.INTER_LINEAR)
+        else:
+            roi[:] = img
+        for border in out[:top], out[top + h :], out[top : top + h, :left], out[top : top + h, left + w :]:
+            border.fill(114)  # add border
+        return out
+
+    def get_params(self, shape, new_shape=None):
+        """
+        Compute the scale ratio, resized shape and padding that letterbox an image of a given shape.
+
+        Args:
+            shape (Tuple[int, int]): Image shape (height, width).
+            new_shape (int | Tuple[int, int] | None): Target shape (height, width), defaults to `self.new_shape`.
+
+        Returns:
+            ratio (Tuple[float, float]): Width and height scale ratios.
+            new_unpad (Tuple[int, int]): Resized image size (width, height) before padding.
+            pad (Tuple[int, int, int, int]): Top, bottom, left and right padding in pixels.
+
+        Examples:
+            >>> letterbox = LetterBox(new_shape=(640, 640))
+            >>> ratio, new_unpad, (top, bottom, left, right) = letterbox.get_params((480, 640))
+        """
+        new_shape = self.new_shape if new_shape is None else new_shape
         if isinstance(new_shape, int):
             new_shape = (new_shape, new_shape)
 
@@ -1583,24 +1797,9 @@ class LetterBox:
         if self.center:
             dw /= 2  # divide padding into 2 sides
             dh /= 2
-
-        if shape[::-1] != new_unpad:  # resize
-            img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
         top, bottom = int(round(dh - 0.1)) if self.center else 0, int(round(dh + 0.1))
         left, right = int(round(dw - 0.1)) if self.center else 0, int(round(dw + 0.1))
-        img = cv2.copyMakeBorder(
-            img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
-        )  # add border
-        if labels.get("ratio_pad"):
-            labels["ratio_pad"] = (labels["ratio_pad"], (left, top))  # for evaluation
-
-        if len(labels):
-            labels = self._update_labels(labels, ratio, left, top)
-            labels["img"] = img
-            labels["resized_shape"] = new_shape
-            return labels
-        else:
-            return img
+        return ratio, new_unpad, (top, bottom, left, right)
 
     @staticmethod
     def _update_labels(labels, ratio, padw, padh):
@@ -2277,6 +2476,327 @@ class RandomLoadText:
         return labels
 
 
+class BatchAugment:
+    """
+    Applies random rotation, shear, perspective, HSV and flip augmentations to a whole batch on its device.
+
+    This is the device-side counterpart of the geometric and color stages of `v8_transforms`. When training with
+    `batch_augment=True` the dataloader workers only decode images, build mosaics, scale, translate, mix and copy-paste,
+    and the trainer calls this class on each uint8 batch once it is on the training device. Boxes, oriented boxes,
+    masks and keypoints are transformed together with the images, and instances that no longer fit the image are
+    removed as in RandomPerspective. Everything is plain torch, so the same code runs on CPU.
+
+    Attributes:
+        hgain (float): Maximum variation for the hue gain.
+        sgain (float): Maximum variation for saturation.
+        vgain (float): Maximum variation for value.
+        degrees (float): Maximum absolute rotation in degrees.
+        shear (float): Maximum absolute shear in degrees.
+        perspective (float): Perspective distortion factor.
+        flipud (float): Probability of flipping an image upside down.
+        fliplr (float): Probability of flipping an image left to right.
+        flip_idx (List[int] | None): Keypoint index mapping for left-right flips.
+        overlap_mask (bool): Whether segment masks are merged into one index mask per image.
+
+    Methods:
+        __call__: Augments a batch in place and returns it.
+        get_matrix: Samples random transformation matrices about the image center.
+        warp: Samples images or masks through per-image transformation matrices.
+        affine: Applies random rotation, shear and perspective to images and labels.
+        hsv: Applies random HSV gains to images.
+        flip: Flips selected images and their labels.
+
+    Examples:
+        >>> from ultralytics.cfg import get_cfg
+        >>> augment = BatchAugment(get_cfg(overrides={"degrees": 10.0}))
+        >>> batch = augment(batch)  # dataloader batch with 'img' moved to the training device
+    """
+
+    def __init__(self, hyp, flip_idx=None):
+        """
+        Initializes the BatchAugment object from training hyperparameters.
+
+        Args:
+            hyp (IterableSimpleNamespace): Hyperparameters with hsv_h, hsv_s, hsv_v, degrees, shear, perspective,
+                flipud, fliplr and overlap_mask attributes.
+            flip_idx (List[int] | None): Keypoint index mapping for left-right flips.
+
+        Examples:
+            >>> from ultralytics.cfg import get_cfg
+            >>> augment = BatchAugment(get_cfg(), flip_idx=[0, 2, 1, 4, 3])
+        """
+        self.hgain, self.sgain, self.vgain = hyp.hsv_h, hyp.hsv_s, hyp.hsv_v
+        self.degrees, self.shear, self.perspective = hyp.degrees, hyp.shear, hyp.perspective
+        self.flipud, self.fliplr = hyp.flipud, hyp.fliplr
+        self.flip_idx = flip_idx
+        self.overlap_mask = hyp.overlap_mask
+
+    def __call__(self, batch):
+        """
+        Augments a collated batch on the device of its images.
+
+        Args:
+            batch (Dict): Batch from `YOLODataset.collate_fn` with 'img' as a (B, C, H, W) uint8 tensor and 'bboxes'
+                as normalized xywh or xywhr. May include 'masks' and 'keypoints'.
+
+        Returns:
+            (Dict): The augmented batch, with all label tensors moved to the device of 'img'.
+
+        Examples:
+            >>> augment = BatchAugment(get_cfg())
+            >>> batch["img"] = batch["img"].to("cuda")
+            >>> batch = augment(batch)
+        """
+        device = batch["img"].device
+        for k in "cls", "bboxes", "batch_idx", "masks", "keypoints":
+            if k in batch:
+                batch[k] = batch[k].to(device, non_blocking=True)
+        if self.degrees or self.shear or self.perspective:
+            self.affine(batch)
+        if self.hgain or self.sgain or self.vgain:
+            batch["img"] = self.hsv(batch["img"])
+        if self.flipud:
+            self.flip(batch, torch.rand(len(batch["img"]), device=device) < self.flipud, vertical=True)
+        if self.fliplr:
+            self.flip(batch, torch.rand(len(batch["img"]), device=device) < self.fliplr)
+        return batch
+
+    def get_matrix(self, n, h, w, device):
+        """
+        Samples random rotation, shear and perspective matrices about the center of an image of shape (h, w).
+
+        Args:
+            n (int): Number of matrices.
+            h (int): Image height.
+            w (int): Image width.
+            device (torch.device): Device of the returned matrices.
+
+        Returns:
+            (torch.Tensor): Transformation matrices of shape (n, 3, 3).
+
+        Examples:
+            >>> augment = BatchAugment(get_cfg(overrides={"degrees": 10.0}))
+            >>> M = augment.get_matrix(16, 640, 640, torch.device("cpu"))
+        """
+
+        def uniform(x):
+            """Samples n values uniformly from [-x, x]."""
+            return (torch.rand(n, device=device) * 2 - 1) * x
+
+        C, P, R, S, T = torch.eye(3, device=device).repeat(5, n, 1, 1)
+        C[:, 0, 2], C[:, 1, 2] = -w / 2, -h / 2  # center
+        P[:, 2, 0], P[:, 2, 1] = uniform(self.perspective), uniform(self.perspective)  # perspective
+        a = uniform(self.degrees) * math.pi / 180  # rotation, as cv2.getRotationMatrix2D()
+        R[:, 0, 0], R[:, 0, 1], R[:, 1, 0], R[:, 1, 1] = a.cos(), a.sin(), -a.sin(), a.cos()
+        S[:, 0, 1], S[:, 1, 0] = (
+            (uniform(self.shear) * math.pi / 180).tan(),
+            (uniform(self.shear) * math.pi / 180).tan(),
+        )
+        T[:, 0, 2], T[:, 1, 2] = w / 2, h / 2  # back to the image center
+        return T @ S @ R @ P @ C  # order of operations (right to left) is IMPORTANT
+
+    @staticmethod
+    def warp(x, M, mode="bilinear"):
+        """
+        Samples each image in a batch through its transformation matrix, filling outside pixels with zeros.
+
+        Args:
+            x (torch.Tensor): Float images of shape (N, C, H, W).
+            M (torch.Tensor): Matrices of shape (N, 3, 3) mapping input to output pixel coordinates.
+            mode (str): Interpolation mode for `torch.nn.functional.grid_sample`.
+
+        Returns:
+            (torch.Tensor): Warped images of shape (N, C, H, W).
+
+        Examples:
+            >>> x = torch.rand(2, 3, 64, 64)
+            >>> y = BatchAugment.warp(x, torch.eye(3).repeat(2, 1, 1))
+        """
+        n, _, h, w = x.shape
+        ys, xs = torch.arange(h, device=x.device), torch.arange(w, device=x.device)
+        y, xx = torch.meshgrid(ys, xs, indexing="ij") if TORCH_1_10 else torch.meshgrid(ys, xs)
+        p = torch.stack((xx, y, torch.ones_like(xx)), -1).view(1, -1, 3).float() @ torch.linalg.inv(M).transpose(1, 2)
+        grid = (2 * p[..., :2] / p[..., 2:] + 1) / torch.tensor([w, h], device=x.device) - 1  # pixel to [-1, 1]
+        return torch.nn.functional.grid_sample(x, grid.view(n, h, w, 2), mode=mode, align_corners=False)
+
+    @staticmethod
+    def _apply(points, M):
+        """Transforms points of shape (N, K, 2) with matrices of shape (N, 3, 3)."""
+        xy = torch.cat((points, torch.ones_like(points[..., :1])), -1) @ M.transpose(1, 2)
+        return xy[..., :2] / xy[..., 2:]
+
+    @staticmethod
+    def _fit_rboxes(corners):
+        """
+        Fits minimum-area rotated boxes to quadrilaterals, as `cv2.minAreaRect()` does, without leaving the device.
+
+        The minimum-area rectangle of a convex polygon has a side along one of its edges, so the rectangles aligned with
+        the 6 lines through pairs of corners (the edges and diagonals, covering the edges of the convex hull of any 4
+        points) are measured and the smallest one is kept.
+
+        Args:
+            corners (torch.Tensor): Corners of shape (N, 4, 2).
+
+        Returns:
+            (torch.Tensor): Rotated boxes in xywhr format of shape (N, 5), with rotations in [0, pi/2).
+        """
+        i, j = [0, 0, 0, 1, 1, 2], [1, 2, 3, 2, 3, 3]
+        d = corners[:, j] - corners[:, i]
+        t = torch.atan2(d[..., 1], d[..., 0])  # (N, 6) candidate rotations
+        u, v = torch.stack((t.cos(), t.sin()), -1), torch.stack((-t.sin(), t.cos()), -1)  # rectangle axes
+        pu, pv = corners @ u.transpose(1, 2), corners @ v.transpose(1, 2)  # (N, 4, 6) corner projections
+        w, h = pu.amax(1) - pu.amin(1), pv.amax(1) - pv.amin(1)
+        n, k = torch.arange(len(corners), device=corners.device), (w * h).argmin(1)
+        cu, cv = (pu.amax(1) + pu.amin(1))[n, k, None] / 2, (pv.amax(1) + pv.amin(1))[n, k, None] / 2
+        xy = cu * u[n, k] + cv * v[n, k]
+        return regularize_rboxes(torch.cat((xy, torch.stack((w[n, k], h[n, k], t[n, k]), 1)), 1))
+
+    def affine(self, batch):
+        """
+        Applies random rotation, shear and perspective to the images and labels of a batch in place.
+
+        New boxes are the clipped bounds of the transformed box corners, and instances that become too small or too
+        thin are removed with the same criteria as `RandomPerspective.box_candidates()`. Oriented boxes are refitted
+        to their clipped transformed corners on the device, keypoints that leave the image are marked invisible, and
+        masks are warped with nearest-neighbour sampling. Indexes in overlapping masks are renumbered after removals.
+
+        Args:
+            batch (Dict): Batch with images and labels on the same device.
+
+        Examples:
+            >>> augment = BatchAugment(get_cfg(overrides={"degrees": 10.0}))
+            >>> augment.affine(batch)
+        """
+        img = batch["img"]
+        n, _, h, w = img.shape
+        M = self.get_matrix(n, h, w, img.device)
+        batch["img"] = (self.warp(img.float() - 114, M) + 114).round_().clamp_(0, 255).to(img.dtype)  # 114 border
+
+        i = batch["batch_idx"].long()
+        Mi, bboxes = M[i], batch["bboxes"]
+        scale = bboxes.new_tensor([w, h])
+        if bboxes.shape[-1] == 5:  # xywhr
+            corners = xywhr2xyxyxyxy(torch.cat((bboxes[:, :4] * scale.repeat(2), bboxes[:, 4:]), 1))
+        else:  # xywh
+            x1y1, x2y2 = (bboxes[:, :2] - bboxes[:, 2:] / 2) * scale, (bboxes[:, :2] + bboxes[:, 2:] / 2) * scale
+            corners = torch.stack(
+                (x1y1, torch.stack((x2y2[:, 0], x1y1[:, 1]), 1), x2y2, torch.stack((x1y1[:, 0], x2y2[:, 1]), 1)), 1
+            )
+        before = torch.cat((corners.amin(1), corners.amax(1)), 1)
+        corners = self._apply(corners, Mi)
+        corners = torch.stack((corners[..., 0].clamp(0, w), corners[..., 1].clamp(0, h)), -1)
+        after = torch.cat((corners.amin(1), corners.amax(1)), 1)
+
+        # Filter instances as RandomPerspective.box_candidates()
+        w1, h1 = (before[:, 2:] - before[:, :2]).T
+        w2, h2 = (after[:, 2:] - after[:, :2]).T
+        ar = torch.maximum(w2 / (h2 + 1e-16), h2 / (w2 + 1e-16))  # aspect ratio
+        area_thr = 0.01 if "masks" in batch else 0.10
+        keep = (w2 > 2) & (h2 > 2) & (w2 * h2 / (w1 * h1 + 1e-16) > area_thr) & (ar < 100)
+
+        if bboxes.shape[-1] == 5:
+            rboxes = self._fit_rboxes(corners)
+            bboxes = torch.cat((rboxes[:, :4] / scale.repeat(2), rboxes[:, 4:]), 1)
+        else:
+            bboxes = torch.cat(((after[:, :2] + after[:, 2:]) / 2, after[:, 2:] - after[:, :2]), 1) / scale.repeat(2)
+        if "keypoints" in batch:
+            kpts = batch["keypoints"]
+            xy = self._apply(kpts[..., :2] * scale, Mi)
+            if kpts.shape[-1] == 3:
+                out = (xy[..., 0] < 0) | (xy[..., 1] < 0) | (xy[..., 0] > w) | (xy[..., 1] > h)
+                kpts[..., 2][out] = 0
+            kpts[..., :2] = xy / scale
+            batch["keypoints"] = kpts[keep]
+        if "masks" in batch:
+            masks = batch["masks"]
+            r = w / masks.shape[-1]  # mask downsample ratio
+            D = M.new_tensor([[r, 0, (r - 1) / 2], [0, r, (r - 1) / 2], [0, 0, 1]])  # mask to image pixels
+            Mm = torch.linalg.inv(D) @ M @ D
+            warped = self.warp(masks[:, None].float(), Mm if self.overlap_mask else Mm[i], mode="nearest")[:, 0]
+            if self.overlap_mask:  # renumber kept instances 1..k within each image, removed ones become background
+                counts = torch.bincount(i, minlength=n)
+                start = counts.cumsum(0) - counts
+                j = torch.arange(len(i), device=i.device) - start[i]  # instance index within its image
+                kept = keep.long().cumsum(0) - keep.long()  # kept instances before each instance
+                lut = torch.zeros(n, int(counts.max()) + 1 if len(i) else 1, device=i.device, dtype=torch.long)
+                lut[i, j + 1] = (kept - kept[start[i]] + 1) * keep
+                warped = lut.gather(1, warped.long().view(n, -1)).view(warped.shape)
+            else:
+                warped = warped[keep]
+            batch["masks"] = warped.to(masks.dtype)
+        batch["bboxes"], batch["cls"], batch["batch_idx"] = bboxes[keep], batch["cls"][keep], batch["batch_idx"][keep]
+
+    def hsv(self, img):
+        """
+        Applies random hue, saturation and value gains to each image.
+
+        Each channel is multiplied by a gain sampled from [1 - gain, 1 + gain], with hue wrapping around the color
+        wheel as in the multiplicative hue lookup table of RandomHSV.
+
+        Args:
+            img (torch.Tensor): RGB uint8 images of shape (B, 3, H, W).
+
+        Returns:
+            (torch.Tensor): Augmented uint8 images.
+
+        Examples:
+            >>> augment = BatchAugment(get_cfg())
+            >>> img = augment.hsv(torch.randint(0, 255, (2, 3, 64, 64), dtype=torch.uint8))
+        """
+        x = img.float() / 255
+        gains = x.new_tensor([self.hgain, self.sgain, self.vgain])[:, None, None]
+        r = (torch.rand(len(x), 3, 1, 1, device=x.device) * 2 - 1) * gains + 1  # random gains
+        v, vmin = x.amax(1), x.amin(1)
+        d = v - vmin
+        s = torch.where(v > 0, d / v.clamp(min=1e-16), 0)
+        rgb, dc = x.unbind(1), d.clamp(min=1e-16)
+        hue = torch.where(
+            v == rgb[0],
+            (rgb[1] - rgb[2]) / dc,
+            torch.where(v == rgb[1], (rgb[2] - rgb[0]) / dc + 2, (rgb[0] - rgb[1]) / dc + 4),
+        )  # sextant of the color wheel in [0, 6)
+        hue = (hue * r[:, 0]) % 6
+        s = (s * r[:, 1]).clamp(0, 1)
+        v = (v * r[:, 2]).clamp(0, 1)
+        k = (hue[:, None] + x.new_tensor([5, 3, 1])[:, None, None]) % 6
+        x = v[:, None] - (v * s)[:, None] * torch.minimum(k, 4 - k).clamp(0, 1)
+        return (x * 255).round_().clamp_(0, 255).to(img.dtype)
+
+    def flip(self, batch, f, vertical=False):
+        """
+        Flips the selected images of a batch and their labels in place.
+
+        Args:
+            batch (Dict): Batch with images and labels on the same device.
+            f (torch.Tensor): Boolean mask of shape (B,) selecting the images to flip.
+            vertical (bool): Flip upside down if True, otherwise left to right.
+
+        Examples:
+            >>> augment = BatchAugment(get_cfg())
+            >>> augment.flip(batch, torch.tensor([True, False]))
+        """
+        dim, c = (-2, 1) if vertical else (-1, 0)
+        batch["img"] = torch.where(f[:, None, None, None], batch["img"].flip(dim), batch["img"])
+        fi = f[batch["batch_idx"].long()]
+        bboxes = batch["bboxes"]
+        bboxes[fi, c] = 1 - bboxes[fi, c]
+        if bboxes.shape[-1] == 5:  # mirrored xywhr, kept in [0, pi/2) by swapping width and height
+            h, w = batch["img"].shape[-2:]
+            bboxes[fi, 4] = -bboxes[fi, 4]
+            neg = fi & (bboxes[:, 4] < 0)
+            bboxes[neg, 2], bboxes[neg, 3] = bboxes[neg, 3] * h / w, bboxes[neg, 2] * w / h
+            bboxes[neg, 4] += math.pi / 2
+        if "keypoints" in batch:
+            kpts = batch["keypoints"]
+            kpts[fi, :, c] = 1 - kpts[fi, :, c]
+            if not vertical and self.flip_idx:
+                kpts[fi] = kpts[fi][:, self.flip_idx]
+        if "masks" in batch:
+            masks = batch["masks"]
+            m = f if self.overlap_mask else fi
+            batch["masks"] = torch.where(m[:, None, None], masks.flip(dim), masks)
+
+
 def v8_transforms(dataset, imgsz, hyp, stretch=False):
     """
     Applies a series of image transformations for training.
@@ -2301,13 +2821,15 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
         >>> transforms = v8_transforms(dataset, imgsz=640, hyp=hyp)
         >>> augmented_data = transforms(dataset[0])
     """
-    mosaic = Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic)
+    fuse = hyp.copy_paste_mode != "flip" or not hyp.copy_paste  # flip CopyPaste edits the mosaic before the warp
+    mosaic = Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic, fuse=fuse)
+    on_batch = hyp.batch_augment  # rotation, shear, perspective, HSV and flips are left to BatchAugment in the trainer
     affine = RandomPerspective(
-        degrees=hyp.degrees,
+        degrees=0.0 if on_batch else hyp.degrees,
         translate=hyp.translate,
         scale=hyp.scale,
-        shear=hyp.shear,
-        perspective=hyp.perspective,
+        shear=0.0 if on_batch else hyp.shear,
+        perspective=0.0 if on_batch else hyp.perspective,
         pre_transform=None if stretch else LetterBox(new_shape=(imgsz, imgsz)),
     )
 
@@ -2318,7 +2840,7 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
         pre_transform.append(
             CopyPaste(
                 dataset,
-                pre_transform=Compose([Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic), affine]),
+                pre_transform=Compose([Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic, fuse=True), affine]),
                 p=hyp.copy_paste,
                 mode=hyp.copy_paste_mode,
             )
@@ -2332,16 +2854,14 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
         elif flip_idx and (len(flip_idx) != kpt_shape[0]):
             raise ValueError(f"data.yaml flip_idx={flip_idx} length must be equal to kpt_shape[0]={kpt_shape[0]}")
 
-    return Compose(
-        [
-            pre_transform,
-            MixUp(dataset, pre_transform=pre_transform, p=hyp.mixup),
-            Albumentations(p=1.0),
-            RandomHSV(hgain=hyp.hsv_h, sgain=hyp.hsv_s, vgain=hyp.hsv_v),
-            RandomFlip(direction="vertical", p=hyp.flipud),
-            RandomFlip(direction="horizontal", p=hyp.fliplr, flip_idx=flip_idx),
-        ]
-    )  # transforms
+    transforms = Compose(
+        [pre_transform, MixUp(dataset, pre_transform=pre_transform, p=hyp.mixup), Albumentations(p=1.0)]
+    )
+    if not on_batch:
+        transforms.append(RandomHSV(hgain=hyp.hsv_h, sgain=hyp.hsv_s, vgain=hyp.hsv_v))
+        transforms.append(RandomFlip(direction="vertical", p=hyp.flipud))
+        transforms.append(RandomFlip(direction="horizontal", p=hyp.fliplr, flip_idx=flip_idx))
+    return transforms
 
 
 # Classification augmentations -----------------------------------------------------------------------------------------
@@ -1,9 +1,13 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import atexit
+import contextlib
 import glob
+import hashlib
 import math
 import os
 import random
+import shutil
 from copy import deepcopy
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
@@ -14,7 +18,16 @@ import numpy as np
 import psutil
 from torch.utils.data import Dataset
 
-from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS
+from ultralytics.data.utils import (
+    CACHE_ALIGN,
+    FORMATS_HELP_MSG,
+    HELP_URL,
+    IMG_FORMATS,
+    LabelStore,
+    attach_shared_memory,
+    decode_image,
+    load_dataset_cache_file,
+)
 from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
 
 
@@ -45,7 +58,8 @@ class BaseDataset(Dataset):
         im_hw0 (List): List of original image dimensions (h, w).
         im_hw (List): List of resized image dimensions (h, w).
         npy_files (List[Path]): List of numpy file paths.
-        cache (str): Cache images to RAM or disk during training.
+        cache (str): Cache images to RAM, shared memory, a pack file or disk during training.
+        shm (SharedMemory | None): Shared memory holding cached images if cache is 'shm'.
         transforms (callable): Image transformation function.
 
     Methods:
@@ -53,8 +67,11 @@ class BaseDataset(Dataset):
         update_labels: Update labels to include only specified classes.
         load_image: Load an image from the dataset.
         cache_images: Cache images to memory or disk.
+        cache_images_shm: Cache images in shared memory used by all processes on this machine.
+        cache_images_pack: Cache resized images in a single memory-mapped file.
         cache_images_to_disk: Save an image as an *.npy file for faster loading.
         check_cache_disk: Check image caching requirements vs available disk space.
+        check_cache_shm: Check shared-memory image caching requirements vs available memory.
         check_cache_ram: Check image caching requirements vs available memory.
         set_rectangle: Set the shape of bounding boxes as rectangles.
         get_image_and_label: Get and return label information from the dataset.
@@ -85,7 +102,8 @@ class BaseDataset(Dataset):
         Args:
             img_path (str): Path to the folder containing images.
             imgsz (int, optional): Image size for resizing.
-            cache (bool | str, optional): Cache images to RAM or disk during training.
+            cache (bool | str, optional): Cache images to RAM, shared memory ('shm'), a pack file ('pack') or disk
+                during training.
             augment (bool, optional): If True, data augmentation is applied.
             hyp (dict, optional): Hyperparameters to apply data augmentation.
             prefix (str, optional): Prefix to print in log messages.
@@ -112,6 +130,7 @@ class BaseDataset(Dataset):
         self.batch_size = batch_size
         self.stride = stride
         self.pad = pad
+        self.decoder = hyp.decoder
         if self.rect:
             assert self.batch_size is not None
             self.set_rectangle()
@@ -120,19 +139,24 @@ class BaseDataset(Dataset):
         self.buffer = []  # buffer size = batch size
         self.max_buffer_length = min((self.ni, self.batch_size * 8, 1000)) if self.augment else 0
 
-        # Cache images (options are cache = True, False, None, "ram", "disk")
+        # Cache images (options are cache = True, False, None, "ram", "shm", "pack", "disk")
         self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
         self.npy_files = [Path(f).with_suffix(".npy") for f in self.im_files]
         self.cache = cache.lower() if isinstance(cache, str) else "ram" if cache is True else None
+        self.shm = None  # shared memory holding cached images if cache='shm'
         if self.cache == "ram" and self.check_cache_ram():
-            if hyp.deterministic:
-                LOGGER.warning(
-                    "WARNING ⚠️ cache='ram' may produce non-deterministic training results. "
-                    "Consider cache='disk' as a deterministic alternative if your disk space allows."
-                )
             self.cache_images()
+        elif self.cache == "shm":
+            self.cache_images_shm()
+        elif self.cache == "pack":
+            self.cache_images_pack()
         elif self.cache == "disk" and self.check_cache_disk():
             self.cache_images()
+        if self.cache in {"ram", "shm", "pack"} and hyp.deterministic:
+            LOGGER.warning(
+                f"WARNING ⚠️ cache='{self.cache}' may produce non-deterministic training results. "
+                "Consider cache='disk' as a deterministic alternative if your disk space allows."
+            )
 
         # Transforms
         self.transforms = self.build_transforms(hyp=hyp)
@@ -181,6 +205,10 @@ class BaseDataset(Dataset):
         Args:
             include_class (List, optional): List of classes to include. If None, all classes are included.
         """
+        if isinstance(self.labels, LabelStore):
+            if include_class is not None or self.single_cls:
+                self.labels = self.labels.filter(include_class, self.single_cls)
+            return
         include_class_array = np.array(include_class).reshape(1, -1)
         for i in range(len(self.labels)):
             if include_class is not None:
@@ -222,13 +250,14 @@ class BaseDataset(Dataset):
                 except Exception as e:
                     LOGGER.warning(f"{self.prefix}WARNING ⚠️ Removing corrupt *.npy image file {fn} due to: {e}")
                     Path(fn).unlink(missing_ok=True)
-                    im = cv2.imread(f)  # BGR
-            else:  # read image
-                im = cv2.imread(f)  # BGR
+                    im = None
+            if im is None:  # read image, reduced while decoding if the decoder supports it
+                im, (h0, w0) = decode_image(f, self.imgsz, self.decoder, stretch=not rect_mode)  # BGR, orig hw
+            else:
+                h0, w0 = im.shape[:2]  # orig hw
             if im is None:
                 raise FileNotFoundError(f"Image Not Found {f}")
 
-            h0, w0 = im.shape[:2]  # orig hw
             if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
                 r = self.imgsz / max(h0, w0)  # ratio
                 if r != 1:  # if sizes are not equal
@@ -243,7 +272,7 @@ class BaseDataset(Dataset):
                 self.buffer.append(i)
                 if 1 < len(self.buffer) >= self.max_buffer_length:  # prevent empty buffer
                     j = self.buffer.pop(0)
-                    if self.cache != "ram":
+                    if self.cache != "ram" and self.ims[j].flags.writeable:  # keep read-only views of shm/pack caches
                         self.ims[j], self.im_hw0[j], self.im_hw[j] = None, None, None
 
             return im, (h0, w0), im.shape[:2]
@@ -266,38 +295,210 @@ class BaseDataset(Dataset):
                 pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB {storage})"
             pbar.close()
 
+    def cache_layout(self):
+        """
+        Return the layout of the shared-memory and pack image caches, identical in every process using the dataset.
+
+        The cache starts with one 'cached' flag byte per image, followed by each image resized as in `load_image` at a
+        64-byte aligned offset. Sizes follow from the original image shapes stored in the labels, so all processes
+        derive the same layout without exchanging it.
+
+        Returns:
+            name (str): Cache name, which changes with the images, their shapes and imgsz.
+            size (int): Cache size in bytes.
+            offsets (np.ndarray): Offset of each image.
+            hw0 (np.ndarray): Original image shapes (h, w), (0, 0) if unknown.
+            hw (np.ndarray): Resized image shapes (h, w).
+        """
+        if isinstance(self.labels, LabelStore):
+            hw0 = self.labels.shapes.astype(np.int64)
+        else:
+            hw0 = np.array([lb.get("shape", (0, 0)) for lb in self.labels], dtype=np.int64).reshape(-1, 2)
+        r = self.imgsz / np.maximum(hw0.max(1, initial=0), 1)  # ratio
+        hw = np.where((r != 1)[:, None], np.minimum(np.ceil(hw0 * r[:, None]), self.imgsz), hw0).astype(np.int64)
+        sizes = -(-hw.prod(1) * 3 // 64) * 64  # aligned bytes per image
+        offsets = -(-self.ni // 64) * 64 + np.concatenate(([0], np.cumsum(sizes)))
+        h = hashlib.sha256(f"{self.imgsz}{self.ni}".encode())
+        h.update("".join(self.im_files).encode())
+        h.update(hw0.tobytes())
+        return f"yolo_{h.hexdigest()[:20]}", int(offsets[-1]), offsets[:-1], hw0, hw
+
+    def fill_cache(self, buf, offsets, hw, storage):
+        """
+        Decode and resize all images into a cache buffer with the layout of `cache_layout`, flagging each image stored.
+
+        Args:
+            buf (buffer): Writable buffer of the cache.
+            offsets (np.ndarray): Offset of each image.
+            hw (np.ndarray): Resized image shapes (h, w).
+            storage (str): Cache storage name to display.
+        """
+        cached = np.ndarray((self.ni,), dtype=np.uint8, buffer=buf)
+        b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
+        with ThreadPool(NUM_THREADS) as pool:
+            pbar = TQDM(enumerate(pool.imap(self.load_image, range(self.ni))), total=self.ni, disable=LOCAL_RANK > 0)
+            for i, (im, _, _) in pbar:
+                if im.shape == (*hw[i], 3):  # else labels shape disagrees with image, read from disk instead
+                    np.ndarray(im.shape, dtype=np.uint8, buffer=buf, offset=offsets[i])[:] = im
+                    cached[i] = 1
+                    b += im.nbytes
+                pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB {storage})"
+            pbar.close()
+
+    def attach_cache(self, buf, offsets, hw0, hw):
+        """
+        Point `ims` at read-only views of the images stored in a cache buffer with the layout of `cache_layout`.
+
+        Attached images are returned by `load_image` without passing through the mosaic buffer, so the buffer is seeded
+        with them as `cache_images` does for 'ram'.
+        """
+        cached = np.flatnonzero(np.ndarray((self.ni,), dtype=np.uint8, buffer=buf))
+        for i in cached:
+            im = np.ndarray((*hw[i], 3), dtype=np.uint8, buffer=buf, offset=offsets[i])
+            im.flags.writeable = False
+            self.ims[i], self.im_hw0[i], self.im_hw[i] = im, tuple(hw0[i].tolist()), tuple(hw[i].tolist())
+        self.buffer = cached[: self.max_buffer_length].tolist()
+
+    def cache_images_shm(self):
+        """
+        Cache images in a single shared-memory block used by all DDP ranks and dataloader workers on this machine.
+
+        The first process decodes and resizes every image into the block, later ones (i.e. other DDP ranks, which build
+        their datasets after rank 0) attach to it by name, so RAM holds one copy of the dataset however many processes
+        train on it. The block is removed when the process that created it exits.
+        """
+        from multiprocessing import shared_memory
+
+        name, size, offsets, hw0, hw = self.cache_layout()
+        try:
+            shm, create = attach_shared_memory(name), False
+        except FileNotFoundError:
+            if not self.check_cache_shm(size):
+                return
+            try:
+                shm, create = shared_memory.SharedMemory(name, create=True, size=size), True
+            except FileExistsError:  # created by another process meanwhile
+                shm, create = attach_shared_memory(name), False
+        if shm.size < size:
+            LOGGER.warning(f"{self.prefix}WARNING ⚠️ Shared memory {name} has an unexpected size, not caching images")
+            shm.close()
+            self.cache = None
+            return
+        if create:
+            self.fill_cache(shm.buf, offsets, hw, "shared memory")
+            atexit.register(self.unlink_shm, shm)
+        self.attach_cache(shm.buf, offsets, hw0, hw)
+        self.shm = shm
+
+    @staticmethod
+    def unlink_shm(shm):
+        """Remove a shared memory block, which stays mapped in processes still using it."""
+        with contextlib.suppress(FileNotFoundError):
+            shm.unlink()
+
+    def cache_images_pack(self):
+        """
+        Cache images in a single pack file next to the image directory, memory-mapped by all processes using it.
+
+        Unlike cache='disk', which saves every full-resolution image as an *.npy file, the pack stores images already
+        resized to imgsz with the layout of `cache_layout`, so it is a fraction of the size and is read without decoding
+        or resizing. Its pages are shared by all processes on a machine through the page cache. A pack built for other
+        images or another imgsz is rebuilt.
+        """
+        name, size, offsets, hw0, hw = self.cache_layout()
+        path = self.pack_file()
+        try:
+            pack = load_dataset_cache_file(path)  # attempt to load a *.pack file
+            assert pack["name"] == name  # matches images and imgsz
+        except (FileNotFoundError, AssertionError, EOFError, ValueError, KeyError):
+            pack = None
+        if pack is None:
+            if not self.check_cache_disk(size=size, path=path):
+                return
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                with open(tmp, "wb") as file:
+                    np.save(file, {"name": name, "arrays": {"data": ("|u1", (size,), 0)}})
+                    start = -(-file.tell() // CACHE_ALIGN) * CACHE_ALIGN
+                    file.truncate(start + size)
+                data = np.memmap(tmp, dtype=np.uint8, mode="r+", offset=start, shape=(size,))
+                self.fill_cache(data, offsets, hw, "Disk")
+                data.flush()
+                del data
+                os.replace(tmp, path)
+            except OSError as e:
+                LOGGER.warning(
+                    f"{self.prefix}WARNING ⚠️ Cache file {path} could not be written, not caching images: {e}"
+                )
+                tmp.unlink(missing_ok=True)
+                self.cache = None
+                return
+            pack = load_dataset_cache_file(path)
+            LOGGER.info(f"{self.prefix}New cache created: {path}")
+        self.attach_cache(pack["arrays"]["data"], offsets, hw0, hw)
+
+    def pack_file(self):
+        """Return the path of the pack image cache, i.e. 'images/train.640.pack' for images in 'images/train'."""
+        directory = Path(self.im_files[0]).parent
+        return directory.parent / f"{directory.name}.{self.imgsz}.pack"
+
+    def __getstate__(self):
+        """Pickle the dataset without images cached in shared memory or a pack, which are attached when unpickled."""
+        state = self.__dict__.copy()
+        if self.cache in {"shm", "pack"}:
+            state["ims"], state["shm"] = [None] * self.ni, None
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled dataset, attaching to its shared-memory or pack image cache if it has one."""
+        self.__dict__.update(state)
+        if self.cache == "shm":
+            self.cache_images_shm()
+        elif self.cache == "pack":
+            self.cache_images_pack()
+
     def cache_images_to_disk(self, i):
         """Save an image as an *.npy file for faster loading."""
         f = self.npy_files[i]
         if not f.exists():
             np.save(f.as_posix(), cv2.imread(self.im_files[i]), allow_pickle=False)
 
-    def check_cache_disk(self, safety_margin=0.5):
+    def check_cache_disk(self, safety_margin=0.5, size=None, path=None):
         """
         Check if there's enough disk space for caching images.
 
         Args:
             safety_margin (float, optional): Safety margin factor for disk space calculation.
+            size (int, optional): Exact bytes required, i.e. by a pack file. If None, the size of full-resolution *.npy
+                files is extrapolated from 30 random images.
+            path (Path, optional): Cache file the size applies to.
 
         Returns:
             (bool): True if there's enough disk space, False otherwise.
         """
-        import shutil
-
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
-        n = min(self.ni, 30)  # extrapolate from 30 random images
-        for _ in range(n):
-            im_file = random.choice(self.im_files)
-            im = cv2.imread(im_file)
-            if im is None:
-                continue
-            b += im.nbytes
-            if not os.access(Path(im_file).parent, os.W_OK):
+        if size is None:
+            n = min(self.ni, 30)  # extrapolate from 30 random images
+            for _ in range(n):
+                im_file = random.choice(self.im_files)
+                im = cv2.imread(im_file)
+                if im is None:
+                    continue
+                b += im.nbytes + 128  # *.npy header
+                if not os.access(Path(im_file).parent, os.W_OK):
+                    self.cache = None
+                    LOGGER.info(f"{self.prefix}Skipping caching images to disk, directory not writeable ⚠️")
+                    return False
+            disk_required = b * self.ni / n * (1 + safety_margin)  # bytes required to cache dataset to disk
+            directory = Path(self.im_files[0]).parent
+        else:
+            directory = path.parent
+            if not os.access(directory, os.W_OK):
                 self.cache = None
                 LOGGER.info(f"{self.prefix}Skipping caching images to disk, directory not writeable ⚠️")
                 return False
-        disk_required = b * self.ni / n * (1 + safety_margin)  # bytes required to cache dataset to disk
-        total, used, free = shutil.disk_usage(Path(self.im_files[0]).parent)
+            disk_required = size * (1 + safety_margin)
+        total, used, free = shutil.disk_usage(directory)
         if disk_required > free:
             self.cache = None
             LOGGER.info(
@@ -308,6 +509,33 @@ class BaseDataset(Dataset):
             return False
         return True
 
+    def check_cache_shm(self, b, safety_margin=0.5):
+        """
+        Check if there's enough RAM and shared memory for caching images in shared memory.
+
+        Args:
+            b (int): Bytes required by the cached images.
+            safety_margin (float, optional): Safety margin factor for RAM calculation.
+
+        Returns:
+            (bool): True if there's enough memory, False otherwise.
+        """
+        gb = 1 << 30  # bytes per gigabytes
+        mem_required = b * (1 + safety_margin)  # bytes required to cache dataset into shared memory once
+        mem = psutil.virtual_memory()
+        available = mem.available
+        if os.path.isdir("/dev/shm"):  # POSIX shared memory is limited by the size of its tmpfs
+            available = min(available, shutil.disk_usage("/dev/shm").free)
+        if mem_required > available:
+            self.cache = None
+            LOGGER.info(
+                f"{self.prefix}{mem_required / gb:.1f}GB shared memory required to cache images "
+                f"with {int(safety_margin * 100)}% safety margin but only "
+                f"{available / gb:.1f}/{mem.total / gb:.1f}GB available, not caching images ⚠️"
+            )
+            return False
+        return True
+
     def check_cache_ram(self, safety_margin=0.5):
         """
         Check if there's enough RAM for caching images.
@@ -343,11 +571,12 @@ class BaseDataset(Dataset):
         bi = np.floor(np.arange(self.ni) / self.batch_size).astype(int)  # batch index
         nb = bi[-1] + 1  # number of batches
 
-        s = np.array([x.pop("shape") for x in self.labels])  # hw
+        store = isinstance(self.labels, LabelStore)
+        s = self.labels.shapes if store else np.array([x.pop("shape") for x in self.labels])  # hw
         ar = s[:, 0] / s[:, 1]  # aspect ratio
         irect = ar.argsort()
         self.im_files = [self.im_files[i] for i in irect]
-        self.labels = [self.labels[i] for i in irect]
+        self.labels = self.labels[irect] if store else [self.labels[i] for i in irect]
         ar = ar[irect]
 
         # Set training image shapes
@@ -96,6 +96,35 @@ class _RepeatSampler:
             yield from iter(self.sampler)
 
 
+class ContiguousDistributedSampler(distributed.DistributedSampler):
+    """
+    Distributed sampler that splits a dataset into contiguous, batch-aligned shards without padding or shuffling.
+
+    Unlike DistributedSampler, which interleaves indices and repeats samples so every rank gets the same count, each
+    rank here receives a consecutive run of whole batches. Batches are identical to single-process loading, which keeps
+    'rect' batch shapes valid, every image is seen exactly once, and concatenating the per-rank results in rank order
+    restores the dataset order. Ranks may get unequal numbers of batches, so this is meant for validation only.
+
+    Attributes:
+        start (int): First dataset index of this rank's shard.
+        end (int): Dataset index one past the end of this rank's shard.
+    """
+
+    def __init__(self, dataset, batch_size, num_replicas=None, rank=None):
+        """Initialize the sampler with the shard of whole batches belonging to this rank."""
+        super().__init__(dataset, num_replicas=num_replicas, rank=rank, shuffle=False)
+        n = len(dataset)
+        nb = -(-n // batch_size)  # number of batches
+        self.start = min(self.rank * nb // self.num_replicas * batch_size, n)
+        self.end = min((self.rank + 1) * nb // self.num_replicas * batch_size, n)
+        self.num_samples = self.end - self.start
+        self.total_size = n
+
+    def __iter__(self):
+        """Iterate over the dataset indices of this rank's shard in order."""
+        return iter(range(self.start, self.end))
+
+
 def seed_worker(worker_id):  # noqa
     """Set dataloader worker seed for reproducibility across worker processes."""
     worker_seed = torch.initial_seed() % 2**32
@@ -146,7 +175,7 @@ def build_grounding(cfg, img_path, json_file, batch, mode="train", rect=False, s
     )
 
 
-def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1):
+def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1, shard=False):
     """
     Create and return an InfiniteDataLoader or DataLoader for training or validation.
 
@@ -156,6 +185,8 @@ def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1):
         workers (int): Number of worker threads for loading data.
         shuffle (bool): Whether to shuffle the dataset.
         rank (int): Process rank in distributed training. -1 for single-GPU training.
+        shard (bool): Whether to split the dataset into unpadded, batch-aligned shards across the ranks of the
+            initialized process group, for distributed validation.
 
     Returns:
         (InfiniteDataLoader): A dataloader that can be used for training or validation.
@@ -163,7 +194,10 @@ def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1):
     batch = min(batch, len(dataset))
     nd = torch.cuda.device_count()  # number of CUDA devices
     nw = min(os.cpu_count() // max(nd, 1), workers)  # number of workers
-    sampler = None if rank == -1 else distributed.DistributedSampler(dataset, shuffle=shuffle)
+    if shard:
+        sampler = ContiguousDistributedSampler(dataset, batch)
+    else:
+        sampler = None if rank == -1 else distributed.DistributedSampler(dataset, shuffle=shuffle)
     generator = torch.Generator()
     generator.manual_seed(6148914691236517205 + RANK)
     return InfiniteDataLoader(
@@ -222,7 +256,9 @@ def check_source(source):
     return source, webcam, screenshot, from_img, in_memory, tensor
 
 
-def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False):
+def load_inference_source(
+    source=None, batch=1, vid_stride=1, buffer=False, stream_policy=None, stream_latency=None, stream_priority=None
+):
     """
     Load an inference source for object detection and apply necessary transformations.
 
@@ -231,6 +267,10 @@ def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False):
         batch (int, optional): Batch size for dataloaders.
         vid_stride (int, optional): The frame interval for video sources.
         buffer (bool, optional): Whether stream frames will be buffered.
+        stream_policy (str, optional): Frame policy for streams, one of 'latest', 'drop_oldest' or 'buffer'.
+        stream_latency (float, optional): Max seconds a stream frame waits for other streams before a partial batch
+            of at most `batch` fresh frames is returned, or None to wait for every stream.
+        stream_priority (List[int], optional): Per-stream priorities for filling partial batches.
 
     Returns:
         (Dataset): A dataset object for the specified input source with attached source_type attribute.
@@ -244,7 +284,15 @@ def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False):
     elif in_memory:
         dataset = source
     elif stream:
-        dataset = LoadStreams(source, vid_stride=vid_stride, buffer=buffer)
+        dataset = LoadStreams(
+            source,
+            vid_stride=vid_stride,
+            buffer=buffer,
+            policy=stream_policy,
+            latency=stream_latency,
+            priority=stream_priority,
+            batch=batch if batch > 1 else None,
+        )
     elif screenshot:
         dataset = LoadScreenshots(source)
     elif from_img:
@@ -617,20 +617,19 @@ def yolo_bbox2segment(im_dir, save_dir=None, sam_model="sam_b.pt", device=None):
 
     LOGGER.info("Detection labels detected, generating segment labels by SAM model!")
     sam_model = SAM(sam_model)
-    for label in TQDM(dataset.labels, total=len(dataset.labels), desc="Generating segment labels"):
+    labels = list(dataset.labels)  # label dicts to add segments to
+    for label in TQDM(labels, total=len(labels), desc="Generating segment labels"):
         h, w = label["shape"]
-        boxes = label["bboxes"]
-        if len(boxes) == 0:  # skip empty labels
+        if len(label["bboxes"]) == 0:  # skip empty labels
             continue
-        boxes[:, [0, 2]] *= w
-        boxes[:, [1, 3]] *= h
+        boxes = label["bboxes"] * np.array([w, h, w, h], dtype=np.float32)  # cached arrays are read-only
         im = cv2.imread(label["im_file"])
         sam_results = sam_model(im, bboxes=xywh2xyxy(boxes), verbose=False, save=False, device=device)
         label["segments"] = sam_results[0].masks.xyn
 
     save_dir = Path(save_dir) if save_dir else Path(im_dir).parent / "labels-segment"
     save_dir.mkdir(parents=True, exist_ok=True)
-    for label in dataset.labels:
+    for label in labels:
         texts = []
         lb_name = Path(label["im_file"]).with_suffix(".txt").name
         txt_file = save_dir / lb_name
@@ -1,6 +1,7 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import json
+import multiprocessing as mp
 from collections import defaultdict
 from itertools import repeat
 from multiprocessing.pool import ThreadPool
@@ -30,6 +31,8 @@ from .base import BaseDataset
 from .utils import (
     HELP_URL,
     LOGGER,
+    LabelStore,
+    file_stats,
     get_hash,
     img2label_paths,
     load_dataset_cache_file,
@@ -39,7 +42,8 @@ from .utils import (
 )
 
 # Ultralytics dataset *.cache version, >= 1.0.0 for YOLOv8
-DATASET_CACHE_VERSION = "1.0.3"
+DATASET_CACHE_VERSION = "1.1.0"
+VERIFY_PROCESSES_MIN = 2000  # verify labels in worker processes instead of threads from this many images
 
 
 class YOLODataset(BaseDataset):
@@ -57,6 +61,7 @@ class YOLODataset(BaseDataset):
 
     Methods:
         cache_labels: Cache dataset labels, check images and read shapes.
+        cache_params: Returns the settings that label verification depends on.
         get_labels: Returns dictionary of labels for YOLO training.
         build_transforms: Builds and appends transforms to the list.
         close_mosaic: Sets mosaic, copy_paste and mixup options to 0.0 and builds transformations.
@@ -85,73 +90,98 @@ class YOLODataset(BaseDataset):
         assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
         super().__init__(*args, **kwargs)
 
-    def cache_labels(self, path=Path("./labels.cache")):
+    def cache_labels(self, path=Path("./labels.cache"), cache=None):
         """
         Cache dataset labels, check images and read shapes.
 
+        Only images that are new, or whose image or label file size or modification time changed since `cache` was
+        built, are verified again; the labels of all other images are reused from `cache`.
+
         Args:
             path (Path): Path where to save the cache file.
+            cache (dict, optional): Previously saved cache to update.
 
         Returns:
-            (dict): Dictionary containing cached labels and related information.
+            (dict): Dictionary containing cached labels and related information, `cache` itself if it is up to date.
         """
-        x = {"labels": []}
-        nm, nf, ne, nc, msgs = 0, 0, 0, 0, []  # number missing, found, empty, corrupt, messages
-        desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
-        total = len(self.im_files)
         nkpt, ndim = self.data.get("kpt_shape", (0, 0))
         if self.use_keypoints and (nkpt <= 0 or ndim not in {2, 3}):
             raise ValueError(
                 "'kpt_shape' in data.yaml missing or incorrect. Should be a list with [number of "
                 "keypoints, number of dims (2 for x,y or 3 for x,y,visible)], i.e. 'kpt_shape: [17, 3]'"
             )
-        with ThreadPool(NUM_THREADS) as pool:
-            results = pool.imap(
-                func=verify_image_label,
-                iterable=zip(
-                    self.im_files,
-                    self.label_files,
-                    repeat(self.prefix),
-                    repeat(self.use_keypoints),
-                    repeat(len(self.data["names"])),
-                    repeat(nkpt),
-                    repeat(ndim),
+        stats = np.concatenate((file_stats(self.im_files), file_stats(self.label_files)), 1)
+        rows = np.full(len(self.im_files), -1)  # row of each image in the previous cache, -1 if it must be verified
+        old = LabelStore(cache["arrays"]) if cache is not None else None
+        if old is not None:
+            lookup = {f: i for i, f in enumerate(old.im_files)}
+            rows = np.array([lookup.get(f, -1) for f in self.im_files], dtype=np.int64)
+            found = rows >= 0
+            new, removed = len(rows) - found.sum(), len(old) - found.sum()
+            found[found] = (old.arrays["stats"][rows[found]] == stats[found]).all(1)  # unchanged files
+            rows[~found] = -1
+            if found.all() and not removed:
+                cache["labels"] = LabelStore(cache["arrays"], np.flatnonzero(old.arrays["status"][:, 3] == 0), path)
+                return cache  # up to date
+            if LOCAL_RANK in {-1, 0}:
+                changed = len(rows) - found.sum() - new
+                LOGGER.info(f"{self.prefix}Updating {path}: {new} new, {changed} changed, {removed} removed images")
+        keep, todo = np.flatnonzero(rows >= 0), np.flatnonzero(rows < 0)
+        msgs = {f: cache["msgs"][f] for f in (self.im_files[i] for i in keep) if f in cache["msgs"]}  # reused warnings
+        nm, nf, ne, nc = old.arrays["status"][rows[keep]].sum(0).tolist() if len(keep) else (0, 0, 0, 0)
+        results = []
+        desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
+        im_files = [self.im_files[i] for i in todo]
+        processes = len(todo) >= VERIFY_PROCESSES_MIN and not mp.current_process().daemon  # daemons can't fork
+        with (mp.Pool if processes else ThreadPool)(NUM_THREADS) as pool:
+            pbar = TQDM(
+                pool.imap(
+                    func=verify_image_label,
+                    iterable=zip(
+                        im_files,
+                        [self.label_files[i] for i in todo],
+                        repeat(self.prefix),
+                        repeat(self.use_keypoints),
+                        repeat(len(self.data["names"])),
+                        repeat(nkpt),
+                        repeat(ndim),
+                    ),
+                    chunksize=64 if processes else 1,
                 ),
+                desc=desc,
+                total=len(self.im_files),
+                initial=len(keep),
             )
-            pbar = TQDM(results, desc=desc, total=total)
-            for im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg in pbar:
+            for im_file, result in zip(im_files, pbar):
+                *_, nm_f, nf_f, ne_f, nc_f, msg = result
                 nm += nm_f
                 nf += nf_f
                 ne += ne_f
                 nc += nc_f
-                if im_file:
-                    x["labels"].append(
-                        {
-                            "im_file": im_file,
-                            "shape": shape,
-                            "cls": lb[:, 0:1],  # n, 1
-                            "bboxes": lb[:, 1:],  # n, 4
-                            "segments": segments,
-                            "keypoints": keypoint,
-                            "normalized": True,
-                            "bbox_format": "xywh",
-                        }
-                    )
+                results.append(result)
                 if msg:
-                    msgs.append(msg)
+                    msgs[im_file] = msg
                 pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
             pbar.close()
 
         if msgs:
-            LOGGER.info("\n".join(msgs))
+            LOGGER.info("\n".join(msgs.values()))
         if nf == 0:
             LOGGER.warning(f"{self.prefix}WARNING ⚠️ No labels found in {path}. {HELP_URL}")
-        x["hash"] = get_hash(self.label_files + self.im_files)
-        x["results"] = nf, nm, ne, nc, len(self.im_files)
+        new = LabelStore.from_results(im_files, results, stats[todo], nkpt if self.use_keypoints else 0)
+        store = LabelStore.concat([old[rows[keep]], new] if len(keep) else [new])
+        store = LabelStore(store._gather(np.argsort(np.concatenate((keep, todo)), kind="stable")))  # image order
+        x = {"arrays": store.arrays, "params": self.cache_params(), "results": (nf, nm, ne, nc, len(self.im_files))}
         x["msgs"] = msgs  # warnings
-        save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION)
+        if save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION):
+            store = LabelStore(load_dataset_cache_file(path)["arrays"], path=path)  # map saved arrays from disk
+        x["labels"] = store[np.flatnonzero(store.arrays["status"][:, 3] == 0)]  # skip corrupt images
         return x
 
+    def cache_params(self):
+        """Return the settings that label verification depends on, a cache built with other settings is discarded."""
+        return self.use_keypoints, len(self.data["names"]), tuple(self.data.get("kpt_shape", (0, 0)))
+
     def get_labels(self):
         """
         Returns dictionary of labels for YOLO training.
@@ -159,44 +189,44 @@ class YOLODataset(BaseDataset):
         This method loads labels from disk or cache, verifies their integrity, and prepares them for training.
 
         Returns:
-            (List[dict]): List of label dictionaries, each containing information about an image and its annotations.
+            (LabelStore): List-like store of label dictionaries, each containing information about an image and its
+                annotations.
         """
         self.label_files = img2label_paths(self.im_files)
         cache_path = Path(self.label_files[0]).parent.with_suffix(".cache")
         try:
-            cache, exists = load_dataset_cache_file(cache_path), True  # attempt to load a *.cache file
+            cache = load_dataset_cache_file(cache_path)  # attempt to load a *.cache file
             assert cache["version"] == DATASET_CACHE_VERSION  # matches current version
-            assert cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
-        except (FileNotFoundError, AssertionError, AttributeError):
-            cache, exists = self.cache_labels(cache_path), False  # run cache ops
+            assert cache["params"] == self.cache_params()  # verified with identical settings
+        except (FileNotFoundError, AssertionError, AttributeError, KeyError):
+            cache = None
+        x = self.cache_labels(cache_path, cache)  # verify new and changed files only
+        exists = x is cache
 
         # Display cache
-        nf, nm, ne, nc, n = cache.pop("results")  # found, missing, empty, corrupt, total
+        nf, nm, ne, nc, n = x["results"]  # found, missing, empty, corrupt, total
         if exists and LOCAL_RANK in {-1, 0}:
             d = f"Scanning {cache_path}... {nf} images, {nm + ne} backgrounds, {nc} corrupt"
             TQDM(None, desc=self.prefix + d, total=n, initial=n)  # display results
-            if cache["msgs"]:
-                LOGGER.info("\n".join(cache["msgs"]))  # display warnings
+            if x["msgs"]:
+                LOGGER.info("\n".join(x["msgs"].values()))  # display warnings
 
         # Read cache
-        [cache.pop(k) for k in ("hash", "version", "msgs")]  # remove items
-        labels = cache["labels"]
-        if not labels:
+        labels = x["labels"]
+        if not len(labels):
             LOGGER.warning(f"WARNING ⚠️ No images found in {cache_path}, training may not work correctly. {HELP_URL}")
-        self.im_files = [lb["im_file"] for lb in labels]  # update im_files
+        self.im_files = labels.im_files  # update im_files
 
         # Check if the dataset is all boxes or all segments
-        lengths = ((len(lb["cls"]), len(lb["bboxes"]), len(lb["segments"])) for lb in labels)
-        len_cls, len_boxes, len_segments = (sum(x) for x in zip(*lengths))
+        len_boxes, len_segments = labels.lengths()
         if len_segments and len_boxes != len_segments:
             LOGGER.warning(
                 f"WARNING ⚠️ Box and segment counts should be equal, but got len(segments) = {len_segments}, "
                 f"len(boxes) = {len_boxes}. To resolve this only boxes will be used and all segments will be removed. "
                 "To avoid this please supply either a detect or segment dataset, not a detect-segment mixed dataset."
             )
-            for lb in labels:
-                lb["segments"] = []
-        if len_cls == 0:
+            labels = labels.drop_segments()
+        if len_boxes == 0:
             LOGGER.warning(f"WARNING ⚠️ No labels found in {cache_path}, training may not work correctly. {HELP_URL}")
         return labels
 
@@ -6,7 +6,7 @@ import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Thread
+from threading import Condition, Thread
 from urllib.parse import urlparse
 
 import cv2
@@ -60,15 +60,25 @@ class LoadStreams:
         sources (List[str]): The source input paths or URLs for the video streams.
         vid_stride (int): Video frame-rate stride.
         buffer (bool): Whether to buffer input streams.
+        policy (str): Frame policy of the stream buffers, one of 'latest', 'drop_oldest' or 'buffer'.
+        latency (float | None): Max seconds a frame waits for other streams before a partial batch is returned, or
+            None to wait for every stream.
+        priority (List[int]): Priority of each stream, higher priority streams are batched first.
         running (bool): Flag to indicate if the streaming thread is running.
         mode (str): Set to 'stream' indicating real-time capture.
         imgs (List[List[np.ndarray]]): List of image frames for each stream.
+        times (List[List[float]]): Capture times of the buffered frames for each stream.
+        cond (threading.Condition): Condition variable guarding the buffers, notified on new frames and consumption.
         fps (List[float]): List of FPS for each stream.
         frames (List[int]): List of total frames for each stream.
         threads (List[Thread]): List of threads for each stream.
         shape (List[Tuple[int, int, int]]): List of shapes for each stream.
         caps (List[cv2.VideoCapture]): List of cv2.VideoCapture objects for each stream.
-        bs (int): Batch size for processing.
+        bs (int): Batch size for processing, equal to the number of streams.
+        max_batch (int): Max frames per batch if `latency` is set.
+        stream_ids (List[int]): Stream indices of the frames in the last returned batch.
+        lag (List[float]): Seconds between capture and batching of the last returned frame for each stream.
+        dropped (List[int]): Number of frames dropped by the frame policy for each stream.
 
     Methods:
         update: Read stream frames in daemon thread.
@@ -84,29 +94,65 @@ class LoadStreams:
         ...     pass
         >>> stream_loader.close()
 
+        Batch whichever of 16 cameras have fresh frames at most 50ms after capture, 8 frames at a time
+        >>> stream_loader = LoadStreams("cameras.streams", latency=0.05, batch=8)
+
     Notes:
         - The class uses threading to efficiently load frames from multiple streams simultaneously.
         - It automatically handles YouTube links, converting them to the best available stream URL.
         - The class implements a buffer system to manage frame storage and retrieval.
+        - With `latency` set, a slow or stalled stream no longer holds back the others; its frames are simply
+          batched whenever they arrive.
     """
 
-    def __init__(self, sources="file.streams", vid_stride=1, buffer=False):
-        """Initialize stream loader for multiple video sources, supporting various stream types."""
+    def __init__(
+        self, sources="file.streams", vid_stride=1, buffer=False, policy=None, latency=None, priority=None, batch=None
+    ):
+        """
+        Initialize stream loader for multiple video sources, supporting various stream types.
+
+        Args:
+            sources (str): Stream URL, webcam index or path to a *.streams file with one source per line.
+            vid_stride (int): Video frame-rate stride.
+            buffer (bool): Whether to buffer input streams, used as the 'buffer' policy if `policy` is None.
+            policy (str | None): Frame policy when the model falls behind a stream. 'latest' keeps only the newest
+                frame, 'drop_oldest' keeps the newest 30 frames and 'buffer' keeps 30 frames and pauses reading.
+            latency (float | None): Max seconds a frame waits for frames from other streams before a partial batch
+                is returned. None waits for a frame from every stream.
+            priority (List[int] | None): Priority of each stream. If more streams have fresh frames than fit in a
+                batch, higher priority streams are batched first, then the longest waiting ones.
+            batch (int | None): Max frames per batch if `latency` is set, defaults to the number of streams.
+        """
         torch.backends.cudnn.benchmark = True  # faster for fixed-size inference
         self.buffer = buffer  # buffer input streams
+        self.policy = policy or ("buffer" if buffer else "latest")
+        if self.policy not in {"latest", "drop_oldest", "buffer"}:
+            raise ValueError(
+                f"Invalid stream policy '{self.policy}', valid policies are 'latest', 'drop_oldest', 'buffer'."
+            )
+        self.latency = latency
         self.running = True  # running flag for Thread
         self.mode = "stream"
         self.vid_stride = vid_stride  # video frame-rate stride
+        self.cond = Condition()  # guards imgs and times
 
         sources = Path(sources).read_text().rsplit() if os.path.isfile(sources) else [sources]
         n = len(sources)
         self.bs = n
+        self.max_batch = min(batch or n, n)
+        self.priority = list(priority) if priority is not None else [0] * n
+        if len(self.priority) != n:
+            raise ValueError(f"Expected {n} stream priorities but got {len(self.priority)}.")
         self.fps = [0] * n  # frames per second
         self.frames = [0] * n
         self.threads = [None] * n
         self.caps = [None] * n  # video capture objects
         self.imgs = [[] for _ in range(n)]  # images
+        self.times = [[] for _ in range(n)]  # image capture times
         self.shape = [[] for _ in range(n)]  # image shapes
+        self.stream_ids = list(range(n))  # streams in last batch
+        self.lag = [0.0] * n  # seconds from capture to batch
+        self.dropped = [0] * n  # frames dropped by policy
         self.sources = [ops.clean_str(x).replace(os.sep, "_") for x in sources]  # clean source names for later
         for i, s in enumerate(sources):  # index, source
             # Start thread to read frames from video stream
@@ -135,6 +181,7 @@ class LoadStreams:
             if not success or im is None:
                 raise ConnectionError(f"{st}Failed to read images from {s}")
             self.imgs[i].append(im)
+            self.times[i].append(time.perf_counter())
             self.shape[i] = im.shape
             self.threads[i] = Thread(target=self.update, args=([i, self.caps[i], s]), daemon=True)
             LOGGER.info(f"{st}Success ✅ ({self.frames[i]} frames of shape {w}x{h} at {self.fps[i]:.2f} FPS)")
@@ -142,10 +189,15 @@ class LoadStreams:
         LOGGER.info("")  # newline
 
     def update(self, i, cap, stream):
-        """Read stream frames in daemon thread and update image buffer."""
+        """Read stream frames in daemon thread and update image buffer according to the frame policy."""
         n, f = 0, self.frames[i]  # frame number, frame array
-        while self.running and cap.isOpened() and n < (f - 1):
-            if len(self.imgs[i]) < 30:  # keep a <=30-image buffer
+        x, t = self.imgs[i], self.times[i]
+        try:
+            while self.running and cap.isOpened() and n < (f - 1):
+                if self.policy == "buffer":
+                    with self.cond:  # wait until the <=30-image buffer has room
+                        if not self.cond.wait_for(lambda: len(x) < 30 or not self.running, timeout=1):
+                            continue
                 n += 1
                 cap.grab()  # .read() = .grab() followed by .retrieve()
                 if n % self.vid_stride == 0:
@@ -154,16 +206,27 @@ class LoadStreams:
                         im = np.zeros(self.shape[i], dtype=np.uint8)
                         LOGGER.warning("WARNING ⚠️ Video stream unresponsive, please check your IP camera connection.")
                         cap.open(stream)  # re-open stream if signal was lost
-                    if self.buffer:
-                        self.imgs[i].append(im)
-                    else:
-                        self.imgs[i] = [im]
-            else:
-                time.sleep(0.01)  # wait until the buffer is empty
+                    with self.cond:
+                        if self.policy == "latest":
+                            self.dropped[i] += len(x)
+                            x.clear()
+                            t.clear()
+                        elif len(x) >= 30:  # 'drop_oldest'
+                            self.dropped[i] += 1
+                            x.pop(0)
+                            t.pop(0)
+                        x.append(im)
+                        t.append(time.perf_counter())
+                        self.cond.notify_all()
+        finally:
+            with self.cond:
+                self.cond.notify_all()  # wake __next__ to notice the finished stream
 
     def close(self):
         """Terminates stream loader, stops threads, and releases video capture resources."""
         self.running = False  # stop flag for Thread
+        with self.cond:
+            self.cond.notify_all()
         for thread in self.threads:
             if thread.is_alive():
                 thread.join(timeout=5)  # Add timeout
@@ -172,6 +235,8 @@ class LoadStreams:
                 cap.release()  # release video capture
             except Exception as e:
                 LOGGER.warning(f"WARNING ⚠️ Could not release VideoCapture object: {e}")
+        if any(self.dropped):
+            LOGGER.info(f"Dropped frames per stream: {dict(zip(self.sources, self.dropped))}")
         cv2.destroyAllWindows()
 
     def __iter__(self):
@@ -182,29 +247,71 @@ class LoadStreams:
     def __next__(self):
         """Returns the next batch of frames from multiple video streams for processing."""
         self.count += 1
+        with self.cond:
+            ids = self._wait_all() if self.latency is None else self._wait_any()
+            images = None if ids is None else self._pop_frames(ids)
+        if ids is None:
+            self.close()  # without the lock, which reader threads need to exit before close() joins them
+            raise StopIteration
 
-        images = []
-        for i, x in enumerate(self.imgs):
-            # Wait until a frame is available in each buffer
-            while not x:
-                if not self.threads[i].is_alive() or cv2.waitKey(1) == ord("q"):  # q to quit
-                    self.close()
-                    raise StopIteration
-                time.sleep(1 / min(self.fps))
-                x = self.imgs[i]
-                if not x:
-                    LOGGER.warning(f"WARNING ⚠️ Waiting for stream {i}")
+        self.stream_ids = ids
+        if self.latency is None:
+            return self.sources, images, [""] * len(ids)
+        info = [f"lag {self.lag[i] * 1e3:.0f}ms, {self.dropped[i]} dropped " for i in ids]
+        return [self.sources[i] for i in ids], images, info
+
+    def _pop_frames(self, ids):
+        """Take the next frame of each stream in 'ids' with the lock held, recording its lag and any dropped frames."""
+        images, now = [], time.perf_counter()
+        for i in ids:
+            x, t = self.imgs[i], self.times[i]
 
             # Get and remove the first frame from imgs buffer
-            if self.buffer:
+            if self.policy != "latest":
                 images.append(x.pop(0))
+                self.lag[i] = now - t.pop(0)
 
             # Get the last frame, and clear the rest from the imgs buffer
             else:
-                images.append(x.pop(-1) if x else np.zeros(self.shape[i], dtype=np.uint8))
+                images.append(x.pop(-1))
+                self.lag[i] = now - t.pop(-1)
+                self.dropped[i] += len(x)
                 x.clear()
+                t.clear()
+        self.cond.notify_all()  # wake readers waiting for buffer room
+        return images
 
-        return self.sources, images, [""] * self.bs
+    def _wait_all(self):
+        """Wait for a frame from every stream with the lock held, returning all stream indices or None if one ended."""
+        for i, x in enumerate(self.imgs):
+            while not x:
+                if not self.threads[i].is_alive() or cv2.waitKey(1) == ord("q"):  # q to quit
+                    return None
+                if not self.cond.wait(timeout=1 / min(self.fps)) and not x:
+                    LOGGER.warning(f"WARNING ⚠️ Waiting for stream {i}")
+        return list(range(self.bs))
+
+    def _wait_any(self):
+        """
+        Wait with the lock held until a batch of fresh frames is ready or the oldest one exceeds the latency budget.
+
+        Returns:
+            (List[int] | None): Sorted stream indices of up to `max_batch` fresh frames, chosen by priority then age,
+                or None if all streams have ended.
+        """
+        while True:
+            fresh = [i for i, x in enumerate(self.imgs) if x]
+            alive = [i for i, thread in enumerate(self.threads) if thread.is_alive()]
+            if fresh:
+                deadline = min(self.times[i][0] for i in fresh) + self.latency
+                if len(fresh) >= self.max_batch or set(alive) <= set(fresh) or time.perf_counter() >= deadline:
+                    break
+            elif not alive:
+                return None
+            if cv2.waitKey(1) == ord("q"):  # q to quit
+                return None
+            self.cond.wait(timeout=deadline - time.perf_counter() if fresh else 1)
+        return sorted(sorted(fresh, key=lambda i: (-self.priority[i], self.times[i][0]))[: self.max_batch])
 
     def __len__(self):
         """Return the number of video streams in the LoadStreams object."""
@@ -301,6 +408,7 @@ class LoadImagesAndVideos:
         frames (int): Total number of frames in the video.
         count (int): Counter for iteration, initialized at 0 during __iter__().
         ni (int): Number of images.
+        decode_dt (float): Seconds spent reading and decoding the last batch.
 
     Methods:
         __init__: Initialize the LoadImagesAndVideos object.
@@ -358,6 +466,7 @@ class LoadImagesAndVideos:
         self.mode = "video" if ni == 0 else "image"  # default to video if no images
         self.vid_stride = vid_stride  # video frame-rate stride
         self.bs = batch
+        self.decode_dt = 0.0
         if any(videos):
             self._new_video(videos[0])  # new video
         else:
@@ -373,9 +482,11 @@ class LoadImagesAndVideos:
     def __next__(self):
         """Returns the next batch of images or video frames with their paths and metadata."""
         paths, imgs, info = [], [], []
+        t0 = time.perf_counter()
         while len(imgs) < self.bs:
             if self.count >= self.nf:  # end of file list
                 if imgs:
+                    self.decode_dt = time.perf_counter() - t0
                     return paths, imgs, info  # return last partial batch
                 else:
                     raise StopIteration
@@ -433,6 +544,7 @@ class LoadImagesAndVideos:
                 if self.count >= self.ni:  # end of image list
                     break
 
+        self.decode_dt = time.perf_counter() - t0
         return paths, imgs, info
 
     def _new_video(self, path):
@@ -2,9 +2,11 @@
 
 import hashlib
 import json
+import math
 import os
 import random
 import subprocess
+import sys
 import time
 import zipfile
 from multiprocessing.pool import ThreadPool
@@ -37,6 +39,7 @@ from ultralytics.utils.ops import segments2boxes
 HELP_URL = "See https://docs.ultralytics.com/datasets for dataset formatting guidance."
 IMG_FORMATS = {"bmp", "dng", "jpeg", "jpg", "mpo", "png", "tif", "tiff", "webp", "pfm", "heic"}  # image suffixes
 VID_FORMATS = {"asf", "avi", "gif", "m4v", "mkv", "mov", "mp4", "mpeg", "mpg", "ts", "wmv", "webm"}  # video suffixes
+CACHE_ALIGN = 64  # byte alignment of arrays in *.cache files
 PIN_MEMORY = str(os.getenv("PIN_MEMORY", True)).lower() == "true"  # global pin_memory for dataloaders
 FORMATS_HELP_MSG = f"Supported formats are:\nimages: {IMG_FORMATS}\nvideos: {VID_FORMATS}"
 
@@ -69,6 +72,67 @@ def exif_size(img: Image.Image):
     return s
 
 
+def imread_reduced(file: str, scale: int = 1):
+    """Decode a BGR image with OpenCV, letting libjpeg-turbo downscale JPEGs by 'scale' (1, 2, 4 or 8) in the DCT."""
+    flags = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4}.get(
+        scale, cv2.IMREAD_REDUCED_COLOR_8
+    )
+    return cv2.imdecode(np.fromfile(file, np.uint8), flags)
+
+
+def imread_draft(file: str, scale: int = 1):
+    """Decode a BGR image with PIL, using JPEG draft mode to downscale by 'scale' (1, 2, 4 or 8) while decoding."""
+    with Image.open(file) as img:
+        if scale > 1:
+            img.draft("RGB", (math.ceil(img.width / scale), math.ceil(img.height / scale)))
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        return cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)
+
+
+IMAGE_DECODERS = {"opencv": imread_reduced, "turbo": imread_reduced, "pil": imread_draft}  # name: fn(file, scale)
+
+
+def decode_image(file: str, imgsz=None, decoder: str = "opencv", stretch: bool = False):
+    """
+    Decode an image, reducing JPEGs while decoding to the nearest power-of-two scale that still covers 'imgsz'.
+
+    The 'opencv' decoder always decodes at full resolution. Other decoders in IMAGE_DECODERS read the image header first
+    and are passed the largest scale in (1, 2, 4, 8) that keeps the decoded image at least as large as the subsequent
+    resize to 'imgsz', so the final resized image matches a full-resolution decode in size.
+
+    Args:
+        file (str): Image file path.
+        imgsz (int | Tuple[int, int], optional): Target size (h, w) the image is resized to after decoding, or None to
+            decode at full resolution.
+        decoder (str): Name of the decoder in IMAGE_DECODERS, i.e. 'opencv', 'turbo' or 'pil'.
+        stretch (bool): Whether the image is stretched to 'imgsz' rather than resized with its aspect ratio kept.
+
+    Returns:
+        im (np.ndarray | None): Decoded BGR image, None if the file could not be read.
+        shape (Tuple[int, int]): Original image shape (h, w) before any reduction.
+
+    Examples:
+        >>> im, (h0, w0) = decode_image("image.jpg", imgsz=640, decoder="turbo")
+    """
+    scale = 1
+    if decoder != "opencv" and imgsz:
+        try:
+            with Image.open(file) as img:
+                w0, h0 = exif_size(img)
+                jpeg = img.format == "JPEG"
+        except Exception:
+            w0 = h0 = jpeg = 0
+        if jpeg:
+            h, w = (imgsz, imgsz) if isinstance(imgsz, int) else imgsz
+            r = (max if stretch else min)(h / h0, w / w0)  # resize ratio after decoding
+            while scale < 8 and scale * 2 * r <= 1:
+                scale *= 2
+    im = IMAGE_DECODERS[decoder](file, scale)
+    if im is None:
+        return None, (0, 0)
+    return im, ((h0, w0) if scale > 1 else im.shape[:2])
+
+
 def verify_image(args):
     """Verify one image."""
     (im_file, cls), prefix = args
@@ -691,23 +755,332 @@ def autosplit(path=DATASETS_DIR / "coco8/images", weights=(0.9, 0.1, 0.0), annot
 
 
 def load_dataset_cache_file(path):
-    """Load an Ultralytics *.cache dictionary from path."""
+    """Load an Ultralytics *.cache dictionary from path, memory-mapping any raw 'arrays' stored after its header."""
     import gc
 
     gc.disable()  # reduce pickle load time https://github.com/ultralytics/ultralytics/pull/1585
-    cache = np.load(str(path), allow_pickle=True).item()  # load dict
+    with open(str(path), "rb") as file:
+        cache = np.load(file, allow_pickle=True).item()  # load dict
+        start = -(-file.tell() // CACHE_ALIGN) * CACHE_ALIGN  # first array offset
     gc.enable()
+    if isinstance(cache, dict) and isinstance(cache.get("arrays"), dict):
+        cache["arrays"] = {
+            k: np.memmap(path, dtype=dtype, mode="r", offset=start + offset, shape=shape).view(np.ndarray)
+            if np.prod(shape)
+            else np.zeros(shape, dtype=dtype)  # zero-size arrays can not be mapped
+            for k, (dtype, shape, offset) in cache["arrays"].items()
+        }
     return cache
 
 
 def save_dataset_cache_file(prefix, path, x, version):
-    """Save an Ultralytics dataset *.cache dictionary x to path."""
+    """
+    Save an Ultralytics dataset *.cache dictionary x to path.
+
+    Any 'arrays' dictionary in x is written as raw, aligned array data after the pickled header so that
+    `load_dataset_cache_file` can memory-map it instead of unpickling it.
+
+    Returns:
+        (bool): True if the cache file was written.
+    """
     x["version"] = version  # add cache version
-    if is_dir_writeable(path.parent):
+    if not is_dir_writeable(path.parent):
+        LOGGER.warning(f"{prefix}WARNING ⚠️ Cache directory {path.parent} is not writeable, cache not saved.")
+        return False
+    arrays = {k: np.ascontiguousarray(v) for k, v in x.get("arrays", {}).items()}
+    header, offset = {**x}, 0
+    if arrays:
+        header["arrays"] = {}
+        for k, v in arrays.items():
+            header["arrays"][k] = (v.dtype.str, v.shape, offset)
+            offset = -(-(offset + v.nbytes) // CACHE_ALIGN) * CACHE_ALIGN
+    try:
         if path.exists():
             path.unlink()  # remove *.cache file if exists
         with open(str(path), "wb") as file:  # context manager here fixes windows async np.save bug
-            np.save(file, x)
-        LOGGER.info(f"{prefix}New cache created: {path}")
-    else:
-        LOGGER.warning(f"{prefix}WARNING ⚠️ Cache directory {path.parent} is not writeable, cache not saved.")
+            np.save(file, header)
+            start = -(-file.tell() // CACHE_ALIGN) * CACHE_ALIGN
+            for k, v in arrays.items():
+                file.seek(start + header["arrays"][k][2])
+                file.write(v.data)
+    except OSError as e:  # i.e. old cache still mapped on Windows
+        LOGGER.warning(f"{prefix}WARNING ⚠️ Cache file {path} could not be written, cache not saved: {e}")
+        return False
+    LOGGER.info(f"{prefix}New cache created: {path}")
+    return True
+
+
+def attach_shared_memory(name):
+    """
+    Attach to an existing shared memory block without taking ownership of it.
+
+    Python < 3.13 registers attached blocks with the resource tracker like created ones, so the block would be removed
+    as soon as any attaching process exits; only the process that created a block should remove it.
+
+    Args:
+        name (str): Shared memory name.
+
+    Returns:
+        (SharedMemory): Attached shared memory.
+    """
+    from multiprocessing import resource_tracker, shared_memory
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None  # skip registration while attaching
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+def _file_stat(file):
+    """Return the (size, mtime_ns) fingerprint of a file, (-1, -1) if it does not exist."""
+    try:
+        st = os.stat(file)
+    except OSError:
+        return -1, -1
+    return st.st_size, st.st_mtime_ns
+
+
+def file_stats(files, threads=NUM_THREADS):
+    """
+    Return the (size, mtime_ns) fingerprint of each file, used to detect files that changed since a cache was built.
+
+    Files are stat'ed from several threads, which hides the per-call latency of network filesystems.
+
+    Args:
+        files (List[str]): File paths.
+        threads (int): Number of threads.
+
+    Returns:
+        (np.ndarray): Array of shape (n, 2) with -1 for missing files.
+    """
+    with ThreadPool(threads) as pool:
+        stats = pool.map(_file_stat, files, chunksize=max(1, min(1024, len(files) // (threads * 4))))
+    return np.array(stats, dtype=np.int64).reshape(-1, 2)
+
+
+def _offsets(counts):
+    """Return the offsets array of length n + 1 indexing n consecutive chunks of the given sizes."""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _ranges(starts, counts):
+    """Return the concatenation of the integer ranges [start, start + count) for all pairs of starts and counts."""
+    counts = np.asarray(counts, dtype=np.int64)
+    ends = np.cumsum(counts)
+    total = int(ends[-1]) if len(ends) else 0
+    return np.repeat(np.asarray(starts, dtype=np.int64) - (ends - counts), counts) + np.arange(total, dtype=np.int64)
+
+
+class LabelStore:
+    """
+    Columnar store of YOLO labels that behaves like a read-only list of label dictionaries.
+
+    All instances of all images are packed into flat 'cls', 'bboxes' and 'keypoints' arrays indexed by per-image
+    'label_offsets', and segment points into one 'segments' array indexed by per-instance 'segment_offsets', so a
+    dataset of millions of images is held in a handful of arrays instead of millions of Python objects. Stores loaded
+    from a *.cache file map these arrays from disk, which lets dataloader workers share them through the page cache.
+
+    Per-image columns are 'files' (utf-8 paths indexed by 'file_offsets'), 'shapes' (h, w), 'status' (missing, found,
+    empty, corrupt) and 'stats' (image and label file size and mtime), and cover every scanned image including corrupt
+    ones; `index` selects the images exposed by the store.
+
+    Attributes:
+        arrays (dict): Column name to array.
+        index (np.ndarray): Rows of `arrays` exposed by the store, in order.
+        path (Path | None): Cache file the arrays are mapped from, used to re-map them after unpickling.
+
+    Methods:
+        from_results: Build a store from `verify_image_label` results.
+        concat: Concatenate several stores.
+        filter: Keep only some classes and/or merge all classes into one.
+        drop_segments: Remove all segments.
+
+    Examples:
+        >>> store = LabelStore.from_results(im_files, results, stats)
+        >>> store[0]  # dict with 'im_file', 'shape', 'cls', 'bboxes', 'segments', 'keypoints', ...
+        >>> store[store.shapes[:, 0] > 480]  # new store viewing only some images
+    """
+
+    OFFSETS = {"file_offsets": "files", "label_offsets": "cls", "segment_offsets": "segments"}  # offsets to data
+
+    def __init__(self, arrays, index=None, path=None):
+        """Initialize the store from its column arrays, the rows to expose and the cache file they are mapped from."""
+        self.arrays = arrays
+        self.index = np.arange(len(arrays["shapes"])) if index is None else np.asarray(index, dtype=np.int64)
+        self.path = path
+
+    @classmethod
+    def from_results(cls, im_files, results, stats, nkpt=0):
+        """
+        Build a store from `verify_image_label` results.
+
+        Args:
+            im_files (List[str]): Image files the results belong to, including corrupt ones.
+            results (Iterable[tuple]): `verify_image_label` results in the same order as im_files.
+            stats (np.ndarray): Image and label file fingerprints of shape (n, 4).
+            nkpt (int): Number of keypoints per instance, 0 if the labels have no keypoints.
+
+        Returns:
+            (LabelStore): Store exposing all results, including corrupt images.
+        """
+        shapes, status, n, lbs, kpts, points, segments = [], [], [], [], [], [], []
+        for _, lb, shape, segs, keypoints, nm, nf, ne, nc, _ in results:
+            lb = np.zeros((0, 5), dtype=np.float32) if lb is None else lb
+            shapes.append(shape or (0, 0))
+            status.append((nm, nf, ne, nc))
+            n.append(len(lb))
+            lbs.append(lb)
+            if nkpt:
+                kpts.append(np.zeros((0, nkpt, 3), dtype=np.float32) if keypoints is None else keypoints)
+            points.extend([len(s) for s in segs] if segs else [0] * len(lb))
+            segments.extend(segs or [])
+        lb = np.concatenate(lbs, 0) if lbs else np.zeros((0, 5), dtype=np.float32)
+        files = [f.encode() for f in im_files]
+        return cls(
+            {
+                "files": np.frombuffer(b"".join(files), dtype=np.uint8),
+                "file_offsets": _offsets([len(f) for f in files]),
+                "shapes": np.array(shapes, dtype=np.int32).reshape(-1, 2),
+                "status": np.array(status, dtype=np.int8).reshape(-1, 4),
+                "stats": np.asarray(stats, dtype=np.int64).reshape(-1, 4),
+                "label_offsets": _offsets(n),
+                "cls": np.ascontiguousarray(lb[:, 0:1]),  # n, 1
+                "bboxes": np.ascontiguousarray(lb[:, 1:]),  # n, 4
+                "keypoints": np.concatenate(kpts, 0) if kpts else np.zeros((len(lb), nkpt, 3), dtype=np.float32),
+                "segment_offsets": _offsets(points),
+                "segments": np.concatenate(segments, 0) if segments else np.zeros((0, 2), dtype=np.float32),
+            }
+        )
+
+    @classmethod
+    def concat(cls, stores):
+        """Return a new in-memory store with the images of all given stores, in order."""
+        parts = [s._gather(s.index) for s in stores]
+        arrays = {}
+        for k in parts[0]:
+            if k in cls.OFFSETS:  # shift offsets by the length of the data they index in preceding parts
+                shift = np.cumsum([0] + [len(p[cls.OFFSETS[k]]) for p in parts])
+                arrays[k] = np.concatenate([p[k][:-1] + s for p, s in zip(parts, shift)] + [shift[-1:]])
+            else:
+                arrays[k] = np.concatenate([p[k] for p in parts], 0)
+        return cls(arrays)
+
+    def _gather(self, rows, keep=None):
+        """Return column arrays holding only the given rows and, if a boolean instance mask is given, instances."""
+        a = self.arrays
+        lo, fo, so = a["label_offsets"], a["file_offsets"], a["segment_offsets"]
+        n = lo[rows + 1] - lo[rows]
+        inst = _ranges(lo[rows], n)
+        if keep is not None:
+            keep = keep[inst]
+            n = np.bincount(np.repeat(np.arange(len(rows)), n), weights=keep, minlength=len(rows)).astype(np.int64)
+            inst = inst[keep]
+        points = so[inst + 1] - so[inst]
+        return {
+            "files": a["files"][_ranges(fo[rows], fo[rows + 1] - fo[rows])],
+            "file_offsets": _offsets(fo[rows + 1] - fo[rows]),
+            "shapes": a["shapes"][rows],
+            "status": a["status"][rows],
+            "stats": a["stats"][rows],
+            "label_offsets": _offsets(n),
+            "cls": a["cls"][inst],
+            "bboxes": a["bboxes"][inst],
+            "keypoints": a["keypoints"][inst],
+            "segment_offsets": _offsets(points),
+            "segments": a["segments"][_ranges(so[inst], points)],
+        }
+
+    def filter(self, include_class=None, single_cls=False):
+        """
+        Return a new in-memory store keeping only instances of the given classes.
+
+        Args:
+            include_class (List[int], optional): Classes to keep. If None, all classes are kept.
+            single_cls (bool): Whether to set all classes to 0.
+
+        Returns:
+            (LabelStore): Filtered store.
+        """
+        keep = None
+        if include_class is not None:
+            keep = (self.arrays["cls"] == np.array(include_class).reshape(1, -1)).any(1)
+        arrays = self._gather(self.index, keep)
+        if single_cls:
+            arrays["cls"][:] = 0
+        return LabelStore(arrays)
+
+    def drop_segments(self):
+        """Return a new store viewing the same images without any segments."""
+        arrays = {
+            **self.arrays,
+            "segment_offsets": np.zeros(len(self.arrays["cls"]) + 1, dtype=np.int64),
+            "segments": np.zeros((0, 2), dtype=np.float32),
+        }
+        return LabelStore(arrays, self.index)
+
+    @property
+    def im_files(self):
+        """Image files of all images exposed by the store."""
+        files, offsets = self.arrays["files"].tobytes(), self.arrays["file_offsets"]
+        return [files[offsets[i] : offsets[i + 1]].decode() for i in self.index]
+
+    @property
+    def shapes(self):
+        """Image shapes (h, w) of all images exposed by the store."""
+        return self.arrays["shapes"][self.index]
+
+    def lengths(self):
+        """Return the total number of instances and the number of instances in images that have segments."""
+        lo, so = self.arrays["label_offsets"], self.arrays["segment_offsets"]
+        n = lo[self.index + 1] - lo[self.index]
+        points = so[lo[self.index + 1]] - so[lo[self.index]]
+        return int(n.sum()), int(n[points > 0].sum())
+
+    def __len__(self):
+        """Return the number of images exposed by the store."""
+        return len(self.index)
+
+    def __iter__(self):
+        """Iterate over the label dictionaries of all images exposed by the store."""
+        return (self._label(i) for i in self.index)
+
+    def __getitem__(self, i):
+        """Return the label dictionary of image i, or a new store viewing the images selected by a slice or array."""
+        if isinstance(i, (int, np.integer)):
+            return self._label(self.index[i])
+        return LabelStore(self.arrays, self.index[i], self.path)
+
+    def _label(self, r):
+        """Return a label dictionary of views into the column arrays for row r."""
+        a = self.arrays
+        fo, (lo, hi) = a["file_offsets"][r : r + 2], a["label_offsets"][r : r + 2]
+        so = a["segment_offsets"][lo : hi + 1]
+        return {
+            "im_file": a["files"][fo[0] : fo[1]].tobytes().decode(),
+            "shape": tuple(int(x) for x in a["shapes"][r]),
+            "cls": a["cls"][lo:hi],  # n, 1
+            "bboxes": a["bboxes"][lo:hi],  # n, 4
+            "segments": [a["segments"][so[j] : so[j + 1]] for j in range(hi - lo)] if so[-1] > so[0] else [],
+            "keypoints": a["keypoints"][lo:hi] if a["keypoints"].shape[1] else None,
+            "normalized": True,
+            "bbox_format": "xywh",
+        }
+
+    def __getstate__(self):
+        """Pickle stores mapped from a cache file by path so that worker processes re-map it instead of copying it."""
+        state = self.__dict__.copy()
+        if self.path is not None:
+            state["arrays"] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled store, re-mapping its arrays from the cache file if needed."""
+        self.__dict__.update(state)
+        if self.arrays is None:
+            self.arrays = load_dataset_cache_file(self.path)["arrays"]
@@ -1626,6 +1626,7 @@ class NMSModel(torch.nn.Module):
             nms_fn = (
                 partial(
                     nms_rotated,
+                    sparse=False,
                     use_triu=not (
                         self.is_tf
                         or (self.args.opset or 14) < 14
@@ -32,10 +32,15 @@ Usage - formats:
                               yolo11n_rknn_model         # Rockchip RKNN
 """
 
+import math
 import platform
+import queue
 import re
 import threading
+import time
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
+from types import SimpleNamespace
 
 import cv2
 import numpy as np
@@ -44,10 +49,13 @@ import torch
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data import load_inference_source
 from ultralytics.data.augment import LetterBox, classify_transforms
+from ultralytics.data.split_dota import get_windows
+from ultralytics.engine.results import Results
 from ultralytics.nn.autobackend import AutoBackend
-from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, WINDOWS, callbacks, colorstr, ops
+from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, NUM_THREADS, WINDOWS, callbacks, colorstr, ops
 from ultralytics.utils.checks import check_imgsz, check_imshow
 from ultralytics.utils.files import increment_path
+from ultralytics.utils.metrics import box_iou
 from ultralytics.utils.torch_utils import select_device, smart_inference_mode
 
 STREAM_WARNING = """
@@ -62,6 +70,16 @@ Example:
         probs = r.probs  # Class probabilities for classification outputs
 """
 
+PIPELINE_DEPTH = 2  # max batches queued between stages in pipelined prediction
+
+
+def _batch_attribute(name):
+    """Return a property for the per-batch predictor attribute 'name', stored in the predictor's `_batch_state`."""
+    return property(
+        lambda self: getattr(self._batch_state, name, None),
+        lambda self, value: setattr(self._batch_state, name, value),
+    )
+
 
 class BasePredictor:
     """
@@ -88,15 +106,29 @@ class BasePredictor:
         transforms (callable): Image transforms for classification.
         callbacks (dict): Callback functions for different events.
         txt_path (Path): Path to save text results.
+        slices (tuple | None): Tiles and their (image index, x offset, y offset) for the current batch in sliced mode.
+        ratio_pad (List[tuple] | None): Per-image letterbox (ratio, (left_pad, top_pad)) of the current batch, if it was
+            letterboxed by `pre_transform_batch()`.
+        frame (int | None): Dataset frame counter of the current batch.
+        stream_ids (List[int] | None): Stream indices of the frames in the current batch, for stream sources.
+        _batch_state (SimpleNamespace | threading.local): Storage of `batch`, `slices`, `ratio_pad`, `frame` and
+            `stream_ids`, private to each thread while batches are pipelined.
         _lock (threading.Lock): Lock for thread-safe inference.
 
     Methods:
         preprocess: Prepare input image before inference.
+        get_letterbox: Get the letterbox transform for a batch of images.
+        pre_transform_batch: Letterbox images directly into a reusable batch buffer.
+        normalize: Move a uint8 batch to the device as a normalized RGB tensor.
+        pre_slice: Split input images into overlapping tiles for sliced inference.
         inference: Run inference on a given image.
         postprocess: Process raw predictions into structured results.
+        merge_slices: Merge sliced inference tile results back into full-frame results.
         predict_cli: Run prediction for command line interface.
         setup_source: Set up input source and inference mode.
         stream_inference: Stream inference on input source.
+        sequential: Preprocess and run inference on batches in turn on the calling thread.
+        pipeline: Decode, preprocess and run inference on batches in background threads.
         setup_model: Initialize and configure the model.
         write_results: Write inference results to files.
         save_predicted_images: Save prediction visualizations.
@@ -105,6 +137,12 @@ class BasePredictor:
         add_callback: Register a new callback function.
     """
 
+    batch = _batch_attribute("batch")
+    slices = _batch_attribute("slices")
+    ratio_pad = _batch_attribute("ratio_pad")
+    frame = _batch_attribute("frame")
+    stream_ids = _batch_attribute("stream_ids")
+
     def __init__(self, cfg=DEFAULT_CFG, overrides=None, _callbacks=None):
         """
         Initialize the BasePredictor class.
@@ -133,11 +171,19 @@ class BasePredictor:
         self.source_type = None
         self.seen = 0
         self.windows = []
+        self._batch_state = SimpleNamespace()  # per-batch attributes, see pipeline()
         self.batch = None
         self.results = None
         self.transforms = None
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
         self.txt_path = None
+        self.slices = None
+        self.ratio_pad = None
+        self.frame = None
+        self.stream_ids = None
+        self._pool = None  # thread pool for letterboxing batches, created on first use
+        self._buffers = [[None, None], [None, None]]  # reusable (uint8 batch buffer, pending copy event) pairs
+        self._buffer_index = 0
         self._lock = threading.Lock()  # for automatic thread-safe inference
         callbacks.add_integration_callbacks(self)
 
@@ -149,7 +195,12 @@ class BasePredictor:
             im (torch.Tensor | List(np.ndarray)): Images of shape (N, 3, h, w) for tensor, [(h, w, 3) x N] for list.
         """
         not_tensor = not isinstance(im, torch.Tensor)
+        self.slices = self.ratio_pad = None
         if not_tensor:
+            if self.args.slice and self.args.task in {"detect", "obb", "pose"}:
+                im = self.pre_slice(im)
+            if type(self).pre_transform is BasePredictor.pre_transform:  # letterbox into batch buffer
+                return self.normalize(self.pre_transform_batch(im))
             im = np.stack(self.pre_transform(im))
             im = im[..., ::-1].transpose((0, 3, 1, 2))  # BGR to RGB, BHWC to BCHW, (n, 3, h, w)
             im = np.ascontiguousarray(im)  # contiguous
@@ -161,6 +212,34 @@ class BasePredictor:
             im /= 255  # 0 - 255 to 0.0 - 1.0
         return im
 
+    def pre_slice(self, im):
+        """
+        Split input images into overlapping tiles for sliced inference.
+
+        Tiles are laid out with `get_windows()` using `slice_size` and `slice_overlap`, and all tiles of all images are
+        returned together so they run through the model in a single forward pass. If `slice_full=True`, each image
+        larger than one tile is also appended whole so that large objects cut by tile borders are still detected.
+
+        Args:
+            im (List[np.ndarray]): Images of shape [(h, w, 3) x N].
+
+        Returns:
+            (List[np.ndarray]): Tiles (and full images) as views into the input images.
+        """
+        size = self.args.slice_size
+        gap = int(size * self.args.slice_overlap)
+        tiles, offsets = [], []
+        for i, x in enumerate(im):
+            h, w = x.shape[:2]
+            for x0, y0, x1, y1 in get_windows((h, w), crop_sizes=(size,), gaps=(gap,)).tolist():
+                tiles.append(x[y0:y1, x0:x1])
+                offsets.append((i, x0, y0))
+            if self.args.slice_full and max(h, w) > size:
+                tiles.append(x)
+                offsets.append((i, 0, 0))
+        self.slices = tiles, np.array(offsets, dtype=np.int64)
+        return tiles
+
     def inference(self, im, *args, **kwargs):
         """Run inference on a given image using the specified model and arguments."""
         visualize = (
@@ -170,28 +249,161 @@ class BasePredictor:
         )
         return self.model(im, augment=self.args.augment, visualize=visualize, embed=self.args.embed, *args, **kwargs)
 
-    def pre_transform(self, im):
+    def get_letterbox(self, im):
         """
-        Pre-transform input image before inference.
+        Get the letterbox transform for a batch of images.
 
         Args:
-            im (List[np.ndarray]): Images of shape (N, 3, h, w) for tensor, [(h, w, 3) x N] for list.
+            im (List[np.ndarray]): Images of shape [(h, w, 3) x N].
 
         Returns:
-            (List[np.ndarray]): A list of transformed images.
+            (LetterBox): Letterbox to the inference size, using minimum rectangles if all images share a shape and the
+                model accepts dynamic input shapes.
         """
         same_shapes = len({x.shape for x in im}) == 1
-        letterbox = LetterBox(
+        return LetterBox(
             self.imgsz,
             auto=same_shapes and (self.model.pt or (getattr(self.model, "dynamic", False) and not self.model.imx)),
             stride=self.model.stride,
         )
+
+    def pre_transform(self, im):
+        """
+        Pre-transform input image before inference.
+
+        Args:
+            im (List[np.ndarray]): Images of shape (N, 3, h, w) for tensor, [(h, w, 3) x N] for list.
+
+        Returns:
+            (List[np.ndarray]): A list of transformed images.
+        """
+        letterbox = self.get_letterbox(im)
         return [letterbox(image=x) for x in im]
 
+    def pre_transform_batch(self, im):
+        """
+        Letterbox images directly into a reusable uint8 batch buffer, pinned in page-locked memory for CUDA devices.
+
+        Buffers are allocated once and reused in a ring of two, so the next batch can be letterboxed while the previous
+        one is still being copied to the device. A buffer is only rewritten after its pending copy has completed. The
+        letterbox geometry is computed once per image shape and images are resized in a thread pool if several threads
+        are available. The per-image ratio and padding are kept in `ratio_pad` for `postprocess()`.
+
+        Args:
+            im (List[np.ndarray]): BGR images of shape [(h, w, 3) x N].
+
+        Returns:
+            (torch.Tensor): Letterboxed BGR images of shape (N, h, w, 3) in a view of the batch buffer.
+        """
+        letterbox = self.get_letterbox(im)
+        _, (w, h), (top, bottom, left, right) = letterbox.get_params(im[0].shape[:2])
+        shape = (len(im), top + h + bottom, left + w + right, im[0].shape[2])
+        self._buffer_index = (self._buffer_index + 1) % len(self._buffers)
+        buffer, event = self._buffers[self._buffer_index]
+        if event is not None:
+            event.synchronize()  # wait for the previous copy from this buffer
+        if buffer is None or buffer.numel() < math.prod(shape):
+            buffer = torch.empty(math.prod(shape), dtype=torch.uint8, pin_memory=self.device.type == "cuda")
+        self._buffers[self._buffer_index] = [buffer, None]
+        buffer = buffer[: math.prod(shape)].view(shape)
+        if self._pool is None and NUM_THREADS > 1 and len(im) > 1:
+            self._pool = ThreadPool(NUM_THREADS)
+        self.ratio_pad = letterbox.batch(im, buffer.numpy(), pool=self._pool if len(im) > 1 else None)
+        return buffer
+
+    def normalize(self, im):
+        """
+        Move a uint8 BGR (N, h, w, 3) batch to the device and convert it to a normalized RGB (N, 3, h, w) batch.
+
+        The copy is non-blocking from pinned memory. The channel swap, layout change and dtype cast are fused into a
+        single copy into a preallocated output tensor, which is then scaled to 0.0 - 1.0 in place.
+
+        Args:
+            im (torch.Tensor): Letterboxed uint8 BGR images of shape (N, h, w, 3).
+
+        Returns:
+            (torch.Tensor): Normalized fp16/32 RGB images of shape (N, 3, h, w) on the device.
+        """
+        im = im.to(self.device, non_blocking=True)
+        if self.device.type == "cuda":
+            event = torch.cuda.Event()
+            event.record()
+            self._buffers[self._buffer_index][1] = event
+        n, h, w, ch = im.shape
+        out = torch.empty((n, ch, h, w), dtype=torch.float16 if self.model.fp16 else torch.float32, device=self.device)
+        for c in range(ch):
+            out[:, c].copy_(im[..., ch - 1 - c])  # BGR to RGB, BHWC to BCHW, uint8 to fp16/32
+        return out.div_(255)  # 0 - 255 to 0.0 - 1.0
+
     def postprocess(self, preds, img, orig_imgs):
         """Post-process predictions for an image and return them."""
         return preds
 
+    def merge_slices(self, preds, img, orig_imgs):
+        """
+        Merge sliced inference tile results back into full-frame results.
+
+        Tile predictions are post-processed as regular images, shifted from tile to frame coordinates and merged per
+        frame with class-aware NMS (`slice_merge='nms'`) or weighted box fusion (`slice_merge='wbf'`, axis-aligned
+        boxes only) at the `iou` threshold.
+
+        Args:
+            preds (torch.Tensor): Raw model predictions for all tiles in the batch.
+            img (torch.Tensor): Preprocessed tiles of shape (M, 3, h, w).
+            orig_imgs (List[np.ndarray]): Original full-frame images.
+
+        Returns:
+            (List[ultralytics.engine.results.Results]): One Results object per original image.
+        """
+        import torchvision  # scope for faster 'import ultralytics'
+
+        tiles, offsets = self.slices
+        paths, _, s = self.batch
+        self.batch = [paths[i] for i in offsets[:, 0]], tiles, s  # tile-level batch for postprocess
+        try:
+            tile_results = self.postprocess(preds, img, tiles)
+        finally:
+            self.batch = paths, orig_imgs, s
+
+        results = []
+        for i, (orig_img, path) in enumerate(zip(orig_imgs, paths)):
+            idx = np.nonzero(offsets[:, 0] == i)[0]
+            rotated = tile_results[idx[0]].obb is not None
+            kpts = tile_results[idx[0]].keypoints is not None
+            boxes, keypoints = [], []
+            for j in idx:
+                r, (x0, y0) = tile_results[j], offsets[j, 1:].tolist()
+                shift = torch.tensor([x0, y0] * (1 if rotated else 2), device=self.device)
+                b = (r.obb if rotated else r.boxes).data.clone()
+                b[:, : len(shift)] += shift
+                boxes.append(b)
+                if kpts:
+                    k = r.keypoints.data.view(-1, *self.model.kpt_shape).clone()
+                    k[..., :2] += shift[:2]
+                    keypoints.append(k)
+            boxes = torch.cat(boxes)
+            scores, c = boxes[:, -2], boxes[:, -1:] * (0 if self.args.agnostic_nms else max(orig_img.shape[:2]))
+            if rotated:
+                keep = ops.nms_rotated(torch.cat((boxes[:, :2] + c, boxes[:, 2:5]), 1), scores, self.args.iou)
+            else:
+                keep = torchvision.ops.nms(boxes[:, :4] + c, scores, self.args.iou)
+                if self.args.slice_merge == "wbf" and len(keep):  # fuse boxes weighted by confidence
+                    weights = (box_iou(boxes[keep, :4] + c[keep], boxes[:, :4] + c) > self.args.iou) * scores[None]
+                    fused = torch.mm(weights, boxes[:, :4]) / weights.sum(1, keepdim=True)
+                    boxes[keep, :4] = ops.clip_boxes(fused, orig_img.shape)
+            keep = keep[: self.args.max_det]
+            results.append(
+                Results(
+                    orig_img,
+                    path=path,
+                    names=self.model.names,
+                    boxes=None if rotated else boxes[keep],
+                    obb=boxes[keep] if rotated else None,
+                    keypoints=torch.cat(keypoints)[keep] if kpts else None,
+                )
+            )
+        return results
+
     def __call__(self, source=None, model=None, stream=False, *args, **kwargs):
         """
         Perform inference on an image or stream.
@@ -257,6 +469,9 @@ class BasePredictor:
             batch=self.args.batch,
             vid_stride=self.args.vid_stride,
             buffer=self.args.stream_buffer,
+            stream_policy=self.args.stream_policy,
+            stream_latency=self.args.stream_latency,
+            stream_priority=self.args.stream_priority,
         )
         self.source_type = self.dataset.source_type
         if not getattr(self, "stream", True) and (
@@ -310,24 +525,27 @@ class BasePredictor:
                 ops.Profile(device=self.device),
             )
             self.run_callbacks("on_predict_start")
-            for self.batch in self.dataset:
-                self.run_callbacks("on_predict_batch_start")
+            pipeline = self.args.pipeline and not self.args.visualize
+            if self.args.pipeline and self.args.visualize:
+                LOGGER.warning(
+                    "WARNING ⚠️ 'pipeline=True' is not supported with 'visualize=True', running sequentially."
+                )
+            batches = (
+                self.pipeline(profilers, *args, **kwargs) if pipeline else self.sequential(profilers, *args, **kwargs)
+            )
+            decode = 0.0  # total decode milliseconds
+            for self.batch, im, preds, self.slices, dt, stats in batches:
                 paths, im0s, s = self.batch
-
-                # Preprocess
-                with profilers[0]:
-                    im = self.preprocess(im0s)
-
-                # Inference
-                with profilers[1]:
-                    preds = self.inference(im, *args, **kwargs)
-                    if self.args.embed:
-                        yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
-                        continue
+                decode += stats.get("decode", 0.0) * len(im0s)
+                if self.args.embed:
+                    yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
+                    continue
 
                 # Postprocess
                 with profilers[2]:
-                    self.results = self.postprocess(preds, im, im0s)
+                    self.results = (
+                        self.merge_slices(preds, im, im0s) if self.slices else self.postprocess(preds, im, im0s)
+                    )
                 self.run_callbacks("on_predict_postprocess_end")
 
                 # Visualize, save, write results
@@ -335,9 +553,10 @@ class BasePredictor:
                 for i in range(n):
                     self.seen += 1
                     self.results[i].speed = {
-                        "preprocess": profilers[0].dt * 1e3 / n,
-                        "inference": profilers[1].dt * 1e3 / n,
+                        "preprocess": dt[0] * 1e3 / n,
+                        "inference": dt[1] * 1e3 / n,
                         "postprocess": profilers[2].dt * 1e3 / n,
+                        **stats,
                     }
                     if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
                         s[i] += self.write_results(i, Path(paths[i]), im, s)
@@ -357,8 +576,9 @@ class BasePredictor:
         # Print final results
         if self.args.verbose and self.seen:
             t = tuple(x.t / self.seen * 1e3 for x in profilers)  # speeds per image
+            d = f"{decode / self.seen:.1f}ms decode, " if hasattr(self.dataset, "decode_dt") else ""
             LOGGER.info(
-                f"Speed: %.1fms preprocess, %.1fms inference, %.1fms postprocess per image at shape "
+                f"Speed: {d}%.1fms preprocess, %.1fms inference, %.1fms postprocess per image at shape "
                 f"{(min(self.args.batch, self.seen), 3, *im.shape[2:])}" % t
             )
         if self.args.save or self.args.save_txt or self.args.save_crop:
@@ -367,6 +587,163 @@ class BasePredictor:
             LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}{s}")
         self.run_callbacks("on_predict_end")
 
+    def sequential(self, profilers, *args, **kwargs):
+        """
+        Preprocess and run inference on each dataset batch in turn on the calling thread.
+
+        Args:
+            profilers (Tuple[ops.Profile]): Preprocess, inference and postprocess profilers.
+            *args (Any): Additional arguments for the inference method.
+            **kwargs (Any): Additional keyword arguments for the inference method.
+
+        Yields:
+            (tuple): Dataset batch, preprocessed images, raw predictions, slices, preprocess and inference times in
+                seconds, and a dict holding the 'decode' milliseconds per image if the dataset records them.
+        """
+        for self.batch in self.dataset:
+            self.frame = getattr(self.dataset, "count", None)
+            self.stream_ids = getattr(self.dataset, "stream_ids", None)
+            stats = self._decode_stats(self.batch)
+            self.run_callbacks("on_predict_batch_start")
+            with profilers[0]:
+                im = self.preprocess(self.batch[1])
+            with profilers[1]:
+                preds = self.inference(im, *args, **kwargs)
+            yield self.batch, im, preds, self.slices, (profilers[0].dt, profilers[1].dt), stats
+
+    def pipeline(self, profilers, *args, **kwargs):
+        """
+        Decode, preprocess and run inference on dataset batches in background threads, overlapping all stages.
+
+        Each stage runs in its own thread and hands batches to the next stage through a bounded queue of
+        `PIPELINE_DEPTH` batches, so the device runs inference on one batch while the next is decoded and preprocessed
+        and the previous one is postprocessed and written by the caller. Batches are yielded in dataset order.
+
+        As in `sequential()`, 'on_predict_batch_start' callbacks run before each batch is preprocessed and inferred,
+        on the preprocess thread with the batch's `batch`, `frame` and `stream_ids` set. The per-batch attributes
+        `batch`, `slices`, `ratio_pad`, `frame` and `stream_ids` are thread-local meanwhile, so preprocessing the next
+        batches never overwrites the state the caller postprocesses a batch with, which is restored before it is
+        yielded.
+
+        Args:
+            profilers (Tuple[ops.Profile]): Preprocess, inference and postprocess profilers.
+            *args (Any): Additional arguments for the inference method.
+            **kwargs (Any): Additional keyword arguments for the inference method.
+
+        Yields:
+            (tuple): Dataset batch, preprocessed images, raw predictions, slices, preprocess and inference times in
+                seconds, and a dict of pipeline stats. The stats hold '<stage>_queue', the number of batches queued
+                in front of each stage when the batch reached it, and '<stage>_util', the fraction of time each stage
+                has been busy since the pipeline started, plus 'decode' milliseconds per image if the dataset
+                records them.
+        """
+        stages = "decode", "preprocess", "inference", "postprocess"
+        queues = [queue.Queue(maxsize=PIPELINE_DEPTH) for _ in stages[1:]]
+        busy = dict.fromkeys(stages, 0.0)  # busy seconds per stage
+        stop = threading.Event()
+        profilers[0].cuda = False  # device syncs in the preprocess thread would wait on inference
+        main_state, self._batch_state = self._batch_state, threading.local()  # per-batch attributes of each thread
+        t0 = time.perf_counter()
+
+        def decode(item):
+            """Record the dataset frame counter, stream indices and decode time of a decoded batch."""
+            frame, stats = getattr(self.dataset, "count", None), self._decode_stats(item)
+            ids = getattr(self.dataset, "stream_ids", None)
+            return {"batch": item, "frame": frame, "stream_ids": ids, "dt": [0.0, 0.0], "stats": stats}
+
+        def preprocess(item):
+            """Run the batch start callbacks and preprocess a batch, recording its slices and preprocess time."""
+            self.batch, self.frame, self.stream_ids = item["batch"], item["frame"], item["stream_ids"]
+            self.run_callbacks("on_predict_batch_start")
+            with profilers[0]:
+                item["im"] = self.preprocess(item["batch"][1])
+            item["slices"], item["ratio_pad"], item["dt"][0] = self.slices, self.ratio_pad, profilers[0].dt
+            return item
+
+        def inference(item):
+            """Run inference on a preprocessed batch, recording its inference time."""
+            with profilers[1]:
+                item["preds"] = self.inference(item["im"], *args, **kwargs)
+            item["dt"][1] = profilers[1].dt
+            return item
+
+        threads = [
+            threading.Thread(target=self._pipeline_stage, args=(*x, busy, stop), daemon=True)
+            for x in (
+                (stages[0], decode, None, queues[0]),
+                (stages[1], preprocess, queues[0], queues[1]),
+                (stages[2], inference, queues[1], queues[2]),
+            )
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for item in self._pipeline_items(stages[3], queues[2], stop):
+                elapsed = time.perf_counter() - t0
+                item["stats"].update({f"{k}_util": round(v / elapsed, 3) for k, v in busy.items()})
+                self.batch, self.slices, self.frame = item["batch"], item["slices"], item["frame"]
+                self.ratio_pad, self.stream_ids = item["ratio_pad"], item["stream_ids"]
+                t = time.perf_counter()
+                yield self.batch, item["im"], item["preds"], self.slices, item["dt"], item["stats"]
+                busy[stages[3]] += time.perf_counter() - t  # postprocess, write and consume
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            for k in "batch", "slices", "ratio_pad", "frame", "stream_ids":  # keep the last batch state
+                setattr(main_state, k, getattr(self, k))
+            self._batch_state = main_state
+
+    def _decode_stats(self, batch):
+        """Return the decode milliseconds per image of a just-loaded dataset batch, if the dataset records them."""
+        dt = getattr(self.dataset, "decode_dt", None)
+        return {} if dt is None else {"decode": dt * 1e3 / max(len(batch[1]), 1)}
+
+    @smart_inference_mode()
+    def _pipeline_stage(self, name, fn, q_in, q_out, busy, stop):
+        """Apply `fn` to batches from `q_in` (the dataset if None) and put results or the first error on `q_out`."""
+        try:
+            source = iter(self.dataset) if q_in is None else self._pipeline_items(name, q_in, stop)
+            while not stop.is_set():
+                t = time.perf_counter()
+                item = next(source, None)
+                if item is None:
+                    break
+                if q_in is None:
+                    busy[name] += time.perf_counter() - t  # dataset decode time
+                t = time.perf_counter()
+                item = fn(item)
+                busy[name] += time.perf_counter() - t
+                self._pipeline_put(q_out, item, stop)
+        except Exception as e:
+            self._pipeline_put(q_out, e, stop)
+        else:
+            self._pipeline_put(q_out, None, stop)  # end of stream
+
+    @staticmethod
+    def _pipeline_items(name, q, stop):
+        """Yield items from a pipeline queue until the end of stream, recording queue depths and re-raising errors."""
+        while not stop.is_set():
+            try:
+                item = q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            item["stats"][f"{name}_queue"] = q.qsize()
+            yield item
+
+    @staticmethod
+    def _pipeline_put(q, item, stop):
+        """Put an item on a pipeline queue, blocking while it is full unless the pipeline is stopped."""
+        while not stop.is_set():
+            try:
+                return q.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+
     def setup_model(self, model, verbose=True):
         """
         Initialize YOLO model with given parameters and set it to evaluation mode.
@@ -408,7 +785,7 @@ class BasePredictor:
             im = im[None]  # expand for batch dim
         if self.source_type.stream or self.source_type.from_img or self.source_type.tensor:  # batch_size >= 1
             string += f"{i}: "
-            frame = self.dataset.count
+            frame = self.frame
         else:
             match = re.search(r"frame (\d+)/", s[i])
             frame = int(match[1]) if match else None  # 0 if frame undetermined
@@ -63,6 +63,7 @@ class BaseTrainer:
     Attributes:
         args (SimpleNamespace): Configuration for the trainer.
         validator (BaseValidator): Validator instance.
+        shard_val (bool): Whether all DDP ranks validate a shard of the validation set, see `shard_val` argument.
         model (nn.Module): Model instance.
         callbacks (defaultdict): Dictionary of callbacks.
         save_dir (Path): Directory to save results.
@@ -106,6 +107,7 @@ class BaseTrainer:
         self.check_resume(overrides)
         self.device = select_device(self.args.device, self.args.batch)
         self.validator = None
+        self.shard_val = False
         self.metrics = None
         self.plots = {}
         init_seeds(self.args.seed + 1 + RANK, deterministic=self.args.deterministic)
@@ -287,17 +289,21 @@ class BaseTrainer:
 
         # Dataloaders
         batch_size = self.batch_size // max(world_size, 1)
+        self.shard_val = self.args.shard_val and RANK != -1  # DDP validation sharded across ranks
         self.train_loader = self.get_dataloader(self.trainset, batch_size=batch_size, rank=LOCAL_RANK, mode="train")
-        if RANK in {-1, 0}:
+        if RANK in {-1, 0} or self.shard_val:  # with 'shard_val' every rank validates its shard of the val set
             # Note: When training DOTA dataset, double batch size could get OOM on images with >2000 objects.
             self.test_loader = self.get_dataloader(
-                self.testset, batch_size=batch_size if self.args.task == "obb" else batch_size * 2, rank=-1, mode="val"
+                self.testset,
+                batch_size=batch_size if self.args.task == "obb" else batch_size * 2,
+                rank=LOCAL_RANK if self.shard_val else -1,
+                mode="val",
             )
             self.validator = self.get_validator()
             metric_keys = self.validator.metrics.keys + self.label_loss_items(prefix="val")
             self.metrics = dict(zip(metric_keys, [0] * len(metric_keys)))
             self.ema = ModelEMA(self.model)
-            if self.args.plots:
+            if self.args.plots and RANK in {-1, 0}:
                 self.plot_training_labels()
 
         # Optimizer
@@ -427,13 +433,19 @@ class BaseTrainer:
 
             self.lr = {f"lr/pg{ir}": x["lr"] for ir, x in enumerate(self.optimizer.param_groups)}  # for loggers
             self.run_callbacks("on_train_epoch_end")
-            if RANK in {-1, 0}:
-                final_epoch = epoch + 1 >= self.epochs
+            final_epoch = epoch + 1 >= self.epochs
+            if RANK in {-1, 0} or self.shard_val:
                 self.ema.update_attr(self.model, include=["yaml", "nc", "args", "names", "stride", "class_weights"])
 
                 # Validation
-                if self.args.val or final_epoch or self.stopper.possible_stop or self.stop:
+                validate = self.args.val or final_epoch or self.stopper.possible_stop or self.stop
+                if self.shard_val:  # every rank validates its shard, only rank 0 tracks fitness to decide when
+                    broadcast_list = [validate if RANK == 0 else None]
+                    dist.broadcast_object_list(broadcast_list, 0)
+                    validate = broadcast_list[0]
+                if validate:
                     self.metrics, self.fitness = self.validate()
+            if RANK in {-1, 0}:
                 self.save_metrics(metrics={**self.label_loss_items(self.tloss), **self.metrics, **self.lr})
                 self.stop |= self.stopper(epoch + 1, self.fitness) or final_epoch
                 if self.args.time:
@@ -699,6 +711,11 @@ class BaseTrainer:
                     strip_optimizer(f, updates={k: ckpt[k]} if k in ckpt else None)
                     LOGGER.info(f"\nValidating {f}...")
                     self.validator.args.plots = self.args.plots
+                    if self.shard_val:  # other ranks have finished, validate the full set on rank 0
+                        self.validator.args.shard_val = False
+                        self.validator.dataloader = self.get_dataloader(
+                            self.testset, batch_size=self.test_loader.batch_size, rank=-1, mode="val"
+                        )
                     self.metrics = self.validator(model=f)
                     self.metrics.pop("fitness", None)
                     self.run_callbacks("on_fit_epoch_end")
@@ -29,6 +29,7 @@ from pathlib import Path
 
 import numpy as np
 import torch
+from torch import distributed as dist
 
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data.utils import check_cls_dataset, check_det_dataset
@@ -62,6 +63,7 @@ class BaseValidator:
         nc (int): Number of classes.
         iouv (torch.Tensor): IoU thresholds from 0.50 to 0.95 in spaces of 0.05.
         jdict (List): List to store JSON validation results.
+        sharded (bool): Whether each DDP rank validates a shard of the dataset, see `shard_val`.
         speed (Dict): Dictionary with keys 'preprocess', 'inference', 'loss', 'postprocess' and their respective
             batch processing times in milliseconds.
         save_dir (Path): Directory to save results.
@@ -80,7 +82,9 @@ class BaseValidator:
         init_metrics: Initialize performance metrics for the YOLO model.
         update_metrics: Update metrics based on predictions and batch.
         finalize_metrics: Finalize and return all metrics.
+        gather_stats: Gather the statistics of all DDP ranks on rank 0.
         get_stats: Return statistics about the model's performance.
+        get_results: Compute, log and return the final metrics.
         check_stats: Check statistics.
         print_results: Print the results of the model's predictions.
         get_desc: Get description of the YOLO model.
@@ -117,6 +121,7 @@ class BaseValidator:
         self.nc = None
         self.iouv = None
         self.jdict = None
+        self.sharded = False
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
 
         self.save_dir = save_dir or get_save_dir(self.args)
@@ -141,6 +146,10 @@ class BaseValidator:
             stats (dict): Dictionary containing validation statistics.
         """
         self.training = trainer is not None
+        self.sharded = (
+            self.args.shard_val and dist.is_available() and dist.is_initialized() and dist.get_world_size() > 1
+        )
+        rank = dist.get_rank() if self.sharded else -1
         augment = self.args.augment and (not self.training)
         if self.training:
             self.device = trainer.device
@@ -199,7 +208,7 @@ class BaseValidator:
             Profile(device=self.device),
             Profile(device=self.device),
         )
-        bar = TQDM(self.dataloader, desc=self.get_desc(), total=len(self.dataloader))
+        bar = TQDM(self.dataloader, desc=self.get_desc(), total=len(self.dataloader), disable=rank > 0)
         self.init_metrics(de_parallel(model))
         self.jdict = []  # empty before each val
         for batch_i, batch in enumerate(bar):
@@ -223,20 +232,50 @@ class BaseValidator:
                 preds = self.postprocess(preds)
 
             self.update_metrics(preds, batch)
-            if self.args.plots and batch_i < 3:
+            if self.args.plots and batch_i < 3 and rank in {-1, 0}:
                 self.plot_val_samples(batch, batch_i)
                 self.plot_predictions(batch, preds, batch_i)
 
             self.run_callbacks("on_val_batch_end")
+        nb = len(self.dataloader)  # number of batches
+        if self.sharded:
+            self.gather_stats()  # collect all shards on rank 0, which computes the metrics
+            if self.training:  # sum losses and batch counts over ranks
+                x = torch.cat((self.loss, self.loss.new_tensor([nb])))
+                dist.all_reduce(x)
+                self.loss, nb = x[:-1], x[-1].item()
+        results = None
+        if rank in {-1, 0}:
+            results = self.get_results(trainer, dt, nb)
+        if self.sharded:  # share the results and metrics so all ranks agree on them and on fitness
+            broadcast_list = [results, self.metrics] if rank == 0 else [None, None]
+            dist.broadcast_object_list(broadcast_list, 0)
+            results, self.metrics = broadcast_list
+        if self.training:
+            model.float()
+        return results
+
+    def get_results(self, trainer, dt, nb):
+        """
+        Compute, log and return the final metrics once all batches have been processed.
+
+        Args:
+            trainer (object | None): Trainer object when validating during training.
+            dt (Tuple[Profile]): Preprocess, inference, loss and postprocess profilers.
+            nb (int): Number of validation batches over all ranks, used to average the loss.
+
+        Returns:
+            (Dict): Validation results, rounded and including the loss items when training.
+        """
         stats = self.get_stats()
         self.check_stats(stats)
-        self.speed = dict(zip(self.speed.keys(), (x.t / len(self.dataloader.dataset) * 1e3 for x in dt)))
+        n = len(self.dataloader.sampler) if self.sharded else len(self.dataloader.dataset)  # images timed here
+        self.speed = dict(zip(self.speed.keys(), (x.t / n * 1e3 for x in dt)))
         self.finalize_metrics()
         self.print_results()
         self.run_callbacks("on_val_end")
         if self.training:
-            model.float()
-            results = {**stats, **trainer.label_loss_items(self.loss.cpu() / len(self.dataloader), prefix="val")}
+            results = {**stats, **trainer.label_loss_items(self.loss.cpu() / nb, prefix="val")}
             return {k: round(float(v), 5) for k, v in results.items()}  # return results as 5 decimal place floats
         else:
             LOGGER.info(
@@ -259,43 +298,44 @@ class BaseValidator:
         """
         Match predictions to ground truth objects using IoU.
 
+        Each prediction is assigned to the ground truth of its class with the highest IoU, and each ground truth keeps
+        the first prediction (highest confidence after NMS) assigned to it. All IoU thresholds are matched at once on
+        the IoU tensor's device, optionally for a whole batch of padded images, where padded entries must have zero IoU.
+
         Args:
-            pred_classes (torch.Tensor): Predicted class indices of shape (N,).
-            true_classes (torch.Tensor): Target class indices of shape (M,).
-            iou (torch.Tensor): An NxM tensor containing the pairwise IoU values for predictions and ground truth.
-            use_scipy (bool): Whether to use scipy for matching (more precise).
+            pred_classes (torch.Tensor): Predicted class indices of shape (..., N).
+            true_classes (torch.Tensor): Target class indices of shape (..., M).
+            iou (torch.Tensor): An (..., M, N) tensor containing the pairwise IoU values for ground truth and
+                predictions.
+            use_scipy (bool): Whether to use scipy for matching (more precise), only supported without batch dimensions.
 
         Returns:
-            (torch.Tensor): Correct tensor of shape (N, 10) for 10 IoU thresholds.
+            (torch.Tensor): Correct tensor of shape (..., N, 10) for 10 IoU thresholds.
         """
-        # Dx10 matrix, where D - detections, 10 - IoU thresholds
-        correct = np.zeros((pred_classes.shape[0], self.iouv.shape[0])).astype(bool)
-        # LxD matrix where L - labels (rows), D - detections (columns)
-        correct_class = true_classes[:, None] == pred_classes
-        iou = iou * correct_class  # zero out the wrong classes
-        iou = iou.cpu().numpy()
-        for i, threshold in enumerate(self.iouv.cpu().tolist()):
-            if use_scipy:
-                # WARNING: known issue that reduces mAP in https://github.com/ultralytics/ultralytics/pull/4708
-                import scipy  # scope import to avoid importing for all commands
-
+        (m, n), niou = iou.shape[-2:], self.iouv.shape[0]
+        iou = iou * (true_classes.unsqueeze(-1) == pred_classes.unsqueeze(-2))  # zero out the wrong classes
+        if use_scipy:
+            # WARNING: known issue that reduces mAP in https://github.com/ultralytics/ultralytics/pull/4708
+            import scipy  # scope import to avoid importing for all commands
+
+            correct = np.zeros((n, niou), dtype=bool)
+            iou = iou.cpu().numpy()
+            for i, threshold in enumerate(self.iouv.cpu().tolist()):
                 cost_matrix = iou * (iou >= threshold)
                 if cost_matrix.any():
                     labels_idx, detections_idx = scipy.optimize.linear_sum_assignment(cost_matrix)
                     valid = cost_matrix[labels_idx, detections_idx] > 0
                     if valid.any():
                         correct[detections_idx[valid], i] = True
-            else:
-                matches = np.nonzero(iou >= threshold)  # IoU > threshold and classes match
-                matches = np.array(matches).T
-                if matches.shape[0]:
-                    if matches.shape[0] > 1:
-                        matches = matches[iou[matches[:, 0], matches[:, 1]].argsort()[::-1]]
-                        matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
-                        # matches = matches[matches[:, 2].argsort()[::-1]]
-                        matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
-                    correct[matches[:, 1].astype(int), i] = True
-        return torch.tensor(correct, dtype=torch.bool, device=pred_classes.device)
+            return torch.tensor(correct, dtype=torch.bool, device=pred_classes.device)
+
+        if m == 0 or n == 0:
+            return torch.zeros((*iou.shape[:-2], n, niou), dtype=torch.bool, device=iou.device)
+        best, label = iou.max(-2)  # best ground truth for each prediction
+        valid = best.unsqueeze(-1) >= self.iouv.to(iou.device)  # (..., N, T) prediction clears threshold
+        # A valid prediction is correct unless an earlier prediction picked the same ground truth at that threshold
+        earlier = (label.unsqueeze(-1) == label.unsqueeze(-2)).float().tril_(-1)  # (..., N, N)
+        return valid & (earlier @ valid.float() == 0)
 
     def add_callback(self, event: str, callback):
         """Append the given callback to the specified event."""
@@ -334,6 +374,10 @@ class BaseValidator:
         """Finalize and return all metrics."""
         pass
 
+    def gather_stats(self):
+        """Gather the statistics collected by every DDP rank on rank 0 when the validation set is sharded."""
+        pass
+
     def get_stats(self):
         """Return statistics about the model's performance."""
         return {}
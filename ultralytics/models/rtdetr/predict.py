@@ -69,16 +69,16 @@ class RTDETRPredictor(BasePredictor):
             results.append(Results(orig_img, path=img_path, names=self.model.names, boxes=pred))
         return results
 
-    def pre_transform(self, im):
+    def get_letterbox(self, im):
         """
-        Pre-transforms the input images before feeding them into the model for inference. The input images are
-        letterboxed to ensure a square aspect ratio and scale-filled. The size must be square(640) and scale_filled.
+        Get the letterbox transform applied to input images before feeding them into the model for inference. The input
+        images are letterboxed to ensure a square aspect ratio and scale-filled. The size must be square(640) and
+        scale_filled.
 
         Args:
-            im (list[np.ndarray] |torch.Tensor): Input images of shape (N,3,h,w) for tensor, [(h,w,3) x N] for list.
+            im (list[np.ndarray]): Input images of shape [(h,w,3) x N].
 
         Returns:
-            (list): List of pre-transformed images ready for model inference.
+            (LetterBox): Scale-filling letterbox to the inference size.
         """
-        letterbox = LetterBox(self.imgsz, auto=False, scale_fill=True)
-        return [letterbox(image=x) for x in im]
+        return LetterBox(self.imgsz, auto=False, scale_fill=True)
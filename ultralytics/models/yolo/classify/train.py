@@ -134,7 +134,9 @@ class ClassificationTrainer(BaseTrainer):
         with torch_distributed_zero_first(rank):  # init dataset *.cache only once if DDP
             dataset = self.build_dataset(dataset_path, mode)
 
-        loader = build_dataloader(dataset, batch_size, self.args.workers, rank=rank)
+        loader = build_dataloader(
+            dataset, batch_size, self.args.workers, rank=rank, shard=mode != "train" and rank != -1
+        )
         # Attach inference transforms
         if mode != "train":
             if is_parallel(self.model):
@@ -196,6 +198,11 @@ class ClassificationTrainer(BaseTrainer):
                     LOGGER.info(f"\nValidating {f}...")
                     self.validator.args.data = self.args.data
                     self.validator.args.plots = self.args.plots
+                    if self.shard_val:  # other ranks have finished, validate the full set on rank 0
+                        self.validator.args.shard_val = False
+                        self.validator.dataloader = self.get_dataloader(
+                            self.testset, batch_size=self.test_loader.batch_size, rank=-1, mode="val"
+                        )
                     self.metrics = self.validator(model=f)
                     self.metrics.pop("fitness", None)
                     self.run_callbacks("on_fit_epoch_end")
@@ -1,6 +1,7 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import torch
+from torch import distributed as dist
 
 from ultralytics.data import ClassificationDataset, build_dataloader
 from ultralytics.engine.validator import BaseValidator
@@ -81,6 +82,14 @@ class ClassificationValidator(BaseValidator):
         self.pred.append(preds.argsort(1, descending=True)[:, :n5].type(torch.int32).cpu())
         self.targets.append(batch["cls"].type(torch.int32).cpu())
 
+    def gather_stats(self):
+        """Gather the predictions and targets of all ranks on rank 0."""
+        gathered = [None] * dist.get_world_size()
+        dist.all_gather_object(gathered, (self.pred, self.targets))
+        if dist.get_rank() == 0:
+            self.pred = [x for pred, _ in gathered for x in pred]
+            self.targets = [x for _, targets in gathered for x in targets]
+
     def finalize_metrics(self, *args, **kwargs):
         """Finalize metrics including confusion matrix and processing speed."""
         self.confusion_matrix.process_cls_preds(self.pred, self.targets)
@@ -109,7 +118,7 @@ class ClassificationValidator(BaseValidator):
     def get_dataloader(self, dataset_path, batch_size):
         """Build and return a data loader for classification validation."""
         dataset = self.build_dataset(dataset_path)
-        return build_dataloader(dataset, batch_size, self.args.workers, rank=-1)
+        return build_dataloader(dataset, batch_size, self.args.workers, rank=-1, shard=self.sharded)
 
     def print_results(self):
         """Print evaluation metrics for the classification model."""
@@ -53,6 +53,9 @@ class DetectionPredictor(BasePredictor):
         """
         Construct a list of Results objects from model predictions.
 
+        Boxes are scaled to the original images with the letterbox ratio and padding recorded during preprocessing if
+        available, instead of recomputing them from the image shapes.
+
         Args:
             preds (List[torch.Tensor]): List of predicted bounding boxes and scores for each image.
             img (torch.Tensor): Batch of preprocessed images used for inference.
@@ -61,12 +64,13 @@ class DetectionPredictor(BasePredictor):
         Returns:
             (List[Results]): List of Results objects containing detection information for each image.
         """
+        ratio_pads = self.ratio_pad or [None] * len(orig_imgs)
         return [
-            self.construct_result(pred, img, orig_img, img_path)
-            for pred, orig_img, img_path in zip(preds, orig_imgs, self.batch[0])
+            self.construct_result(pred, img, orig_img, img_path, ratio_pad)
+            for pred, orig_img, img_path, ratio_pad in zip(preds, orig_imgs, self.batch[0], ratio_pads)
         ]
 
-    def construct_result(self, pred, img, orig_img, img_path):
+    def construct_result(self, pred, img, orig_img, img_path, ratio_pad=None):
         """
         Construct a single Results object from one image prediction.
 
@@ -75,9 +79,10 @@ class DetectionPredictor(BasePredictor):
             img (torch.Tensor): Preprocessed image tensor used for inference.
             orig_img (np.ndarray): Original image before preprocessing.
             img_path (str): Path to the original image file.
+            ratio_pad (tuple, optional): Letterbox (ratio, (left_pad, top_pad)) of the image, computed if None.
 
         Returns:
             (Results): Results object containing the original image, image path, class names, and scaled bounding boxes.
         """
-        pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
+        pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape, ratio_pad=ratio_pad)
         return Results(orig_img, path=img_path, names=self.model.names, boxes=pred[:, :6])
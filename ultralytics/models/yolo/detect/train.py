@@ -8,6 +8,7 @@ import numpy as np
 import torch.nn as nn
 
 from ultralytics.data import build_dataloader, build_yolo_dataset
+from ultralytics.data.augment import BatchAugment
 from ultralytics.engine.trainer import BaseTrainer
 from ultralytics.models import yolo
 from ultralytics.nn.tasks import DetectionModel
@@ -85,19 +86,27 @@ class DetectionTrainer(BaseTrainer):
             LOGGER.warning("WARNING ⚠️ 'rect=True' is incompatible with DataLoader shuffle, setting shuffle=False")
             shuffle = False
         workers = self.args.workers if mode == "train" else self.args.workers * 2
-        return build_dataloader(dataset, batch_size, workers, shuffle, rank)  # return dataloader
+        if mode == "train" and self.args.batch_augment:
+            self.batch_augment = BatchAugment(self.args, flip_idx=self.data.get("flip_idx"))
+        return build_dataloader(dataset, batch_size, workers, shuffle, rank, shard=mode == "val" and rank != -1)
 
     def preprocess_batch(self, batch):
         """
         Preprocess a batch of images by scaling and converting to float.
 
+        With `batch_augment=True` the rotation, shear, perspective, HSV and flip augmentations are applied here to the
+        uint8 batch on the training device.
+
         Args:
             batch (Dict): Dictionary containing batch data with 'img' tensor.
 
         Returns:
             (Dict): Preprocessed batch with normalized images.
         """
-        batch["img"] = batch["img"].to(self.device, non_blocking=True).float() / 255
+        batch["img"] = batch["img"].to(self.device, non_blocking=True)
+        if self.args.batch_augment:
+            batch = self.batch_augment(batch)
+        batch["img"] = batch["img"].float() / 255
         if self.args.multi_scale:
             imgs = batch["img"]
             sz = (
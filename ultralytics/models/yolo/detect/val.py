@@ -5,12 +5,13 @@ from pathlib import Path
 
 import numpy as np
 import torch
+from torch import distributed as dist
 
 from ultralytics.data import build_dataloader, build_yolo_dataset, converter
 from ultralytics.engine.validator import BaseValidator
 from ultralytics.utils import LOGGER, ops
 from ultralytics.utils.checks import check_requirements
-from ultralytics.utils.metrics import ConfusionMatrix, DetMetrics, box_iou
+from ultralytics.utils.metrics import APAccumulator, COCOEvaluator, ConfusionMatrix, DetMetrics, box_iou
 from ultralytics.utils.plotting import output_to_target, plot_images
 
 
@@ -28,6 +29,8 @@ class DetectionValidator(BaseValidator):
         is_lvis (bool): Whether the dataset is LVIS.
         class_map (List): Mapping from model class indices to dataset class indices.
         metrics (DetMetrics): Object detection metrics calculator.
+        coco_evaluator (COCOEvaluator | None): Built-in COCO AP/AR evaluator, used when `coco_eval=True`.
+        accumulator (APAccumulator | None): Streaming confidence histograms replacing `stats`, used when `ap_bins > 0`.
         iouv (torch.Tensor): IoU thresholds for mAP calculation.
         niou (int): Number of IoU thresholds.
         lb (List): List for storing ground truth labels for hybrid saving.
@@ -60,6 +63,8 @@ class DetectionValidator(BaseValidator):
         self.class_map = None
         self.args.task = "detect"
         self.metrics = DetMetrics(save_dir=self.save_dir)
+        self.coco_evaluator = None
+        self.accumulator = None
         self.iouv = torch.linspace(0.5, 0.95, 10)  # IoU vector for mAP@0.5:0.95
         self.niou = self.iouv.numel()
         self.lb = []  # for autolabelling
@@ -117,6 +122,14 @@ class DetectionValidator(BaseValidator):
         self.metrics.names = self.names
         self.metrics.plot = self.args.plots
         self.confusion_matrix = ConfusionMatrix(nc=self.nc, conf=self.args.conf)
+        self.coco_evaluator = (
+            COCOEvaluator() if self.args.coco_eval and self.args.task == "detect" and not self.training else None
+        )
+        self.accumulator = (
+            APAccumulator(self.nc, self.niou, self.args.ap_bins)
+            if self.args.ap_bins and self.args.task in {"detect", "obb"}
+            else None
+        )
         self.seen = 0
         self.jdict = []
         self.stats = dict(tp=[], conf=[], pred_cls=[], target_cls=[], target_img=[])
@@ -195,41 +208,45 @@ class DetectionValidator(BaseValidator):
             preds (List[torch.Tensor]): List of predictions from the model.
             batch (Dict): Batch data containing ground truth.
         """
+        pbatches, predns = [], []
         for si, pred in enumerate(preds):
+            pbatches.append(self._prepare_batch(si, batch))
+            if len(pred) and self.args.single_cls:
+                pred[:, 5] = 0
+            predns.append(self._prepare_pred(pred, pbatches[-1]) if len(pred) else pred)
+        tps = self._process_batches(predns, [x["bbox"] for x in pbatches], [x["cls"] for x in pbatches])
+
+        for si, (pred, predn, pbatch, tp) in enumerate(zip(preds, predns, pbatches, tps)):
             self.seen += 1
             npr = len(pred)
             stat = dict(
                 conf=torch.zeros(0, device=self.device),
                 pred_cls=torch.zeros(0, device=self.device),
-                tp=torch.zeros(npr, self.niou, dtype=torch.bool, device=self.device),
+                tp=tp,
             )
-            pbatch = self._prepare_batch(si, batch)
             cls, bbox = pbatch.pop("cls"), pbatch.pop("bbox")
             nl = len(cls)
             stat["target_cls"] = cls
             stat["target_img"] = cls.unique()
             if npr == 0:
+                if self.coco_evaluator:
+                    self.coco_evaluator.update(pred[:, :4], pred[:, 4], pred[:, 5], bbox, cls)
                 if nl:
-                    for k in self.stats.keys():
-                        self.stats[k].append(stat[k])
+                    self._append_stats(stat)
                     if self.args.plots:
                         self.confusion_matrix.process_batch(detections=None, gt_bboxes=bbox, gt_cls=cls)
                 continue
 
             # Predictions
-            if self.args.single_cls:
-                pred[:, 5] = 0
-            predn = self._prepare_pred(pred, pbatch)
             stat["conf"] = predn[:, 4]
             stat["pred_cls"] = predn[:, 5]
+            if self.coco_evaluator:
+                self.coco_evaluator.update(predn[:, :4], predn[:, 4], predn[:, 5], bbox, cls)
 
             # Evaluate
-            if nl:
-                stat["tp"] = self._process_batch(predn, bbox, cls)
             if self.args.plots:
                 self.confusion_matrix.process_batch(predn, bbox, cls)
-            for k in self.stats.keys():
-                self.stats[k].append(stat[k])
+            self._append_stats(stat)
 
             # Save
             if self.args.save_json:
@@ -242,6 +259,46 @@ class DetectionValidator(BaseValidator):
                     self.save_dir / "labels" / f"{Path(batch['im_file'][si]).stem}.txt",
                 )
 
+    def _append_stats(self, stat):
+        """
+        Store the statistics of one image, or count them into the streaming accumulator if enabled.
+
+        Args:
+            stat (Dict): Per-image 'tp', 'conf', 'pred_cls', 'target_cls' and 'target_img' tensors.
+        """
+        if self.accumulator:
+            self.accumulator.update(**stat)
+        else:
+            for k in self.stats.keys():
+                self.stats[k].append(stat[k])
+
+    def gather_stats(self):
+        """Gather the per-image statistics, confusion matrix, JSON predictions and evaluators of all ranks on rank 0."""
+        state = dict(
+            stats={k: [x.cpu() for x in v] for k, v in self.stats.items()},
+            seen=self.seen,
+            jdict=self.jdict,
+            matrix=self.confusion_matrix.matrix,
+            accumulator=self.accumulator,
+            coco_evaluator=self.coco_evaluator,
+        )
+        gathered = [None] * dist.get_world_size()
+        dist.all_gather_object(gathered, state)
+        if dist.get_rank() != 0:
+            return
+        # Shards are contiguous, so concatenating in rank order restores the single-process image order
+        self.stats = {k: [x for s in gathered for x in s["stats"][k]] for k in self.stats}
+        self.seen = sum(s["seen"] for s in gathered)
+        self.jdict = [x for s in gathered for x in s["jdict"]]
+        self.confusion_matrix.matrix = sum(s["matrix"] for s in gathered)
+        for s in gathered[1:]:
+            if self.accumulator:
+                self.accumulator.merge(s["accumulator"])
+            if self.coco_evaluator:
+                self.coco_evaluator.merge(s["coco_evaluator"])
+        if self.coco_evaluator:
+            self.coco_evaluator.image_ids = list(range(len(self.coco_evaluator.image_ids)))  # default ids are indices
+
     def finalize_metrics(self, *args, **kwargs):
         """
         Set final values for metrics speed and confusion matrix.
@@ -260,13 +317,21 @@ class DetectionValidator(BaseValidator):
         Returns:
             (Dict): Dictionary containing metrics results.
         """
-        stats = {k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()}  # to numpy
-        self.nt_per_class = np.bincount(stats["target_cls"].astype(int), minlength=self.nc)
-        self.nt_per_image = np.bincount(stats["target_img"].astype(int), minlength=self.nc)
-        stats.pop("target_img", None)
-        if len(stats):
-            self.metrics.process(**stats, on_plot=self.on_plot)
-        return self.metrics.results_dict
+        if self.accumulator:
+            self.nt_per_class, self.nt_per_image = self.accumulator.nt, self.accumulator.ni
+            self.metrics.process_accumulator(self.accumulator, on_plot=self.on_plot)
+        else:
+            stats = {k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()}  # to numpy
+            self.nt_per_class = np.bincount(stats["target_cls"].astype(int), minlength=self.nc)
+            self.nt_per_image = np.bincount(stats["target_img"].astype(int), minlength=self.nc)
+            stats.pop("target_img", None)
+            if len(stats):
+                self.metrics.process(**stats, on_plot=self.on_plot)
+        results = self.metrics.results_dict
+        if self.coco_evaluator:
+            self.coco_evaluator.evaluate()
+            results.update({f"metrics/COCO_{k}(B)": v for k, v in self.coco_evaluator.results_dict.items()})
+        return results
 
     def print_results(self):
         """Print training/validation set metrics per class."""
@@ -281,6 +346,8 @@ class DetectionValidator(BaseValidator):
                 LOGGER.info(
                     pf % (self.names[c], self.nt_per_image[c], self.nt_per_class[c], *self.metrics.class_result(i))
                 )
+        if self.coco_evaluator:
+            LOGGER.info(f"\nCOCO metrics (box areas):\n{self.coco_evaluator.summary()}")
 
         if self.args.plots:
             for normalize in True, False:
@@ -305,6 +372,25 @@ class DetectionValidator(BaseValidator):
         iou = box_iou(gt_bboxes, detections[:, :4])
         return self.match_predictions(detections[:, 5], gt_cls, iou)
 
+    def _process_batches(self, detections, gt_bboxes, gt_cls):
+        """
+        Return correct prediction matrices for all images of a batch, matched together in one padded pass.
+
+        Args:
+            detections (List[torch.Tensor]): Per-image tensors of shape (N, 6) with (x1, y1, x2, y2, conf, class).
+            gt_bboxes (List[torch.Tensor]): Per-image tensors of shape (M, 4) with ground-truth (x1, y1, x2, y2).
+            gt_cls (List[torch.Tensor]): Per-image tensors of shape (M,) with target class indices.
+
+        Returns:
+            (List[torch.Tensor]): Per-image correct prediction matrices of shape (N, 10) for 10 IoU levels.
+        """
+        pad = torch.nn.utils.rnn.pad_sequence  # zero boxes have zero IoU with everything
+        iou = box_iou(pad(gt_bboxes, batch_first=True), pad([x[:, :4] for x in detections], batch_first=True))
+        correct = self.match_predictions(
+            pad([x[:, 5] for x in detections], batch_first=True), pad(gt_cls, batch_first=True), iou
+        )
+        return [c[: len(x)] for c, x in zip(correct, detections)]
+
     def build_dataset(self, img_path, mode="val", batch=None):
         """
         Build YOLO Dataset.
@@ -331,7 +417,7 @@ class DetectionValidator(BaseValidator):
             (torch.utils.data.DataLoader): Dataloader for validation.
         """
         dataset = self.build_dataset(dataset_path, batch=batch_size, mode="val")
-        return build_dataloader(dataset, batch_size, self.args.workers, shuffle=False, rank=-1)  # return dataloader
+        return build_dataloader(dataset, batch_size, self.args.workers, shuffle=False, rank=-1, shard=self.sharded)
 
     def plot_val_samples(self, batch, ni):
         """
@@ -78,6 +78,25 @@ class OBBValidator(DetectionValidator):
         iou = batch_probiou(gt_bboxes, torch.cat([detections[:, :4], detections[:, -1:]], dim=-1))
         return self.match_predictions(detections[:, 5], gt_cls, iou)
 
+    def _process_batches(self, detections, gt_bboxes, gt_cls):
+        """
+        Return correct prediction matrices for all images of a batch, matching rotated boxes image by image.
+
+        Args:
+            detections (List[torch.Tensor]): Per-image (N, 7) tensors of (x1, y1, x2, y2, conf, class, angle).
+            gt_bboxes (List[torch.Tensor]): Per-image tensors of shape (M, 5) with ground-truth (x1, y1, x2, y2, angle).
+            gt_cls (List[torch.Tensor]): Per-image tensors of shape (M,) with target class indices.
+
+        Returns:
+            (List[torch.Tensor]): Per-image correct prediction matrices of shape (N, 10) for 10 IoU levels.
+        """
+        return [
+            self._process_batch(d, b, c)
+            if len(d) and len(c)
+            else torch.zeros(len(d), self.niou, dtype=torch.bool, device=self.device)
+            for d, b, c in zip(detections, gt_bboxes, gt_cls)
+        ]
+
     def _prepare_batch(self, si, batch):
         """Prepare batch data for OBB validation with proper scaling and formatting."""
         idx = batch["batch_idx"] == si
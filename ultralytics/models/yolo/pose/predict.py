@@ -36,7 +36,7 @@ class PosePredictor(DetectionPredictor):
                 "See https://github.com/ultralytics/ultralytics/issues/4031."
             )
 
-    def construct_result(self, pred, img, orig_img, img_path):
+    def construct_result(self, pred, img, orig_img, img_path, ratio_pad=None):
         """
         Construct the result object from the prediction, including keypoints.
 
@@ -49,14 +49,15 @@ class PosePredictor(DetectionPredictor):
             img (torch.Tensor): The processed input image tensor with shape (B, C, H, W).
             orig_img (np.ndarray): The original unprocessed image as a numpy array.
             img_path (str): The path to the original image file.
+            ratio_pad (tuple, optional): Letterbox (ratio, (left_pad, top_pad)) of the image, computed if None.
 
         Returns:
             (Results): The result object containing the original image, image path, class names, bounding boxes, and keypoints.
         """
-        result = super().construct_result(pred, img, orig_img, img_path)
+        result = super().construct_result(pred, img, orig_img, img_path, ratio_pad)
         # Extract keypoints from prediction and reshape according to model's keypoint shape
         pred_kpts = pred[:, 6:].view(len(pred), *self.model.kpt_shape) if len(pred) else pred[:, 6:]
         # Scale keypoints coordinates to match the original image dimensions
-        pred_kpts = ops.scale_coords(img.shape[2:], pred_kpts, orig_img.shape)
+        pred_kpts = ops.scale_coords(img.shape[2:], pred_kpts, orig_img.shape, ratio_pad=ratio_pad)
         result.update(keypoints=pred_kpts)
         return result
@@ -55,12 +55,13 @@ class SegmentationPredictor(DetectionPredictor):
             (List[Results]): List of result objects containing the original images, image paths, class names,
                 bounding boxes, and masks.
         """
+        ratio_pads = self.ratio_pad or [None] * len(orig_imgs)
         return [
-            self.construct_result(pred, img, orig_img, img_path, proto)
-            for pred, orig_img, img_path, proto in zip(preds, orig_imgs, self.batch[0], protos)
+            self.construct_result(pred, img, orig_img, img_path, proto, ratio_pad)
+            for pred, orig_img, img_path, proto, ratio_pad in zip(preds, orig_imgs, self.batch[0], protos, ratio_pads)
         ]
 
-    def construct_result(self, pred, img, orig_img, img_path, proto):
+    def construct_result(self, pred, img, orig_img, img_path, proto, ratio_pad=None):
         """
         Construct a single result object from the prediction.
 
@@ -70,6 +71,7 @@ class SegmentationPredictor(DetectionPredictor):
             orig_img (np.ndarray): The original image before preprocessing.
             img_path (str): The path to the original image.
             proto (torch.Tensor): The prototype masks.
+            ratio_pad (tuple, optional): Letterbox (ratio, (left_pad, top_pad)) of the image, computed if None.
 
         Returns:
             (Results): Result object containing the original image, image path, class names, bounding boxes, and masks.
@@ -77,11 +79,11 @@ class SegmentationPredictor(DetectionPredictor):
         if not len(pred):  # save empty boxes
             masks = None
         elif self.args.retina_masks:
-            pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
+            pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape, ratio_pad=ratio_pad)
             masks = ops.process_mask_native(proto, pred[:, 6:], pred[:, :4], orig_img.shape[:2])  # HWC
         else:
             masks = ops.process_mask(proto, pred[:, 6:], pred[:, :4], img.shape[2:], upsample=True)  # HWC
-            pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
+            pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape, ratio_pad=ratio_pad)
         if masks is not None:
             keep = masks.sum((-2, -1)) > 0  # only keep predictions with masks
             pred, masks = pred[keep], masks[keep]
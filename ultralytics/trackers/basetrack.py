@@ -1,6 +1,7 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 """Module defines the base classes and structures for object tracking in YOLO."""
 
+import threading
 from collections import OrderedDict
 
 import numpy as np
@@ -34,6 +35,7 @@ class BaseTrack:
 
     Attributes:
         _count (int): Class-level counter for unique track IDs.
+        _lock (threading.Lock): Class-level lock guarding the track ID counter.
         track_id (int): Unique identifier for the track.
         is_activated (bool): Flag indicating whether the track is currently active.
         state (TrackState): Current state of the track.
@@ -49,6 +51,7 @@ class BaseTrack:
     Methods:
         end_frame: Returns the ID of the last frame where the object was tracked.
         next_id: Increments and returns the next global track ID.
+        next_ids: Reserves and returns the next consecutive global track IDs.
         activate: Abstract method to activate the track.
         predict: Abstract method to predict the next state of the track.
         update: Abstract method to update the track with new data.
@@ -64,6 +67,7 @@ class BaseTrack:
     """
 
     _count = 0
+    _lock = threading.Lock()  # guards _count for trackers of different streams updated in parallel
 
     def __init__(self):
         """
@@ -95,8 +99,15 @@ class BaseTrack:
     @staticmethod
     def next_id():
         """Increment and return the next unique global track ID for object tracking."""
-        BaseTrack._count += 1
-        return BaseTrack._count
+        return int(BaseTrack.next_ids(1)[0])
+
+    @staticmethod
+    def next_ids(n):
+        """Reserve and return the next 'n' consecutive unique global track IDs as an array."""
+        with BaseTrack._lock:
+            start = BaseTrack._count
+            BaseTrack._count += n
+        return np.arange(start + 1, start + n + 1)
 
     def activate(self, *args):
         """Activates the track with provided arguments, initializing necessary attributes for tracking."""
@@ -121,4 +132,128 @@ class BaseTrack:
     @staticmethod
     def reset_id():
         """Reset the global track ID counter to its initial value."""
-        BaseTrack._count = 0
+        with BaseTrack._lock:
+            BaseTrack._count = 0
+
+
+class TrackTable:
+    """
+    Structure-of-arrays store of track states, where each track occupies one slot (row) of contiguous NumPy arrays.
+
+    Trackers address tracks by slot index arrays, so Kalman prediction, matching and state transitions of all tracks
+    run as bulk array operations. Slots of removed tracks are released and reused by new tracks, and the arrays grow by
+    doubling when all slots are in use.
+
+    Attributes:
+        alive (np.ndarray): Whether each slot holds a track, shape (capacity,).
+        mean (np.ndarray): Kalman state means, shape (capacity, 8).
+        covariance (np.ndarray): Kalman state covariances, shape (capacity, 8, 8).
+        track_id (np.ndarray): Track IDs.
+        state (np.ndarray): Track states as TrackState values.
+        is_activated (np.ndarray): Whether each track has been confirmed.
+        score (np.ndarray): Confidence scores of the last matched detections.
+        cls (np.ndarray): Class labels of the last matched detections.
+        idx (np.ndarray): Indices of the last matched detections in their frame.
+        angle (np.ndarray): Angles of the last matched oriented detections, NaN for axis-aligned boxes.
+        frame_id (np.ndarray): Frames where each track was last updated.
+        start_frame (np.ndarray): Frames where each track was activated.
+        tracklet_len (np.ndarray): Number of consecutive updates since each track was (re)activated.
+        smooth_feat (np.ndarray | None): Smoothed unit-norm appearance features, shape (capacity, D), zero if unset.
+        curr_feat (np.ndarray | None): Latest unit-norm appearance features, shape (capacity, D), zero if unset.
+
+    Methods:
+        add: Allocate slots for new tracks.
+        release: Free the slots of tracks that are no longer kept.
+        update_features: Update the appearance features of tracks with an exponential moving average.
+
+    Examples:
+        >>> table = TrackTable()
+        >>> slots = table.add(3)
+        >>> table.state[slots] = TrackState.Tracked
+        >>> table.release(slots[:1])
+    """
+
+    FIELDS = {  # name: (row shape, dtype, fill value)
+        "mean": ((8,), np.float64, 0),
+        "covariance": ((8, 8), np.float64, 0),
+        "track_id": ((), np.int64, 0),
+        "state": ((), np.int64, TrackState.New),
+        "is_activated": ((), bool, False),
+        "score": ((), np.float32, 0),
+        "cls": ((), np.float32, 0),
+        "idx": ((), np.int64, 0),
+        "angle": ((), np.float32, np.nan),
+        "frame_id": ((), np.int64, 0),
+        "start_frame": ((), np.int64, 0),
+        "tracklet_len": ((), np.int64, 0),
+    }
+
+    def __init__(self, capacity=64):
+        """Initialize an empty table with room for 'capacity' tracks."""
+        self.alive = np.zeros(0, dtype=bool)
+        self.smooth_feat = self.curr_feat = None
+        self._resize(capacity)
+
+    def __len__(self):
+        """Return the number of tracks in the table."""
+        return int(self.alive.sum())
+
+    def _resize(self, capacity):
+        """Resize all arrays to 'capacity' slots, keeping existing rows."""
+        n = len(self.alive)
+        for name, (shape, dtype, fill) in self.FIELDS.items():
+            new = np.full((capacity, *shape), fill, dtype=dtype)
+            if n:
+                new[:n] = getattr(self, name)
+            setattr(self, name, new)
+        for name in "smooth_feat", "curr_feat":
+            if (old := getattr(self, name)) is not None:
+                setattr(self, name, np.concatenate([old, np.zeros((capacity - n, old.shape[1]), old.dtype)]))
+        self.alive = np.concatenate([self.alive, np.zeros(capacity - n, dtype=bool)])
+
+    def add(self, n):
+        """
+        Allocate slots for 'n' new tracks, reusing released slots first and reset to the field defaults.
+
+        Args:
+            n (int): Number of slots to allocate.
+
+        Returns:
+            (np.ndarray): Allocated slot indices of shape (n,).
+        """
+        free = np.flatnonzero(~self.alive)
+        if len(free) < n:
+            self._resize(max(2 * len(self.alive), len(self.alive) + n - len(free)))
+            free = np.flatnonzero(~self.alive)
+        slots = free[:n]
+        for name, (_, _, fill) in self.FIELDS.items():
+            getattr(self, name)[slots] = fill
+        for feat in self.smooth_feat, self.curr_feat:
+            if feat is not None:
+                feat[slots] = 0
+        self.alive[slots] = True
+        return slots
+
+    def release(self, slots):
+        """Free the given slots for reuse by new tracks."""
+        self.alive[slots] = False
+
+    def update_features(self, slots, feats, alpha=0.9):
+        """
+        Update appearance features of tracks, smoothing them with an exponential moving average.
+
+        Features are normalized to unit length. Tracks without features take the new features as their smoothed ones.
+
+        Args:
+            slots (np.ndarray): Slot indices of shape (N,).
+            feats (np.ndarray): Features of shape (N, D).
+            alpha (float): Weight of the previous smoothed features.
+        """
+        feats = feats / np.linalg.norm(feats, axis=1, keepdims=True)
+        if self.smooth_feat is None:
+            self.smooth_feat = np.zeros((len(self.alive), feats.shape[1]), dtype=np.float32)
+            self.curr_feat = np.zeros_like(self.smooth_feat)
+        smooth = self.smooth_feat[slots]
+        smooth = np.where((smooth != 0).any(1, keepdims=True), alpha * smooth + (1 - alpha) * feats, feats)
+        self.curr_feat[slots] = feats
+        self.smooth_feat[slots] = smooth / np.linalg.norm(smooth, axis=1, keepdims=True)
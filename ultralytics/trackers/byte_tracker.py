@@ -2,236 +2,12 @@
 
 import numpy as np
 
-from ..utils import LOGGER
-from ..utils.ops import xywh2ltwh
-from .basetrack import BaseTrack, TrackState
+from ..utils.ops import xywh2xyxy
+from .basetrack import BaseTrack, TrackState, TrackTable
 from .utils import matching
 from .utils.kalman_filter import KalmanFilterXYAH
 
 
-class STrack(BaseTrack):
-    """
-    Single object tracking representation that uses Kalman filtering for state estimation.
-
-    This class is responsible for storing all the information regarding individual tracklets and performs state updates
-    and predictions based on Kalman filter.
-
-    Attributes:
-        shared_kalman (KalmanFilterXYAH): Shared Kalman filter used across all STrack instances for prediction.
-        _tlwh (np.ndarray): Private attribute to store top-left corner coordinates and width and height of bounding box.
-        kalman_filter (KalmanFilterXYAH): Instance of Kalman filter used for this particular object track.
-        mean (np.ndarray): Mean state estimate vector.
-        covariance (np.ndarray): Covariance of state estimate.
-        is_activated (bool): Boolean flag indicating if the track has been activated.
-        score (float): Confidence score of the track.
-        tracklet_len (int): Length of the tracklet.
-        cls (Any): Class label for the object.
-        idx (int): Index or identifier for the object.
-        frame_id (int): Current frame ID.
-        start_frame (int): Frame where the object was first detected.
-
-    Methods:
-        predict(): Predict the next state of the object using Kalman filter.
-        multi_predict(stracks): Predict the next states for multiple tracks.
-        multi_gmc(stracks, H): Update multiple track states using a homography matrix.
-        activate(kalman_filter, frame_id): Activate a new tracklet.
-        re_activate(new_track, frame_id, new_id): Reactivate a previously lost tracklet.
-        update(new_track, frame_id): Update the state of a matched track.
-        convert_coords(tlwh): Convert bounding box to x-y-aspect-height format.
-        tlwh_to_xyah(tlwh): Convert tlwh bounding box to xyah format.
-
-    Examples:
-        Initialize and activate a new track
-        >>> track = STrack(xywh=[100, 200, 50, 80, 0], score=0.9, cls="person")
-        >>> track.activate(kalman_filter=KalmanFilterXYAH(), frame_id=1)
-    """
-
-    shared_kalman = KalmanFilterXYAH()
-
-    def __init__(self, xywh, score, cls):
-        """
-        Initialize a new STrack instance.
-
-        Args:
-            xywh (List[float]): Bounding box coordinates and dimensions in the format (x, y, w, h, [a], idx), where
-                (x, y) is the center, (w, h) are width and height, [a] is optional aspect ratio, and idx is the id.
-            score (float): Confidence score of the detection.
-            cls (Any): Class label for the detected object.
-
-        Examples:
-            >>> xywh = [100.0, 150.0, 50.0, 75.0, 1]
-            >>> score = 0.9
-            >>> cls = "person"
-            >>> track = STrack(xywh, score, cls)
-        """
-        super().__init__()
-        # xywh+idx or xywha+idx
-        assert len(xywh) in {5, 6}, f"expected 5 or 6 values but got {len(xywh)}"
-        self._tlwh = np.asarray(xywh2ltwh(xywh[:4]), dtype=np.float32)
-        self.kalman_filter = None
-        self.mean, self.covariance = None, None
-        self.is_activated = False
-
-        self.score = score
-        self.tracklet_len = 0
-        self.cls = cls
-        self.idx = xywh[-1]
-        self.angle = xywh[4] if len(xywh) == 6 else None
-
-    def predict(self):
-        """Predicts the next state (mean and covariance) of the object using the Kalman filter."""
-        mean_state = self.mean.copy()
-        if self.state != TrackState.Tracked:
-            mean_state[7] = 0
-        self.mean, self.covariance = self.kalman_filter.predict(mean_state, self.covariance)
-
-    @staticmethod
-    def multi_predict(stracks):
-        """Perform multi-object predictive tracking using Kalman filter for the provided list of STrack instances."""
-        if len(stracks) <= 0:
-            return
-        multi_mean = np.asarray([st.mean.copy() for st in stracks])
-        multi_covariance = np.asarray([st.covariance for st in stracks])
-        for i, st in enumerate(stracks):
-            if st.state != TrackState.Tracked:
-                multi_mean[i][7] = 0
-        multi_mean, multi_covariance = STrack.shared_kalman.multi_predict(multi_mean, multi_covariance)
-        for i, (mean, cov) in enumerate(zip(multi_mean, multi_covariance)):
-            stracks[i].mean = mean
-            stracks[i].covariance = cov
-
-    @staticmethod
-    def multi_gmc(stracks, H=np.eye(2, 3)):
-        """Update state tracks positions and covariances using a homography matrix for multiple tracks."""
-        if len(stracks) > 0:
-            multi_mean = np.asarray([st.mean.copy() for st in stracks])
-            multi_covariance = np.asarray([st.covariance for st in stracks])
-
-            R = H[:2, :2]
-            R8x8 = np.kron(np.eye(4, dtype=float), R)
-            t = H[:2, 2]
-
-            for i, (mean, cov) in enumerate(zip(multi_mean, multi_covariance)):
-                mean = R8x8.dot(mean)
-                mean[:2] += t
-                cov = R8x8.dot(cov).dot(R8x8.transpose())
-
-                stracks[i].mean = mean
-                stracks[i].covariance = cov
-
-    def activate(self, kalman_filter, frame_id):
-        """Activate a new tracklet using the provided Kalman filter and initialize its state and covariance."""
-        self.kalman_filter = kalman_filter
-        self.track_id = self.next_id()
-        self.mean, self.covariance = self.kalman_filter.initiate(self.convert_coords(self._tlwh))
-
-        self.tracklet_len = 0
-        self.state = TrackState.Tracked
-        if frame_id == 1:
-            self.is_activated = True
-        self.frame_id = frame_id
-        self.start_frame = frame_id
-
-    def re_activate(self, new_track, frame_id, new_id=False):
-        """Reactivates a previously lost track using new detection data and updates its state and attributes."""
-        self.mean, self.covariance = self.kalman_filter.update(
-            self.mean, self.covariance, self.convert_coords(new_track.tlwh)
-        )
-        self.tracklet_len = 0
-        self.state = TrackState.Tracked
-        self.is_activated = True
-        self.frame_id = frame_id
-        if new_id:
-            self.track_id = self.next_id()
-        self.score = new_track.score
-        self.cls = new_track.cls
-        self.angle = new_track.angle
-        self.idx = new_track.idx
-
-    def update(self, new_track, frame_id):
-        """
-        Update the state of a matched track.
-
-        Args:
-            new_track (STrack): The new track containing updated information.
-            frame_id (int): The ID of the current frame.
-
-        Examples:
-            Update the state of a track with new detection information
-            >>> track = STrack([100, 200, 50, 80, 0.9, 1])
-            >>> new_track = STrack([105, 205, 55, 85, 0.95, 1])
-            >>> track.update(new_track, 2)
-        """
-        self.frame_id = frame_id
-        self.tracklet_len += 1
-
-        new_tlwh = new_track.tlwh
-        self.mean, self.covariance = self.kalman_filter.update(
-            self.mean, self.covariance, self.convert_coords(new_tlwh)
-        )
-        self.state = TrackState.Tracked
-        self.is_activated = True
-
-        self.score = new_track.score
-        self.cls = new_track.cls
-        self.angle = new_track.angle
-        self.idx = new_track.idx
-
-    def convert_coords(self, tlwh):
-        """Convert a bounding box's top-left-width-height format to its x-y-aspect-height equivalent."""
-        return self.tlwh_to_xyah(tlwh)
-
-    @property
-    def tlwh(self):
-        """Returns the bounding box in top-left-width-height format from the current state estimate."""
-        if self.mean is None:
-            return self._tlwh.copy()
-        ret = self.mean[:4].copy()
-        ret[2] *= ret[3]
-        ret[:2] -= ret[2:] / 2
-        return ret
-
-    @property
-    def xyxy(self):
-        """Converts bounding box from (top left x, top left y, width, height) to (min x, min y, max x, max y) format."""
-        ret = self.tlwh.copy()
-        ret[2:] += ret[:2]
-        return ret
-
-    @staticmethod
-    def tlwh_to_xyah(tlwh):
-        """Convert bounding box from tlwh format to center-x-center-y-aspect-height (xyah) format."""
-        ret = np.asarray(tlwh).copy()
-        ret[:2] += ret[2:] / 2
-        ret[2] /= ret[3]
-        return ret
-
-    @property
-    def xywh(self):
-        """Returns the current position of the bounding box in (center x, center y, width, height) format."""
-        ret = np.asarray(self.tlwh).copy()
-        ret[:2] += ret[2:] / 2
-        return ret
-
-    @property
-    def xywha(self):
-        """Returns position in (center x, center y, width, height, angle) format, warning if angle is missing."""
-        if self.angle is None:
-            LOGGER.warning("WARNING ⚠️ `angle` attr not found, returning `xywh` instead.")
-            return self.xywh
-        return np.concatenate([self.xywh, self.angle[None]])
-
-    @property
-    def result(self):
-        """Returns the current tracking results in the appropriate bounding box format."""
-        coords = self.xyxy if self.angle is None else self.xywha
-        return coords.tolist() + [self.track_id, self.score, self.cls, self.idx]
-
-    def __repr__(self):
-        """Returns a string representation of the STrack object including start frame, end frame, and track ID."""
-        return f"OT_{self.track_id}_({self.start_frame}-{self.end_frame})"
-
-
 class BYTETracker:
     """
     BYTETracker: A tracking algorithm built on top of YOLOv8 for object detection and tracking.
@@ -240,10 +16,13 @@ class BYTETracker:
     video sequence. It maintains the state of tracked, lost, and removed tracks over frames, utilizes Kalman filtering for
     predicting the new object locations, and performs data association.
 
+    Track states are kept in a structure-of-arrays TrackTable and tracks are addressed by slot index arrays, so Kalman
+    prediction, matching and state transitions run as bulk array operations rather than per-object Python calls.
+
     Attributes:
-        tracked_stracks (List[STrack]): List of successfully activated tracks.
-        lost_stracks (List[STrack]): List of lost tracks.
-        removed_stracks (List[STrack]): List of removed tracks.
+        table (TrackTable): Array-backed states of all tracked and lost tracks.
+        tracked (np.ndarray): Slots of tracked (including unconfirmed) tracks, in order of their first tracking.
+        lost (np.ndarray): Slots of lost tracks.
         frame_id (int): The current frame ID.
         args (Namespace): Command-line arguments.
         max_time_lost (int): The maximum frames for a track to be considered as 'lost'.
@@ -252,13 +31,16 @@ class BYTETracker:
     Methods:
         update(results, img=None): Updates object tracker with new detections.
         get_kalmanfilter(): Returns a Kalman filter object for tracking bounding boxes.
-        init_track(dets, scores, cls, img=None): Initialize object tracking with detections.
+        init_track(dets, scores, cls, img=None): Initialize detections for association.
         get_dists(tracks, detections): Calculates the distance between tracks and detections.
         multi_predict(tracks): Predicts the location of tracks.
-        reset_id(): Resets the ID counter of STrack.
-        joint_stracks(tlista, tlistb): Combines two lists of stracks.
-        sub_stracks(tlista, tlistb): Filters out the stracks present in the second list from the first list.
-        remove_duplicate_stracks(stracksa, stracksb): Removes duplicate stracks based on IoU.
+        multi_gmc(tracks, H): Applies a camera motion homography to tracks.
+        convert_coords(xywh): Convert detection boxes to Kalman measurements.
+        get_xywh(tracks): Return track boxes from their Kalman states.
+        reset_id(): Resets the track ID counter.
+        joint_tracks(a, b): Combines two arrays of track slots.
+        sub_tracks(a, b): Filters out the track slots present in the second array from the first.
+        remove_duplicate_tracks(a, b): Removes duplicate tracks based on IoU.
 
     Examples:
         Initialize BYTETracker and update with detection results
@@ -280,9 +62,9 @@ class BYTETracker:
             >>> args = Namespace(track_buffer=30)
             >>> tracker = BYTETracker(args, frame_rate=30)
         """
-        self.tracked_stracks = []  # type: list[STrack]
-        self.lost_stracks = []  # type: list[STrack]
-        self.removed_stracks = []  # type: list[STrack]
+        self.table = TrackTable()
+        self.tracked = np.empty(0, dtype=np.int64)
+        self.lost = np.empty(0, dtype=np.int64)
 
         self.frame_id = 0
         self.args = args
@@ -290,187 +72,250 @@ class BYTETracker:
         self.kalman_filter = self.get_kalmanfilter()
         self.reset_id()
 
-    def update(self, results, img=None):
-        """Updates the tracker with new detections and returns the current list of tracked objects."""
+    def update(self, results, img=None, feats=None):
+        """
+        Updates the tracker with new detections and returns the current list of tracked objects.
+
+        Args:
+            results (Boxes | OBB): NumPy-backed detections of the frame.
+            img (np.ndarray, optional): Current frame, i.e. for motion compensation.
+            feats (np.ndarray, optional): Appearance features of the detections, shape (N, D). They are used for the
+                high score detections only.
+
+        Returns:
+            (np.ndarray): Tracked objects of shape (M, 8) or (M, 9) as boxes, track ID, score, class and index.
+        """
         self.frame_id += 1
-        activated_stracks = []
-        refind_stracks = []
-        lost_stracks = []
-        removed_stracks = []
+        t = self.table
 
         scores = results.conf
         bboxes = results.xywhr if hasattr(results, "xywhr") else results.xywh
-        # Add index
-        bboxes = np.concatenate([bboxes, np.arange(len(bboxes)).reshape(-1, 1)], axis=-1)
         cls = results.cls
 
         remain_inds = scores >= self.args.track_high_thresh
-        inds_low = scores > self.args.track_low_thresh
-        inds_high = scores < self.args.track_high_thresh
-
-        inds_second = inds_low & inds_high
-        dets_second = bboxes[inds_second]
-        dets = bboxes[remain_inds]
-        scores_keep = scores[remain_inds]
-        scores_second = scores[inds_second]
-        cls_keep = cls[remain_inds]
-        cls_second = cls[inds_second]
-
-        detections = self.init_track(dets, scores_keep, cls_keep, img)
-        # Add newly detected tracklets to tracked_stracks
-        unconfirmed = []
-        tracked_stracks = []  # type: list[STrack]
-        for track in self.tracked_stracks:
-            if not track.is_activated:
-                unconfirmed.append(track)
-            else:
-                tracked_stracks.append(track)
+        inds_second = (scores > self.args.track_low_thresh) & (scores < self.args.track_high_thresh)
+        detections = self.init_track(bboxes[remain_inds], scores[remain_inds], cls[remain_inds], img)
+        detections["idx"] = np.flatnonzero(remain_inds)
+        detections_second = self.init_track(bboxes[inds_second], scores[inds_second], cls[inds_second], img)
+        detections_second["idx"] = np.flatnonzero(inds_second)
+        if feats is not None:
+            detections["feat"] = np.asarray(feats, dtype=np.float32)[remain_inds]
+
+        # Add newly detected tracklets to tracked
+        unconfirmed = self.tracked[~t.is_activated[self.tracked]]
+        tracked = self.tracked[t.is_activated[self.tracked]]
         # Step 2: First association, with high score detection boxes
-        strack_pool = self.joint_stracks(tracked_stracks, self.lost_stracks)
+        pool = self.joint_tracks(tracked, self.lost)
         # Predict the current location with KF
-        self.multi_predict(strack_pool)
+        self.multi_predict(pool)
         if hasattr(self, "gmc") and img is not None:
-            warp = self.gmc.apply(img, dets)
-            STrack.multi_gmc(strack_pool, warp)
-            STrack.multi_gmc(unconfirmed, warp)
+            warp = self.gmc.apply(img, xywh2xyxy(detections["boxes"][:, :4]))
+            self.multi_gmc(pool, warp)
+            self.multi_gmc(unconfirmed, warp)
 
-        dists = self.get_dists(strack_pool, detections)
+        dists = self.get_dists(pool, detections)
         matches, u_track, u_detection = matching.linear_assignment(dists, thresh=self.args.match_thresh)
+        matches = np.asarray(matches, dtype=np.int64).reshape(-1, 2)
+        matched = pool[matches[:, 0]]
+        refind = t.state[matched] != TrackState.Tracked
+        self.update_tracks(matched, detections, matches[:, 1], refind)
+        activated, refound = [matched[~refind]], [matched[refind]]
 
-        for itracked, idet in matches:
-            track = strack_pool[itracked]
-            det = detections[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
         # Step 3: Second association, with low score detection boxes association the untrack to the low score detections
-        detections_second = self.init_track(dets_second, scores_second, cls_second, img)
-        r_tracked_stracks = [strack_pool[i] for i in u_track if strack_pool[i].state == TrackState.Tracked]
-        # TODO
-        dists = matching.iou_distance(r_tracked_stracks, detections_second)
-        matches, u_track, u_detection_second = matching.linear_assignment(dists, thresh=0.5)
-        for itracked, idet in matches:
-            track = r_tracked_stracks[itracked]
-            det = detections_second[idet]
-            if track.state == TrackState.Tracked:
-                track.update(det, self.frame_id)
-                activated_stracks.append(track)
-            else:
-                track.re_activate(det, self.frame_id, new_id=False)
-                refind_stracks.append(track)
-
-        for it in u_track:
-            track = r_tracked_stracks[it]
-            if track.state != TrackState.Lost:
-                track.mark_lost()
-                lost_stracks.append(track)
+        r_tracked = pool[np.asarray(u_track, dtype=np.int64)]
+        r_tracked = r_tracked[t.state[r_tracked] == TrackState.Tracked]
+        dists = matching.iou_distance(self.get_boxes(r_tracked), self.iou_boxes(detections_second["boxes"]))
+        matches, u_track, _ = matching.linear_assignment(dists, thresh=0.5)
+        matches = np.asarray(matches, dtype=np.int64).reshape(-1, 2)
+        matched = r_tracked[matches[:, 0]]
+        self.update_tracks(matched, detections_second, matches[:, 1], np.zeros(len(matched), dtype=bool))
+        activated.append(matched)
+
+        lost = r_tracked[np.asarray(u_track, dtype=np.int64)]
+        t.state[lost] = TrackState.Lost
         # Deal with unconfirmed tracks, usually tracks with only one beginning frame
-        detections = [detections[i] for i in u_detection]
+        detections = {k: v[np.asarray(u_detection, dtype=np.int64)] for k, v in detections.items()}
         dists = self.get_dists(unconfirmed, detections)
         matches, u_unconfirmed, u_detection = matching.linear_assignment(dists, thresh=0.7)
-        for itracked, idet in matches:
-            unconfirmed[itracked].update(detections[idet], self.frame_id)
-            activated_stracks.append(unconfirmed[itracked])
-        for it in u_unconfirmed:
-            track = unconfirmed[it]
-            track.mark_removed()
-            removed_stracks.append(track)
-        # Step 4: Init new stracks
-        for inew in u_detection:
-            track = detections[inew]
-            if track.score < self.args.new_track_thresh:
-                continue
-            track.activate(self.kalman_filter, self.frame_id)
-            activated_stracks.append(track)
+        matches = np.asarray(matches, dtype=np.int64).reshape(-1, 2)
+        matched = unconfirmed[matches[:, 0]]
+        self.update_tracks(matched, detections, matches[:, 1], np.zeros(len(matched), dtype=bool))
+        activated.append(matched)
+        t.state[unconfirmed[np.asarray(u_unconfirmed, dtype=np.int64)]] = TrackState.Removed
+        # Step 4: Init new tracks
+        u_detection = np.asarray(u_detection, dtype=np.int64)
+        activated.append(
+            self.activate_tracks(
+                detections, u_detection[detections["score"][u_detection] >= self.args.new_track_thresh]
+            )
+        )
         # Step 5: Update state
-        for track in self.lost_stracks:
-            if self.frame_id - track.end_frame > self.max_time_lost:
-                track.mark_removed()
-                removed_stracks.append(track)
-
-        self.tracked_stracks = [t for t in self.tracked_stracks if t.state == TrackState.Tracked]
-        self.tracked_stracks = self.joint_stracks(self.tracked_stracks, activated_stracks)
-        self.tracked_stracks = self.joint_stracks(self.tracked_stracks, refind_stracks)
-        self.lost_stracks = self.sub_stracks(self.lost_stracks, self.tracked_stracks)
-        self.lost_stracks.extend(lost_stracks)
-        self.lost_stracks = self.sub_stracks(self.lost_stracks, self.removed_stracks)
-        self.tracked_stracks, self.lost_stracks = self.remove_duplicate_stracks(self.tracked_stracks, self.lost_stracks)
-        self.removed_stracks.extend(removed_stracks)
-        if len(self.removed_stracks) > 1000:
-            self.removed_stracks = self.removed_stracks[-999:]  # clip remove stracks to 1000 maximum
-
-        return np.asarray([x.result for x in self.tracked_stracks if x.is_activated], dtype=np.float32)
+        t.state[self.lost[self.frame_id - t.frame_id[self.lost] > self.max_time_lost]] = TrackState.Removed
+
+        tracked = self.tracked[t.state[self.tracked] == TrackState.Tracked]
+        tracked = self.joint_tracks(tracked, np.concatenate(activated))
+        tracked = self.joint_tracks(tracked, np.concatenate(refound))
+        lost = np.concatenate([self.sub_tracks(self.lost, tracked), lost])
+        lost = lost[t.state[lost] != TrackState.Removed]
+        self.tracked, self.lost = self.remove_duplicate_tracks(tracked, lost)
+        keep = np.zeros_like(t.alive)
+        keep[self.tracked] = keep[self.lost] = True
+        t.release(t.alive & ~keep)  # removed tracks and dropped duplicates
+
+        out = self.tracked[t.is_activated[self.tracked]]
+        return np.concatenate(
+            [self.get_boxes(out), np.stack([t.track_id[out], t.score[out], t.cls[out], t.idx[out]], 1)],
+            1,
+            dtype=np.float32,
+        )
 
     def get_kalmanfilter(self):
         """Returns a Kalman filter object for tracking bounding boxes using KalmanFilterXYAH."""
         return KalmanFilterXYAH()
 
     def init_track(self, dets, scores, cls, img=None):
-        """Initializes object tracking with given detections, scores, and class labels using the STrack algorithm."""
-        return [STrack(xyxy, s, c) for (xyxy, s, c) in zip(dets, scores, cls)] if len(dets) else []  # detections
+        """
+        Initialize detections for association.
+
+        Args:
+            dets (np.ndarray): Detection boxes in xywh or xywhr format, shape (N, 4) or (N, 5).
+            scores (np.ndarray): Detection confidence scores, shape (N,).
+            cls (np.ndarray): Detection class labels, shape (N,).
+            img (np.ndarray, optional): Current frame, for subclasses that initialize detections from the image.
+
+        Returns:
+            (Dict[str, np.ndarray]): Detection 'boxes', 'score' and 'cls' arrays. `update()` adds the (N, D) 'feat'
+                appearance features when they are passed to it.
+        """
+        return {"boxes": dets, "score": scores, "cls": cls}
 
     def get_dists(self, tracks, detections):
         """Calculates the distance between tracks and detections using IoU and optionally fuses scores."""
-        dists = matching.iou_distance(tracks, detections)
+        dists = matching.iou_distance(self.get_boxes(tracks), self.iou_boxes(detections["boxes"]))
         if self.args.fuse_score:
-            dists = matching.fuse_score(dists, detections)
+            dists = matching.fuse_score(dists, detections["score"])
         return dists
 
+    def update_tracks(self, tracks, detections, inds, refind):
+        """
+        Update matched tracks with their detections, re-activating the 'refind' lost ones.
+
+        Args:
+            tracks (np.ndarray): Track slots of shape (N,).
+            detections (Dict[str, np.ndarray]): Detections from `init_track()` with their frame indices 'idx'.
+            inds (np.ndarray): Index of the detection matched to each track, shape (N,).
+            refind (np.ndarray): Whether each track is re-activated from a lost state, shape (N,).
+        """
+        t = self.table
+        measurements = self.convert_coords(detections["boxes"][inds, :4])
+        t.mean[tracks], t.covariance[tracks] = self.kalman_filter.multi_update(
+            t.mean[tracks], t.covariance[tracks], measurements
+        )
+        t.tracklet_len[tracks] = np.where(refind, 0, t.tracklet_len[tracks] + 1)
+        t.state[tracks] = TrackState.Tracked
+        t.is_activated[tracks] = True
+        t.frame_id[tracks] = self.frame_id
+        self._set_detections(tracks, detections, inds)
+
+    def activate_tracks(self, detections, inds):
+        """
+        Start new tracks from unmatched detections.
+
+        Args:
+            detections (Dict[str, np.ndarray]): Detections from `init_track()` with their frame indices 'idx'.
+            inds (np.ndarray): Indices of the detections to start tracks from.
+
+        Returns:
+            (np.ndarray): Slots of the new tracks.
+        """
+        t = self.table
+        tracks = t.add(len(inds))
+        for i, m in zip(tracks, self.convert_coords(detections["boxes"][inds, :4])):
+            t.mean[i], t.covariance[i] = self.kalman_filter.initiate(m)
+        t.track_id[tracks] = BaseTrack.next_ids(len(tracks))
+        t.state[tracks] = TrackState.Tracked
+        t.is_activated[tracks] = self.frame_id == 1
+        t.frame_id[tracks] = t.start_frame[tracks] = self.frame_id
+        self._set_detections(tracks, detections, inds)
+        return tracks
+
+    def _set_detections(self, tracks, detections, inds):
+        """Copy the score, class, index, angle and features of matched detections to their tracks."""
+        t = self.table
+        t.score[tracks] = detections["score"][inds]
+        t.cls[tracks] = detections["cls"][inds]
+        t.idx[tracks] = detections["idx"][inds]
+        t.angle[tracks] = detections["boxes"][inds, 4] if detections["boxes"].shape[1] == 5 else np.nan
+        if detections.get("feat") is not None and len(tracks):
+            t.update_features(tracks, detections["feat"][inds])
+
     def multi_predict(self, tracks):
         """Predict the next states for multiple tracks using Kalman filter."""
-        STrack.multi_predict(tracks)
+        if len(tracks):
+            t = self.table
+            mean = t.mean[tracks]
+            mean[t.state[tracks] != TrackState.Tracked, 7] = 0
+            t.mean[tracks], t.covariance[tracks] = self.kalman_filter.multi_predict(mean, t.covariance[tracks])
+
+    def multi_gmc(self, tracks, H=np.eye(2, 3)):
+        """Update track positions and covariances using a homography matrix."""
+        if len(tracks):
+            t = self.table
+            R8x8 = np.kron(np.eye(4, dtype=float), H[:2, :2])
+            t.mean[tracks] = t.mean[tracks] @ R8x8.T
+            t.mean[tracks, :2] += H[:2, 2]
+            t.covariance[tracks] = R8x8 @ t.covariance[tracks] @ R8x8.T
+
+    @staticmethod
+    def convert_coords(xywh):
+        """Convert (N, 4) xywh boxes to x-y-aspect-height Kalman measurements."""
+        xyah = np.asarray(xywh, dtype=np.float32).copy()
+        xyah[:, 2] /= xyah[:, 3]
+        return xyah
+
+    def get_xywh(self, tracks):
+        """Return the (N, 4) xywh boxes of tracks from their x-y-aspect-height Kalman states."""
+        xywh = self.table.mean[tracks, :4].copy()
+        xywh[:, 2] *= xywh[:, 3]
+        return xywh
+
+    def get_boxes(self, tracks):
+        """Return track boxes as (N, 4) xyxy, or (N, 5) xywha for tracks of oriented boxes."""
+        xywh, angle = self.get_xywh(tracks), self.table.angle[tracks]
+        return self.iou_boxes(np.concatenate([xywh, angle[:, None]], 1) if np.isfinite(angle).all() else xywh)
+
+    @staticmethod
+    def iou_boxes(boxes):
+        """Convert (N, 4) xywh boxes to xyxy for IoU matching, leaving (N, 5) xywha oriented boxes as they are."""
+        return xywh2xyxy(boxes) if boxes.shape[1] == 4 else boxes
 
     @staticmethod
     def reset_id():
-        """Resets the ID counter for STrack instances to ensure unique track IDs across tracking sessions."""
-        STrack.reset_id()
+        """Resets the track ID counter to ensure unique track IDs across tracking sessions."""
+        BaseTrack.reset_id()
 
     def reset(self):
         """Resets the tracker by clearing all tracked, lost, and removed tracks and reinitializing the Kalman filter."""
-        self.tracked_stracks = []  # type: list[STrack]
-        self.lost_stracks = []  # type: list[STrack]
-        self.removed_stracks = []  # type: list[STrack]
+        self.table = TrackTable()
+        self.tracked = np.empty(0, dtype=np.int64)
+        self.lost = np.empty(0, dtype=np.int64)
         self.frame_id = 0
         self.kalman_filter = self.get_kalmanfilter()
         self.reset_id()
 
     @staticmethod
-    def joint_stracks(tlista, tlistb):
-        """Combines two lists of STrack objects into a single list, ensuring no duplicates based on track IDs."""
-        exists = {}
-        res = []
-        for t in tlista:
-            exists[t.track_id] = 1
-            res.append(t)
-        for t in tlistb:
-            tid = t.track_id
-            if not exists.get(tid, 0):
-                exists[tid] = 1
-                res.append(t)
-        return res
-
-    @staticmethod
-    def sub_stracks(tlista, tlistb):
-        """Filters out the stracks present in the second list from the first list."""
-        track_ids_b = {t.track_id for t in tlistb}
-        return [t for t in tlista if t.track_id not in track_ids_b]
+    def joint_tracks(a, b):
+        """Combines two arrays of track slots into one, keeping the order and skipping slots of 'b' already in 'a'."""
+        return np.concatenate([a, b[~np.isin(b, a)]])
 
     @staticmethod
-    def remove_duplicate_stracks(stracksa, stracksb):
-        """Removes duplicate stracks from two lists based on Intersection over Union (IoU) distance."""
-        pdist = matching.iou_distance(stracksa, stracksb)
-        pairs = np.where(pdist < 0.15)
-        dupa, dupb = [], []
-        for p, q in zip(*pairs):
-            timep = stracksa[p].frame_id - stracksa[p].start_frame
-            timeq = stracksb[q].frame_id - stracksb[q].start_frame
-            if timep > timeq:
-                dupb.append(q)
-            else:
-                dupa.append(p)
-        resa = [t for i, t in enumerate(stracksa) if i not in dupa]
-        resb = [t for i, t in enumerate(stracksb) if i not in dupb]
-        return resa, resb
+    def sub_tracks(a, b):
+        """Filters out the track slots present in 'b' from 'a'."""
+        return a[~np.isin(a, b)]
+
+    def remove_duplicate_tracks(self, a, b):
+        """Removes duplicate tracks from two arrays of slots based on IoU, keeping the longer-lived track of a pair."""
+        t = self.table
+        p, q = np.nonzero(matching.iou_distance(self.get_boxes(a), self.get_boxes(b)) < 0.15)
+        older = (t.frame_id[a[p]] - t.start_frame[a[p]]) > (t.frame_id[b[q]] - t.start_frame[b[q]])
+        return np.delete(a, p[~older]), np.delete(b, q[older])
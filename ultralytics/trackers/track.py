@@ -1,20 +1,133 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+from collections import deque
 from functools import partial
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
 import torch
 
-from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.utils import LOGGER, NUM_THREADS, IterableSimpleNamespace, yaml_load
 from ultralytics.utils.checks import check_yaml
 
 from .bot_sort import BOTSORT
 from .byte_tracker import BYTETracker
+from .utils.reid import roi_embeddings
 
 # A mapping of tracker types to corresponding tracker classes
 TRACKER_MAP = {"bytetrack": BYTETracker, "botsort": BOTSORT}
 
 
+class MultiStreamTracker:
+    """
+    Manage one tracker per stream and update the trackers of all streams in a batch in parallel.
+
+    Frames of the same stream are applied to its tracker in batch order, resetting the tracker when the stream moves to
+    a new video. Different streams are independent, so their updates run concurrently in a thread pool, where GMC
+    (OpenCV) and the larger NumPy operations of the trackers release the GIL.
+
+    Attributes:
+        trackers (List[BYTETracker | BOTSORT]): Trackers indexed by stream.
+        vid_path (List[Path | None]): Last video path seen by each tracker, to reset trackers on new videos.
+        gmc_async (bool): Whether `prefetch()` starts the GMC of frames in the background.
+
+    Methods:
+        prefetch: Start the GMC of a batch of frames in the background before detection.
+        update: Update the trackers of a batch of frames.
+
+    Examples:
+        >>> cfg = IterableSimpleNamespace(**yaml_load(check_yaml("bytetrack.yaml")))
+        >>> tracker = MultiStreamTracker(cfg, streams=4)
+        >>> tracks = tracker.update(dets, imgs, stream_ids=[0, 2], paths=["a.mp4", "b.mp4"])
+    """
+
+    def __init__(self, cfg, streams=1, frame_rate=30):
+        """
+        Initialize a tracker for each stream.
+
+        Args:
+            cfg (IterableSimpleNamespace): Tracker configuration with a 'tracker_type' of 'bytetrack' or 'botsort'.
+            streams (int): Number of streams.
+            frame_rate (int): Frame rate of the streams.
+        """
+        self.trackers = [TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=frame_rate) for _ in range(streams)]
+        self.vid_path = [None] * streams
+        self.gmc_async = bool(getattr(cfg, "gmc_async", False))
+        self._pool = None  # thread pool for updating streams in parallel, created on first use
+
+    def __len__(self):
+        """Return the number of streams."""
+        return len(self.trackers)
+
+    def __getitem__(self, i):
+        """Return the tracker of stream 'i'."""
+        return self.trackers[i]
+
+    def prefetch(self, imgs, stream_ids):
+        """
+        Start the GMC of a batch of frames in background threads, to overlap it with the detector.
+
+        The frames of each stream are submitted in batch order, as GMC depends on the stream's previous frame. With
+        `pipeline=True` this is called from the preprocess stage, so batches preprocessed ahead queue their frames
+        behind those not yet tracked. Does nothing unless `gmc_async` is enabled and the trackers use GMC.
+
+        Args:
+            imgs (List[np.ndarray]): Original images of each frame.
+            stream_ids (List[int]): Stream index of each frame.
+        """
+        if not self.gmc_async:
+            return
+        for img, j in zip(imgs, stream_ids):
+            gmc = getattr(self.trackers[j], "gmc", None)
+            if gmc is not None:
+                gmc.submit(img)
+
+    def update(self, dets, imgs, stream_ids, paths=None, feats=None):
+        """
+        Update the trackers of a batch of frames, running different streams in parallel.
+
+        Args:
+            dets (List[Boxes | OBB]): Detections of each frame as NumPy-backed results.
+            imgs (List[np.ndarray]): Original images of each frame.
+            stream_ids (List[int]): Stream index of each frame.
+            paths (List[Path] | None): Video path of each frame. A stream's tracker is reset before a frame whose path
+                differs from the stream's previous one. If None, trackers persist across videos.
+            feats (List[np.ndarray] | None): Appearance features of the detections of each frame, shape (N, D).
+
+        Returns:
+            (List[np.ndarray | None]): Tracks of each frame from the tracker's `update()`, or None for frames without
+                detections.
+        """
+        groups = {}  # stream: frame indices in batch order
+        for i, j in enumerate(stream_ids):
+            groups.setdefault(j, []).append(i)
+
+        def run(j):
+            """Apply the frames of stream 'j' to its tracker in order."""
+            tracker, tracks = self.trackers[j], []
+            for i in groups[j]:
+                if paths is not None and self.vid_path[j] != paths[i]:
+                    tracker.reset()
+                    self.vid_path[j] = paths[i]
+                feat = None if feats is None else feats[i]
+                tracks.append((i, tracker.update(dets[i], imgs[i], feat) if len(dets[i]) else None))
+                if not len(dets[i]) and self.gmc_async and getattr(tracker, "gmc", None) is not None:
+                    tracker.gmc.apply(imgs[i])  # consume the frame's prefetched GMC, as frames must be applied in order
+            return tracks
+
+        if len(groups) > 1 and NUM_THREADS > 1:
+            if self._pool is None:
+                self._pool = ThreadPool(min(NUM_THREADS, len(self.trackers)))
+            outputs = self._pool.map(run, groups)
+        else:
+            outputs = map(run, groups)
+        tracks = [None] * len(dets)
+        for output in outputs:
+            for i, x in output:
+                tracks[i] = x
+        return tracks
+
+
 def on_predict_start(predictor: object, persist: bool = False) -> None:
     """
     Initialize trackers for object tracking during prediction.
@@ -36,6 +149,7 @@ def on_predict_start(predictor: object, persist: bool = False) -> None:
         raise ValueError("❌ Classification doesn't support 'mode=track'")
 
     if hasattr(predictor, "trackers") and persist:
+        _register_feats_hook(predictor)
         return
 
     tracker = check_yaml(predictor.args.tracker)
@@ -44,20 +158,63 @@ def on_predict_start(predictor: object, persist: bool = False) -> None:
     if cfg.tracker_type not in {"bytetrack", "botsort"}:
         raise AssertionError(f"Only 'bytetrack' and 'botsort' are supported for now, but got '{cfg.tracker_type}'")
 
-    trackers = []
-    for _ in range(predictor.dataset.bs):
-        tracker = TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=30)
-        trackers.append(tracker)
-        if predictor.dataset.mode != "stream":  # only need one tracker for other modes
-            break
-    predictor.trackers = trackers
-    predictor.vid_path = [None] * predictor.dataset.bs  # for determining when to reset tracker on new video
+    streams = predictor.dataset.bs if predictor.dataset.mode == "stream" else 1  # only need one tracker otherwise
+    predictor.trackers = MultiStreamTracker(cfg, streams=streams, frame_rate=30)
+    _register_feats_hook(predictor)
+
+
+def _register_feats_hook(predictor: object) -> None:
+    """
+    Capture the feature maps input to the detection head of each batch, to pool ReID embeddings of BoT-SORT from them.
+
+    The maps are queued by a forward pre-hook, so batches inferred ahead in `pipeline=True` mode keep their own maps
+    until they are postprocessed. Does nothing unless the trackers use ReID.
+    """
+    from ultralytics.nn.modules.head import Detect
+
+    predictor._feats = deque()  # feature maps of inferred batches that were not postprocessed yet
+    tracker = predictor.trackers[0]
+    if getattr(predictor, "_feats_hook", None) or not (isinstance(tracker, BOTSORT) and tracker.args.with_reid):
+        return
+    head = predictor.model.model.model[-1] if predictor.model.pt else None
+    if not isinstance(head, Detect) or predictor.args.augment:
+        LOGGER.warning(
+            "WARNING ⚠️ 'with_reid' pools appearance features from PyTorch detection models without 'augment' only, "
+            "tracking without them."
+        )
+        return
+    predictor._feats_strides = head.stride.tolist()
+    predictor._feats_hook = head.register_forward_pre_hook(lambda m, x: predictor._feats.append(list(x[0])))
+
+
+def _stream_ids(predictor: object) -> list:
+    """Return the tracker index of each frame in the predictor's current batch."""
+    is_stream = predictor.dataset.mode == "stream"
+    stream_ids = predictor.stream_ids or range(len(predictor.batch[1]))  # partial stream batches
+    return [j if is_stream else 0 for j in stream_ids]
+
+
+def on_predict_batch_start(predictor: object, persist: bool = False) -> None:
+    """
+    Start the motion compensation of the batch's frames in the background while the detector runs.
+
+    With `pipeline=True` the predictor runs this callback in its preprocess stage, ahead of inference.
+
+    Args:
+        predictor (object): The predictor object holding the current batch.
+        persist (bool): Whether to persist the trackers if they already exist.
+    """
+    predictor.trackers.prefetch(predictor.batch[1], _stream_ids(predictor))
 
 
 def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None:
     """
     Postprocess detected boxes and update with object tracking.
 
+    The trackers of different streams in the batch are updated in parallel. With `pipeline=True` this runs on the
+    calling thread while the following batches are decoded, preprocessed and inferred in the background. With ReID,
+    the appearance features of the detections are pooled from the batch's detection head inputs with ROI-align.
+
     Args:
         predictor (object): The predictor object containing the predictions.
         persist (bool): Whether to persist the trackers if they already exist.
@@ -68,20 +225,21 @@ def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None
         >>> on_predict_postprocess_end(predictor, persist=True)
     """
     is_obb = predictor.args.task == "obb"
-    is_stream = predictor.dataset.mode == "stream"
-    for i, result in enumerate(predictor.results):
-        tracker = predictor.trackers[i if is_stream else 0]
-        vid_path = predictor.save_dir / Path(result.path).name
-        if not persist and predictor.vid_path[i if is_stream else 0] != vid_path:
-            tracker.reset()
-            predictor.vid_path[i if is_stream else 0] = vid_path
-
-        det = (result.obb if is_obb else result.boxes).cpu().numpy()
-        if len(det) == 0:
-            continue
-        tracks = tracker.update(det, result.orig_img)
-        if len(tracks) == 0:
+    stream_ids = _stream_ids(predictor)
+    dets = [(result.obb if is_obb else result.boxes).cpu().numpy() for result in predictor.results]
+    imgs = [result.orig_img for result in predictor.results]
+    paths = None if persist else [predictor.save_dir / Path(result.path).name for result in predictor.results]
+    feats = None
+    if getattr(predictor, "_feats_hook", None) and predictor._feats:
+        maps = predictor._feats.popleft()
+        if not predictor.slices:  # boxes of sliced inference are not in the coordinates of a single model input
+            shapes = [result.orig_shape for result in predictor.results]
+            boxes = [det.xyxy for det in dets]
+            feats = roi_embeddings(maps, predictor._feats_strides, boxes, shapes, predictor.ratio_pad)
+    for i, tracks in enumerate(predictor.trackers.update(dets, imgs, stream_ids, paths, feats)):
+        if tracks is None or len(tracks) == 0:
             continue
+        result = predictor.results[i]
         idx = tracks[:, -1].astype(int)
         predictor.results[i] = result[idx]
 
@@ -103,4 +261,5 @@ def register_tracker(model: object, persist: bool) -> None:
         >>> register_tracker(model, persist=True)
     """
     model.add_callback("on_predict_start", partial(on_predict_start, persist=persist))
+    model.add_callback("on_predict_batch_start", partial(on_predict_batch_start, persist=persist))
     model.add_callback("on_predict_postprocess_end", partial(on_predict_postprocess_end, persist=persist))
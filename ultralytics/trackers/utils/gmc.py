@@ -1,6 +1,10 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import copy
+import threading
+import time
+from collections import deque
+from multiprocessing.pool import ThreadPool
 
 import cv2
 import numpy as np
@@ -15,19 +19,28 @@ class GMC:
     This class provides methods for tracking and detecting objects based on several tracking algorithms including ORB,
     SIFT, ECC, and Sparse Optical Flow. It also supports downscaling of frames for computational efficiency.
 
+    The 'klt' method tracks Sparse Optical Flow keypoints across frames instead of detecting them anew every frame. It
+    keeps the RANSAC inliers of each frame and detects new keypoints only in grid cells whose count dropped below half
+    of their share, skipping the frame border and detection boxes. Frames can also be submitted ahead of `apply()` to
+    compute their motion in a background thread while the detector runs, several frames deep if needed.
+
     Attributes:
-        method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
+        method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'klt', 'none'.
         downscale (int): Factor by which to downscale the frames for processing.
         prevFrame (np.ndarray): Previous frame for tracking.
         prevKeyPoints (List): Keypoints from the previous frame.
         prevDescriptors (np.ndarray): Descriptors from the previous frame.
         initializedFirstFrame (bool): Flag indicating if the first frame has been processed.
+        times (dict): Milliseconds spent in each stage of the method for the last frame, and in 'total'. 'wait' holds
+            the time `apply()` waited for a frame submitted ahead.
 
     Methods:
         apply: Apply the chosen method to a raw frame and optionally use provided detections.
+        submit: Start computing the motion of the next frame in a background thread.
         apply_ecc: Apply the ECC algorithm to a raw frame.
         apply_features: Apply feature-based methods like ORB or SIFT to a raw frame.
         apply_sparseoptflow: Apply the Sparse Optical Flow method to a raw frame.
+        apply_klt: Apply Sparse Optical Flow with keypoints tracked across frames to a raw frame.
         reset_params: Reset the internal parameters of the GMC object.
 
     Examples:
@@ -45,7 +58,8 @@ class GMC:
         Initialize a Generalized Motion Compensation (GMC) object with tracking method and downscale factor.
 
         Args:
-            method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
+            method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'klt',
+                'none'.
             downscale (int): Downscale factor for processing frames.
 
         Examples:
@@ -78,6 +92,12 @@ class GMC:
                 maxCorners=1000, qualityLevel=0.01, minDistance=1, blockSize=3, useHarrisDetector=False, k=0.04
             )
 
+        elif self.method == "klt":
+            self.feature_params = dict(
+                maxCorners=400, qualityLevel=0.01, minDistance=5, blockSize=3, useHarrisDetector=False, k=0.04
+            )
+            self.grid = 4  # keypoints are replenished per cell of a grid x grid partition of the frame
+
         elif self.method in {"none", "None", None}:
             self.method = None
         else:
@@ -87,14 +107,26 @@ class GMC:
         self.prevKeyPoints = None
         self.prevDescriptors = None
         self.initializedFirstFrame = False
+        self.times = {}
+        self._times = {}  # stage times of the frame being processed, which may run ahead in the background thread
+        self._t = 0.0  # end time of the last recorded stage
+        self._detections = None  # detections of the last applied frame, to mask frames submitted ahead
+        self._pending = deque()  # (frame, AsyncResult) of frames submitted ahead, in submission order
+        self._lock = threading.Lock()  # guards _pending, as frames may be submitted from another thread
+        self._pool = None  # background thread for frames submitted ahead, created on first use
 
     def apply(self, raw_frame: np.ndarray, detections: list = None) -> np.ndarray:
         """
         Apply object detection on a raw frame using the specified method.
 
+        If the frame was submitted ahead with `submit()`, its background result is returned instead. A frame that was
+        not submitted is computed after those submitted ahead, which are then computed again after it to keep them in
+        order.
+
         Args:
             raw_frame (np.ndarray): The raw frame to be processed, with shape (H, W, C).
-            detections (List | None): List of detections to be used in the processing.
+            detections (List | None): List of detections to be used in the processing, as (N, 4+) arrays of xyxy
+                boxes in raw frame pixels. Their areas are excluded from keypoint detection.
 
         Returns:
             (np.ndarray): Transformation matrix with shape (2, 3).
@@ -106,14 +138,75 @@ class GMC:
             >>> print(transformation_matrix.shape)
             (2, 3)
         """
+        with self._lock:
+            self._detections = detections
+            n = next((i + 1 for i, (frame, _) in enumerate(self._pending) if frame is raw_frame), 0)
+            results = [self._pending.popleft()[1] for _ in range(n)]
+            if not results:
+                later = [frame for frame, _ in self._pending]  # submitted after this frame, computed again after it
+                self._pending.clear()
+                if self._pool is None:
+                    H, self.times = self._apply(raw_frame, detections)
+                else:  # queue behind frames still running in the background thread instead of racing them
+                    H, self.times = self._pool.apply(self._apply, (raw_frame, detections))
+                for frame in later:
+                    self._enqueue(frame)
+                return H
+        t = time.perf_counter()
+        H, times = results[-1].get()  # the background thread processes frames in order
+        times["wait"] = (time.perf_counter() - t) * 1e3
+        self.times = times
+        return H
+
+    def submit(self, raw_frame: np.ndarray) -> None:
+        """
+        Start computing the motion of a future frame in a background thread, before its detections are available.
+
+        Frames are processed in submission order, so several frames may be submitted ahead and applied later in the
+        same order. The `apply()` call with the same frame waits for and returns its result. Keypoints are masked with
+        the detections of the last applied frame. This method may be called from a different thread than `apply()`.
+
+        Args:
+            raw_frame (np.ndarray): The next raw frame to be processed, with shape (H, W, C).
+
+        Examples:
+            >>> gmc = GMC(method="klt")
+            >>> gmc.submit(frame)  # runs while the detector processes the frame
+            >>> H = gmc.apply(frame, detections)
+        """
+        if self.method is None:
+            return
+        with self._lock:
+            self._enqueue(raw_frame)
+
+    def _enqueue(self, raw_frame):
+        """Queue a frame in the background thread, masked with the last detections. The caller must hold the lock."""
+        if self._pool is None:
+            self._pool = ThreadPool(1)
+        self._pending.append((raw_frame, self._pool.apply_async(self._apply, (raw_frame, self._detections))))
+
+    def _apply(self, raw_frame, detections=None):
+        """Apply the chosen method to a raw frame, returning the transformation matrix and the frame's stage times."""
+        t0 = self._t = time.perf_counter()
+        times = self._times = {}
         if self.method in {"orb", "sift"}:
-            return self.apply_features(raw_frame, detections)
+            H = self.apply_features(raw_frame, detections)
         elif self.method == "ecc":
-            return self.apply_ecc(raw_frame)
+            H = self.apply_ecc(raw_frame)
         elif self.method == "sparseOptFlow":
-            return self.apply_sparseoptflow(raw_frame)
+            H = self.apply_sparseoptflow(raw_frame)
+        elif self.method == "klt":
+            H = self.apply_klt(raw_frame, detections)
         else:
-            return np.eye(2, 3)
+            H = np.eye(2, 3)
+        times["total"] = (time.perf_counter() - t0) * 1e3
+        return H, times
+
+    def _lap(self, stage):
+        """Record the milliseconds since the previous stage as the time of 'stage' for the current frame."""
+        t = time.perf_counter()
+        self._times[stage] = (t - self._t) * 1e3
+        self._t = t
 
     def apply_ecc(self, raw_frame: np.ndarray) -> np.ndarray:
         """
@@ -140,6 +233,7 @@ class GMC:
         if self.downscale > 1.0:
             frame = cv2.GaussianBlur(frame, (3, 3), 1.5)
             frame = cv2.resize(frame, (width // self.downscale, height // self.downscale))
+        self._lap("preprocess")
 
         # Handle first frame
         if not self.initializedFirstFrame:
@@ -157,6 +251,7 @@ class GMC:
             (_, H) = cv2.findTransformECC(self.prevFrame, frame, H, self.warp_mode, self.criteria, None, 1)
         except Exception as e:
             LOGGER.warning(f"WARNING: find transform failed. Set warp as identity {e}")
+        self._lap("ecc")
 
         return H
 
@@ -187,6 +282,7 @@ class GMC:
             frame = cv2.resize(frame, (width // self.downscale, height // self.downscale))
             width = width // self.downscale
             height = height // self.downscale
+        self._lap("preprocess")
 
         # Find the keypoints
         mask = np.zeros_like(frame)
@@ -200,6 +296,7 @@ class GMC:
 
         # Compute the descriptors
         keypoints, descriptors = self.extractor.compute(frame, keypoints)
+        self._lap("detect")
 
         # Handle first frame
         if not self.initializedFirstFrame:
@@ -263,6 +360,7 @@ class GMC:
 
         prevPoints = np.array(prevPoints)
         currPoints = np.array(currPoints)
+        self._lap("match")
 
         # Draw the keypoint matches on the output image
         # if False:
@@ -295,6 +393,7 @@ class GMC:
                 H[1, 2] *= self.downscale
         else:
             LOGGER.warning("WARNING: not enough matching points")
+        self._lap("estimate")
 
         # Store to next iteration
         self.prevFrame = frame.copy()
@@ -327,9 +426,11 @@ class GMC:
         # Downscale image
         if self.downscale > 1.0:
             frame = cv2.resize(frame, (width // self.downscale, height // self.downscale))
+        self._lap("preprocess")
 
         # Find the keypoints
         keypoints = cv2.goodFeaturesToTrack(frame, mask=None, **self.feature_params)
+        self._lap("detect")
 
         # Handle first frame
         if not self.initializedFirstFrame or self.prevKeyPoints is None:
@@ -352,6 +453,7 @@ class GMC:
 
         prevPoints = np.array(prevPoints)
         currPoints = np.array(currPoints)
+        self._lap("flow")
 
         # Find rigid matrix
         if (prevPoints.shape[0] > 4) and (prevPoints.shape[0] == currPoints.shape[0]):
@@ -362,15 +464,121 @@ class GMC:
                 H[1, 2] *= self.downscale
         else:
             LOGGER.warning("WARNING: not enough matching points")
+        self._lap("estimate")
 
         self.prevFrame = frame.copy()
         self.prevKeyPoints = copy.copy(keypoints)
 
         return H
 
+    def apply_klt(self, raw_frame: np.ndarray, detections: list = None) -> np.ndarray:
+        """
+        Apply Sparse Optical Flow to a raw frame, tracking keypoints across frames and replenishing them per grid cell.
+
+        Keypoints of the previous frame are tracked into this frame with pyramidal Lucas-Kanade. The RANSAC inliers of
+        the estimated motion are kept for the next frame, which drops keypoints on moving objects. New keypoints are
+        detected only in grid cells whose count fell below half of their share of `maxCorners`, running the detector on
+        those cells alone with the frame border and detection boxes masked out.
+
+        Args:
+            raw_frame (np.ndarray): The raw frame to be processed, with shape (H, W, C).
+            detections (List | None): Detections as (N, 4+) arrays of xyxy boxes in raw frame pixels, to be excluded
+                from keypoint detection.
+
+        Returns:
+            (np.ndarray): Transformation matrix with shape (2, 3).
+
+        Examples:
+            >>> gmc = GMC(method="klt")
+            >>> raw_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+            >>> H = gmc.apply_klt(raw_frame, detections=np.array([[100, 100, 200, 300]]))
+            >>> print(H.shape)
+            (2, 3)
+        """
+        height, width, _ = raw_frame.shape
+        frame = cv2.cvtColor(raw_frame, cv2.COLOR_BGR2GRAY)
+        H = np.eye(2, 3)
+
+        # Downscale image
+        if self.downscale > 1.0:
+            frame = cv2.resize(frame, (width // self.downscale, height // self.downscale))
+            width = width // self.downscale
+            height = height // self.downscale
+
+        # Mask the border and detections
+        mask = np.zeros_like(frame)
+        mask[int(0.02 * height) : int(0.98 * height), int(0.02 * width) : int(0.98 * width)] = 255
+        if detections is not None:
+            for det in detections:
+                tlbr = (np.asarray(det[:4]) / self.downscale).astype(np.int_).clip(0)
+                mask[tlbr[1] : tlbr[3], tlbr[0] : tlbr[2]] = 0
+        self._lap("preprocess")
+
+        keypoints = np.zeros((0, 1, 2), dtype=np.float32)
+        if self.initializedFirstFrame and len(self.prevKeyPoints):
+            # Track the previous keypoints
+            matchedKeypoints, status, _ = cv2.calcOpticalFlowPyrLK(self.prevFrame, frame, self.prevKeyPoints, None)
+            status = status.ravel() == 1
+            prevPoints, currPoints = self.prevKeyPoints[status], matchedKeypoints[status]
+            self._lap("flow")
+
+            # Find rigid matrix, keeping its inliers as the keypoints of the next frame
+            if prevPoints.shape[0] > 4:
+                H, inliers = cv2.estimateAffinePartial2D(prevPoints, currPoints, cv2.RANSAC)
+                if H is None:
+                    H = np.eye(2, 3)
+                else:
+                    keypoints = currPoints[inliers.ravel() == 1]
+                    if self.downscale > 1.0:
+                        H[0, 2] *= self.downscale
+                        H[1, 2] *= self.downscale
+            else:
+                LOGGER.warning("WARNING: not enough matching points")
+            self._lap("estimate")
+
+        # Drop keypoints outside the mask
+        xy = keypoints.reshape(-1, 2).astype(np.int_)
+        keep = (xy[:, 0] >= 0) & (xy[:, 0] < width) & (xy[:, 1] >= 0) & (xy[:, 1] < height)
+        keep[keep] = mask[xy[keep, 1], xy[keep, 0]] > 0
+        keypoints, xy = keypoints[keep], xy[keep]
+
+        # Detect new keypoints in grid cells that lost more than half of their share
+        g = self.grid
+        share = self.feature_params["maxCorners"] // (g * g)
+        xs, ys = np.linspace(0, width, g + 1, dtype=int), np.linspace(0, height, g + 1, dtype=int)
+        cells = (np.searchsorted(ys, xy[:, 1], side="right") - 1) * g + np.searchsorted(xs, xy[:, 0], side="right") - 1
+        counts = np.bincount(cells, minlength=g * g)
+        keypoints = [keypoints]
+        for c in np.flatnonzero(counts < share / 2):
+            i, j = divmod(c, g)
+            roi = slice(ys[i], ys[i + 1]), slice(xs[j], xs[j + 1])
+            params = {**self.feature_params, "maxCorners": share - int(counts[c])}
+            points = cv2.goodFeaturesToTrack(frame[roi], mask=mask[roi], **params)
+            if points is not None:
+                keypoints.append(points + np.array([xs[j], ys[i]], dtype=np.float32))
+        self._lap("detect")
+
+        self.prevFrame = frame
+        self.prevKeyPoints = np.concatenate(keypoints).astype(np.float32)
+        self.initializedFirstFrame = True
+
+        return H
+
     def reset_params(self) -> None:
-        """Reset the internal parameters including previous frame, keypoints, and descriptors."""
-        self.prevFrame = None
-        self.prevKeyPoints = None
-        self.prevDescriptors = None
-        self.initializedFirstFrame = False
+        """
+        Reset the internal parameters including previous frame, keypoints, and descriptors.
+
+        Frames submitted ahead are computed again from the reset state, as they follow the reset in a new video.
+        """
+        with self._lock:
+            frames = [frame for frame, _ in self._pending]
+            for _, result in self._pending:
+                result.wait()  # let frames submitted ahead finish before clearing their state
+            self._pending.clear()
+            self._detections = None
+            self.prevFrame = None
+            self.prevKeyPoints = None
+            self.prevDescriptors = None
+            self.initializedFirstFrame = False
+            for frame in frames:
+                self._enqueue(frame)
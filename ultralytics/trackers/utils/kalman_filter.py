@@ -24,8 +24,11 @@ class KalmanFilterXYAH:
         predict: Runs the Kalman filter prediction step.
         project: Projects the state distribution to measurement space.
         multi_predict: Runs the Kalman filter prediction step (vectorized version).
+        multi_project: Projects multiple state distributions to measurement space (vectorized version).
         update: Runs the Kalman filter correction step.
+        multi_update: Runs the Kalman filter correction step for multiple states (vectorized version).
         gating_distance: Computes the gating distance between state distribution and measurements.
+        multi_gating_distance: Computes the gating distances between multiple state distributions and measurements.
 
     Examples:
         Initialize the Kalman filter and create a track from a measurement
@@ -162,6 +165,42 @@ class KalmanFilterXYAH:
         covariance = np.linalg.multi_dot((self._update_mat, covariance, self._update_mat.T))
         return mean, covariance + innovation_cov
 
+    def multi_project(self, mean: np.ndarray, covariance: np.ndarray):
+        """
+        Project multiple state distributions to measurement space (Vectorized version).
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the object states.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the object states.
+
+        Returns:
+            (np.ndarray): Projected means of the given state estimates with shape (N, 4).
+            (np.ndarray): Projected covariance matrices of the given state estimates with shape (N, 4, 4).
+
+        Examples:
+            >>> kf = KalmanFilterXYAH()
+            >>> mean = np.random.rand(10, 8)
+            >>> covariance = np.tile(np.eye(8), (10, 1, 1))
+            >>> projected_mean, projected_covariance = kf.multi_project(mean, covariance)
+        """
+        std = np.stack(
+            [
+                self._std_weight_position * mean[:, 3],
+                self._std_weight_position * mean[:, 3],
+                1e-1 * np.ones_like(mean[:, 3]),
+                self._std_weight_position * mean[:, 3],
+            ],
+            1,
+        )
+        return self._multi_project(mean, covariance, std)
+
+    def _multi_project(self, mean: np.ndarray, covariance: np.ndarray, std: np.ndarray):
+        """Project (N, 8) means and (N, 8, 8) covariances, adding (N, 4) innovation standard deviations."""
+        covariance = self._update_mat @ covariance @ self._update_mat.T
+        i = np.arange(std.shape[1])
+        covariance[:, i, i] += np.square(std)
+        return mean @ self._update_mat.T, covariance
+
     def multi_predict(self, mean: np.ndarray, covariance: np.ndarray):
         """
         Run Kalman filter prediction step for multiple object states (Vectorized version).
@@ -235,6 +274,40 @@ class KalmanFilterXYAH:
         new_covariance = covariance - np.linalg.multi_dot((kalman_gain, projected_cov, kalman_gain.T))
         return new_mean, new_covariance
 
+    def multi_update(self, mean: np.ndarray, covariance: np.ndarray, measurement: np.ndarray):
+        """
+        Run Kalman filter correction step for multiple object states (Vectorized version).
+
+        The Kalman gains of all states are computed with a single batched solve of their projected covariances.
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the predicted states.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the predicted states.
+            measurement (np.ndarray): The Nx4 dimensional matrix of measurements, one per state, in the filter's
+                measurement format.
+
+        Returns:
+            (np.ndarray): Measurement-corrected state means with shape (N, 8).
+            (np.ndarray): Measurement-corrected state covariances with shape (N, 8, 8).
+
+        Examples:
+            >>> kf = KalmanFilterXYAH()
+            >>> mean = np.array([[0, 0, 1, 1, 0, 0, 0, 0], [5, 5, 1, 2, 0, 0, 0, 0]], dtype=float)
+            >>> covariance = np.tile(np.eye(8), (2, 1, 1))
+            >>> measurement = np.array([[1, 1, 1, 1], [6, 5, 1, 2]])
+            >>> new_mean, new_covariance = kf.multi_update(mean, covariance, measurement)
+        """
+        if len(mean) == 0:
+            return mean, covariance
+        projected_mean, projected_cov = self.multi_project(mean, covariance)
+        cross_cov = covariance @ self._update_mat.T  # (N, 8, 4)
+        kalman_gain = np.linalg.solve(projected_cov, cross_cov.transpose(0, 2, 1)).transpose(0, 2, 1)
+        innovation = measurement - projected_mean
+
+        new_mean = mean + np.einsum("nij,nj->ni", kalman_gain, innovation)
+        new_covariance = covariance - kalman_gain @ projected_cov @ kalman_gain.transpose(0, 2, 1)
+        return new_mean, new_covariance
+
     def gating_distance(
         self,
         mean: np.ndarray,
@@ -285,6 +358,53 @@ class KalmanFilterXYAH:
         else:
             raise ValueError("Invalid distance metric")
 
+    def multi_gating_distance(
+        self,
+        mean: np.ndarray,
+        covariance: np.ndarray,
+        measurements: np.ndarray,
+        only_position: bool = False,
+        metric: str = "maha",
+    ) -> np.ndarray:
+        """
+        Compute gating distances between multiple state distributions and measurements (Vectorized version).
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the state distributions.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the state distributions.
+            measurements (np.ndarray): An (M, 4) matrix of M measurements in the filter's measurement format.
+            only_position (bool): If True, distance computation is done with respect to box center position only.
+            metric (str): The metric to use for calculating the distance. Options are 'gaussian' for the squared
+                Euclidean distance and 'maha' for the squared Mahalanobis distance.
+
+        Returns:
+            (np.ndarray): An (N, M) matrix, where element (i, j) contains the squared distance between
+                (mean[i], covariance[i]) and `measurements[j]`.
+
+        Examples:
+            >>> kf = KalmanFilterXYAH()
+            >>> mean = np.array([[0, 0, 1, 1, 0, 0, 0, 0], [5, 5, 1, 2, 0, 0, 0, 0]], dtype=float)
+            >>> covariance = np.tile(np.eye(8), (2, 1, 1))
+            >>> measurements = np.array([[1, 1, 1, 1], [2, 2, 1, 1], [6, 5, 1, 2]])
+            >>> distances = kf.multi_gating_distance(mean, covariance, measurements)
+        """
+        if len(mean) == 0 or len(measurements) == 0:
+            return np.zeros((len(mean), len(measurements)))
+        mean, covariance = self.multi_project(mean, covariance)
+        if only_position:
+            mean, covariance = mean[:, :2], covariance[:, :2, :2]
+            measurements = measurements[:, :2]
+
+        d = measurements[None] - mean[:, None]  # (N, M, 4)
+        if metric == "gaussian":
+            return np.sum(d * d, axis=2)
+        elif metric == "maha":
+            cholesky_inv = np.linalg.inv(np.linalg.cholesky(covariance))  # (N, 4, 4)
+            z = cholesky_inv @ d.transpose(0, 2, 1)  # (N, 4, M)
+            return np.einsum("nkm,nkm->nm", z, z)  # square maha
+        else:
+            raise ValueError("Invalid distance metric")
+
 
 class KalmanFilterXYWH(KalmanFilterXYAH):
     """
@@ -305,6 +425,7 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         initiate: Creates a track from an unassociated measurement.
         predict: Runs the Kalman filter prediction step.
         project: Projects the state distribution to measurement space.
+        multi_project: Projects multiple state distributions to measurement space in a vectorized manner.
         multi_predict: Runs the Kalman filter prediction step in a vectorized manner.
         update: Runs the Kalman filter correction step.
 
@@ -428,6 +549,27 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         covariance = np.linalg.multi_dot((self._update_mat, covariance, self._update_mat.T))
         return mean, covariance + innovation_cov
 
+    def multi_project(self, mean, covariance):
+        """
+        Project multiple state distributions to measurement space (Vectorized version).
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the object states.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the object states.
+
+        Returns:
+            (np.ndarray): Projected means of the given state estimates with shape (N, 4).
+            (np.ndarray): Projected covariance matrices of the given state estimates with shape (N, 4, 4).
+
+        Examples:
+            >>> kf = KalmanFilterXYWH()
+            >>> mean = np.random.rand(10, 8)
+            >>> covariance = np.tile(np.eye(8), (10, 1, 1))
+            >>> projected_mean, projected_cov = kf.multi_project(mean, covariance)
+        """
+        std = self._std_weight_position * mean[:, [2, 3, 2, 3]]
+        return self._multi_project(mean, covariance, std)
+
     def multi_predict(self, mean, covariance):
         """
         Run Kalman filter prediction step (Vectorized version).
@@ -66,8 +66,9 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
     Compute cost based on Intersection over Union (IoU) between tracks.
 
     Args:
-        atracks (List[STrack] | List[np.ndarray]): List of tracks 'a' or bounding boxes.
-        btracks (List[STrack] | List[np.ndarray]): List of tracks 'b' or bounding boxes.
+        atracks (List[Any] | List[np.ndarray] | np.ndarray): Tracks 'a' with 'xyxy', 'xywha' and 'angle' attributes, or
+            bounding boxes, i.e. an (N, 4) array of xyxy boxes or an (N, 5) array of xywha oriented boxes.
+        btracks (List[Any] | List[np.ndarray] | np.ndarray): Tracks 'b' or bounding boxes.
 
     Returns:
         (np.ndarray): Cost matrix computed based on IoU with shape (len(atracks), len(btracks)).
@@ -78,7 +79,7 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
         >>> btracks = [np.array([5, 5, 15, 15]), np.array([25, 25, 35, 35])]
         >>> cost_matrix = iou_distance(atracks, btracks)
     """
-    if atracks and isinstance(atracks[0], np.ndarray) or btracks and isinstance(btracks[0], np.ndarray):
+    if len(atracks) and isinstance(atracks[0], np.ndarray) or len(btracks) and isinstance(btracks[0], np.ndarray):
         atlbrs = atracks
         btlbrs = btracks
     else:
@@ -106,8 +107,10 @@ def embedding_distance(tracks: list, detections: list, metric: str = "cosine") -
     Compute distance between tracks and detections based on embeddings.
 
     Args:
-        tracks (List[STrack]): List of tracks, where each track contains embedding features.
-        detections (List[BaseTrack]): List of detections, where each detection contains embedding features.
+        tracks (List[Any] | np.ndarray): List of tracks with 'smooth_feat' embedding features, or an (N, D) array of
+            track features.
+        detections (List[BaseTrack] | np.ndarray): List of detections, where each detection contains embedding
+            features, or an (M, D) array of detection features.
         metric (str): Metric for distance computation. Supported metrics include 'cosine', 'euclidean', etc.
 
     Returns:
@@ -116,17 +119,21 @@ def embedding_distance(tracks: list, detections: list, metric: str = "cosine") -
 
     Examples:
         Compute the embedding distance between tracks and detections using cosine metric
-        >>> tracks = [STrack(...), STrack(...)]  # List of track objects with embedding features
-        >>> detections = [BaseTrack(...), BaseTrack(...)]  # List of detection objects with embedding features
+        >>> tracks = np.random.rand(3, 128)  # track features
+        >>> detections = np.random.rand(5, 128)  # detection features
         >>> cost_matrix = embedding_distance(tracks, detections, metric="cosine")
     """
     cost_matrix = np.zeros((len(tracks), len(detections)), dtype=np.float32)
     if cost_matrix.size == 0:
         return cost_matrix
-    det_features = np.asarray([track.curr_feat for track in detections], dtype=np.float32)
-    # for i, track in enumerate(tracks):
-    # cost_matrix[i, :] = np.maximum(0.0, cdist(track.smooth_feat.reshape(1,-1), det_features, metric))
-    track_features = np.asarray([track.smooth_feat for track in tracks], dtype=np.float32)
+    if isinstance(detections, np.ndarray):
+        det_features = detections.astype(np.float32, copy=False)
+    else:
+        det_features = np.asarray([track.curr_feat for track in detections], dtype=np.float32)
+    if isinstance(tracks, np.ndarray):
+        track_features = tracks.astype(np.float32, copy=False)
+    else:
+        track_features = np.asarray([track.smooth_feat for track in tracks], dtype=np.float32)
     cost_matrix = np.maximum(0.0, cdist(track_features, det_features, metric))  # Normalized features
     return cost_matrix
 
@@ -137,7 +144,8 @@ def fuse_score(cost_matrix: np.ndarray, detections: list) -> np.ndarray:
 
     Args:
         cost_matrix (np.ndarray): The matrix containing cost values for assignments, with shape (N, M).
-        detections (List[BaseTrack]): List of detections, each containing a score attribute.
+        detections (List[BaseTrack] | np.ndarray): List of detections, each containing a score attribute, or an (M,)
+            array of detection scores.
 
     Returns:
         (np.ndarray): Fused similarity matrix with shape (N, M).
@@ -151,7 +159,6 @@ def fuse_score(cost_matrix: np.ndarray, detections: list) -> np.ndarray:
     if cost_matrix.size == 0:
         return cost_matrix
     iou_sim = 1 - cost_matrix
-    det_scores = np.array([det.score for det in detections])
-    det_scores = np.expand_dims(det_scores, axis=0).repeat(cost_matrix.shape[0], axis=0)
-    fuse_sim = iou_sim * det_scores
+    det_scores = detections if isinstance(detections, np.ndarray) else np.array([det.score for det in detections])
+    fuse_sim = iou_sim * det_scores[None]
     return 1 - fuse_sim  # fuse_cost
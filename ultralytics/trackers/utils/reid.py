@@ -0,0 +1,53 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+
+import torch
+import torch.nn.functional as F
+from torchvision.ops import roi_align
+
+
+def roi_embeddings(feats, strides, boxes, orig_shapes, ratio_pads=None):
+    """
+    Pool appearance embeddings of detections from the detector's multi-scale feature maps with ROI-align.
+
+    Each box is mapped from original image pixels to the letterboxed model input and average-pooled with ROI-align on
+    every feature level. The pooled vectors are normalized per level and concatenated, so that every level contributes
+    equally to the embedding.
+
+    Args:
+        feats (List[torch.Tensor]): Feature maps of shape (B, C_i, H_i, W_i) input to the detection head, i.e. P3-P5.
+        strides (List[float]): Stride of each feature map in model input pixels.
+        boxes (List[torch.Tensor | np.ndarray]): Per-image (N, 4) xyxy boxes in original image pixels.
+        orig_shapes (List[tuple]): Per-image original (height, width).
+        ratio_pads (List[tuple | None] | None): Per-image letterbox (ratio, (left_pad, top_pad)), computed from the
+            shapes if None.
+
+    Returns:
+        (List[np.ndarray]): Per-image float32 embeddings of shape (N, sum(C_i)).
+
+    Examples:
+        >>> feats = [torch.rand(1, 64, 80, 80), torch.rand(1, 128, 40, 40), torch.rand(1, 256, 20, 20)]
+        >>> emb = roi_embeddings(feats, [8, 16, 32], [np.array([[10, 20, 110, 220]])], [(480, 640)])
+        >>> emb[0].shape
+        (1, 448)
+    """
+    h, w = feats[0].shape[2] * strides[0], feats[0].shape[3] * strides[0]  # model input shape
+    ratio_pads = ratio_pads or [None] * len(boxes)
+    rois = []
+    for i, (b, shape, ratio_pad) in enumerate(zip(boxes, orig_shapes, ratio_pads)):
+        if ratio_pad is None:  # as in ops.scale_boxes()
+            gain = min(h / shape[0], w / shape[1])
+            pad = (w - shape[1] * gain) / 2, (h - shape[0] * gain) / 2
+        else:
+            gain, pad = ratio_pad[0][0], ratio_pad[1]
+        b = torch.as_tensor(b, dtype=torch.float32).reshape(-1, 4) * gain
+        b[:, [0, 2]] += pad[0]
+        b[:, [1, 3]] += pad[1]
+        rois.append(torch.cat((torch.full_like(b[:, :1], i), b), 1))
+    rois = torch.cat(rois)
+    if not len(rois):
+        return [torch.zeros((0, sum(f.shape[1] for f in feats))).numpy() for _ in boxes]
+    emb = []
+    for f, s in zip(feats, strides):
+        x = roi_align(f.float(), rois.to(f.device), 1, spatial_scale=1 / s, sampling_ratio=2, aligned=True)
+        emb.append(F.normalize(x.flatten(1), dim=1))
+    return [x.numpy() for x in torch.cat(emb, 1).cpu().split([len(b) for b in boxes])]
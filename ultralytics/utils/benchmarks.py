@@ -4,8 +4,17 @@ Benchmark a YOLO model formats for speed and accuracy.
 
 Usage:
     from ultralytics.utils.benchmarks import ProfileModels, benchmark
+    from ultralytics.utils.benchmarks import benchmark_nms, benchmark_nms_rotated
+    from ultralytics.utils.benchmarks import benchmark_preprocess, benchmark_confusion_matrix
+    from ultralytics.utils.benchmarks import benchmark_dataloader, benchmark_kalman
     ProfileModels(['yolo11n.yaml', 'yolov8s.yaml']).profile()
     benchmark(model='yolo11n.pt', imgsz=160)
+    benchmark_nms(batch_sizes=(1, 32))
+    benchmark_nms_rotated(sizes=(1000, 5000))
+    benchmark_preprocess(imgsz=(640, 1280))
+    benchmark_confusion_matrix(sizes=((50, 100), (200, 300)))
+    benchmark_dataloader(imgsz=(640, 1280))
+    benchmark_kalman(sizes=(10, 100, 1000))
 
 Format                  | `format=argument`         | Model
 ---                     | ---                       | ---
@@ -200,6 +209,325 @@ def benchmark(
     return df
 
 
+def benchmark_nms(batch_sizes=(1, 8, 32, 64), anchors=8400, conf=0.25, iou=0.7, device="cpu", runs=10):
+    """
+    Benchmark batched against per-image `non_max_suppression()` on synthetic predictions for detect, segment and OBB.
+
+    Args:
+        batch_sizes (Tuple[int]): Batch sizes to benchmark.
+        anchors (int): Number of anchors per image, i.e. 8400 for imgsz=640.
+        conf (float): Confidence threshold.
+        iou (float): IoU threshold.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'.
+        runs (int): Number of timed runs per configuration.
+
+    Returns:
+        (pandas.DataFrame): Per-image and batched NMS times in ms/batch for each task and batch size.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_nms
+        >>> benchmark_nms(batch_sizes=(1, 32))
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.utils.ops import Profile, non_max_suppression
+
+    device = select_device(device, verbose=False)
+    y = []
+    for task, nc, nm, rotated in ("detect", 80, 0, False), ("segment", 80, 32, False), ("obb", 15, 0, True):
+        for bs in batch_sizes:
+            x = torch.rand(bs, 4 + nc + nm + rotated, anchors, device=device)
+            x[:, :2] *= 640  # xy
+            x[:, 2:4] = x[:, 2:4] * 64 + 4  # wh
+            x[:, 4 : 4 + nc] *= 0.2  # class scores below conf
+            x[:, 4 : 4 + nc] += (torch.rand_like(x[:, 4 : 4 + nc]) < 0.01 / nc) * 0.8  # ~1% of anchors as candidates
+            t = []
+            for batched in False, True:
+                non_max_suppression(x, conf, iou, nc=nc, rotated=rotated, in_place=False, batched=batched)  # warmup
+                dt = Profile(device=device)
+                for _ in range(runs):
+                    with dt:
+                        non_max_suppression(x, conf, iou, nc=nc, rotated=rotated, in_place=False, batched=batched)
+                t.append(round(dt.t / runs * 1e3, 2))
+            y.append([task, bs, *t, round(t[0] / t[1], 2)])
+
+    df = pd.DataFrame(y, columns=["Task", "Batch", "Per-image (ms)", "Batched (ms)", "Speedup"])
+    LOGGER.info(f"\nNMS benchmarks on {device}\n{df}\n")
+    return df
+
+
+def benchmark_nms_rotated(sizes=(1000, 5000, 20000), imgsz=4096, iou=0.45, device="cpu", runs=3):
+    """
+    Benchmark sparse against dense `nms_rotated()` on synthetic DOTA-like scenes of small, randomly rotated boxes.
+
+    Args:
+        sizes (Tuple[int]): Numbers of candidate boxes per scene.
+        imgsz (int): Scene size in pixels over which box centers are spread.
+        iou (float): IoU threshold.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'.
+        runs (int): Number of timed runs per configuration.
+
+    Returns:
+        (pandas.DataFrame): Dense and sparse times in ms per scene, and whether both kept the same boxes. Dense times
+            are empty if the (N, N) probiou matrix ran out of memory.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_nms_rotated
+        >>> benchmark_nms_rotated(sizes=(1000, 5000))
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.utils.ops import Profile, nms_rotated
+
+    device = select_device(device, verbose=False)
+    y = []
+    for n in sizes:
+        boxes = torch.rand(n, 5, device=device)
+        boxes[:, :2] *= imgsz  # xy
+        boxes[:, 2:4] = boxes[:, 2:4] * 60 + 4  # wh
+        boxes[:, 4] = (boxes[:, 4] - 0.5) * np.pi  # r
+        scores = torch.rand(n, device=device)
+        t, keep = [], []
+        for sparse in False, True:
+            try:
+                dt = Profile(device=device)
+                for _ in range(runs):
+                    with dt:
+                        k = nms_rotated(boxes, scores, iou, sparse=sparse)
+                t.append(round(dt.t / runs * 1e3, 2))
+                keep.append(k)
+            except RuntimeError as e:  # out of memory
+                LOGGER.warning(f"WARNING ⚠️ {'sparse' if sparse else 'dense'} nms_rotated() failed for {n} boxes: {e}")
+                t.append(None)
+                keep.append(None)
+        same = None if None in t else torch.equal(*keep)
+        y.append([n, *t, round(t[0] / t[1], 2) if None not in t else None, same])
+
+    df = pd.DataFrame(y, columns=["Boxes", "Dense (ms)", "Sparse (ms)", "Speedup", "Identical"])
+    LOGGER.info(f"\nRotated NMS benchmarks on {device}\n{df.fillna('-')}\n")
+    return df
+
+
+def benchmark_preprocess(imgsz=(640, 1280), batch=8, shape=(1080, 1920), half=False, device="cpu", runs=10):
+    """
+    Benchmark predictor preprocessing of a batch of frames into its reusable letterboxed batch buffer.
+
+    Bytes written per batch of B letterboxed uint8 bytes are the letterboxed images (B), the device copy (B, CUDA only),
+    the fused channel swap and cast, and the in-place division (2 x 2B for FP16, 2 x 4B for FP32).
+
+    Args:
+        imgsz (Tuple[int]): Inference sizes to benchmark.
+        batch (int): Number of images per batch.
+        shape (Tuple[int, int]): Shape (height, width) of the synthetic BGR source frames.
+        half (bool): Use FP16 precision.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'.
+        runs (int): Number of timed runs per configuration.
+
+    Returns:
+        (pandas.DataFrame): MB written, ms per batch and images per second at each size.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_preprocess
+        >>> benchmark_preprocess(imgsz=(640,), batch=4)
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.utils.ops import Profile
+
+    device = select_device(device, verbose=False)
+    model = YOLO("yolo11n.yaml")
+    ims = [np.random.randint(0, 255, (*shape, 3), dtype=np.uint8) for _ in range(batch)]
+    y = []
+    for s in imgsz:
+        model.predict(ims[:1], imgsz=s, half=half, device=device, verbose=False)  # setup predictor
+        predictor = model.predictor
+        im = predictor.preprocess(ims)  # warmup
+        dt = Profile(device=device)
+        for _ in range(runs):
+            with dt:
+                predictor.preprocess(ims)
+        b = im.numel()  # letterboxed uint8 bytes
+        h2d = b if device.type != "cpu" else 0
+        mb = (b + h2d + 2 * im.element_size() * b) / 1e6
+        y.append([s, round(mb, 1), round(dt.t / runs * 1e3, 2), round(batch * runs / dt.t, 1)])
+
+    df = pd.DataFrame(y, columns=["Size", "Written (MB)", "Time (ms)", "Images/s"])
+    LOGGER.info(f"\nPreprocess benchmarks for batch {batch} of {shape[1]}x{shape[0]} frames on {device}\n{df}\n")
+    return df
+
+
+def benchmark_confusion_matrix(sizes=((50, 100), (200, 300)), nc=50, images=100, device="cpu"):
+    """
+    Benchmark `ConfusionMatrix.process_batch()` on synthetic scenes of jittered detections for boxes and OBB.
+
+    Args:
+        sizes (Tuple[Tuple[int, int]]): (ground truth, detections) counts per image.
+        nc (int): Number of classes.
+        images (int): Number of synthetic images per configuration.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'.
+
+    Returns:
+        (pandas.DataFrame): Time in ms per image for each task and size.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_confusion_matrix
+        >>> benchmark_confusion_matrix(sizes=((50, 100),), images=10)
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.utils.metrics import ConfusionMatrix
+    from ultralytics.utils.ops import Profile
+
+    device = select_device(device, verbose=False)
+    y = []
+    for task in "detect", "obb":
+        for m, n in sizes:
+            batch = []
+            for _ in range(images):
+                gt = torch.rand(m, 2, device=device) * 1024
+                gt = torch.cat([gt, gt + torch.rand(m, 2, device=device) * 60 + 4], 1)  # xyxy
+                det = gt[torch.randint(0, m, (n,), device=device)] + torch.randn(n, 4, device=device) * 4  # jittered
+                det[:, 2:] = torch.maximum(det[:, 2:], det[:, :2] + 1)
+                if task == "obb":
+                    gt = torch.cat([(gt[:, :2] + gt[:, 2:]) / 2, gt[:, 2:] - gt[:, :2], torch.rand_like(gt[:, :1])], 1)
+                    det = torch.cat([(det[:, :2] + det[:, 2:]) / 2, det[:, 2:] - det[:, :2]], 1)  # xywh
+                det = [det, torch.rand(n, 1, device=device), torch.randint(0, nc, (n, 1), device=device).float()]
+                det += [torch.rand(n, 1, device=device)] if task == "obb" else []  # angle
+                batch.append((torch.cat(det, 1), gt, torch.randint(0, nc, (m,), device=device).float()))
+            cm = ConfusionMatrix(nc=nc)
+            dt = Profile(device=device)
+            with dt:
+                for x in batch:
+                    cm.process_batch(*x)
+            y.append([task, m, n, round(dt.t / images * 1e3, 3)])
+
+    df = pd.DataFrame(y, columns=["Task", "GT", "Detections", "Time (ms)"])
+    LOGGER.info(f"\nConfusion matrix benchmarks for {nc} classes on {device}\n{df}\n")
+    return df
+
+
+def benchmark_dataloader(data="coco8.yaml", imgsz=(640, 1280), images=64, mosaic=1.0, mixup=0.0):
+    """
+    Benchmark training dataloader throughput with fused mosaic warping against warping the mosaic canvas.
+
+    Samples are drawn in the current process from a training dataset with the default augmentation pipeline, so the
+    throughput is per dataloader worker and includes image decoding and all augmentations.
+
+    Args:
+        data (str): Path to the dataset YAML file.
+        imgsz (Tuple[int]): Training image sizes to benchmark.
+        images (int): Number of samples drawn per configuration.
+        mosaic (float): Mosaic probability.
+        mixup (float): MixUp probability.
+
+    Returns:
+        (pandas.DataFrame): Images per second per worker with Mosaic fuse=False and fuse=True at each size.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_dataloader
+        >>> benchmark_dataloader(imgsz=(640,), images=16)
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data import build_yolo_dataset
+    from ultralytics.data.augment import Mosaic
+    from ultralytics.data.utils import check_det_dataset
+    from ultralytics.utils import DEFAULT_CFG
+    from ultralytics.utils.ops import Profile
+
+    def set_fuse(t, fuse):
+        """Sets `fuse` on every Mosaic nested in a transform pipeline."""
+        if isinstance(t, Mosaic):
+            t.fuse = fuse
+        for x in getattr(t, "transforms", []):
+            set_fuse(x, fuse)
+        if getattr(t, "pre_transform", None) is not None:
+            set_fuse(t.pre_transform, fuse)
+
+    info = check_det_dataset(data)
+    y = []
+    for s in imgsz:
+        cfg = get_cfg(DEFAULT_CFG, {"imgsz": s, "mosaic": mosaic, "mixup": mixup})
+        dataset = build_yolo_dataset(cfg, info["train"], batch=16, data=info)
+        row = [s]
+        for fuse in False, True:
+            set_fuse(dataset.transforms, fuse)
+            dataset[0]  # warmup
+            dt = Profile()
+            with dt:
+                for i in range(images):
+                    dataset[i % len(dataset)]
+            row.append(round(images / dt.t, 1))
+        y.append(row)
+
+    df = pd.DataFrame(y, columns=["Size", "Canvas (img/s)", "Fused (img/s)"])
+    df["Speedup"] = (df["Fused (img/s)"] / df["Canvas (img/s)"]).round(2)
+    LOGGER.info(f"\nDataloader benchmarks per worker for {data} with mosaic={mosaic}, mixup={mixup}\n{df}\n")
+    return df
+
+
+def benchmark_kalman(sizes=(10, 100, 1000), runs=100):
+    """
+    Benchmark batched Kalman filter correction and gating against per-track calls for simultaneous tracks.
+
+    Args:
+        sizes (Tuple[int]): Numbers of simultaneous tracks, each matched to one measurement.
+        runs (int): Number of timed runs per configuration.
+
+    Returns:
+        (pandas.DataFrame): Per-track and batched `update` and `gating_distance` times in ms per frame, and whether
+            both paths produced the same states and distances.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_kalman
+        >>> benchmark_kalman(sizes=(10, 100), runs=10)
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.trackers.utils.kalman_filter import KalmanFilterXYAH, KalmanFilterXYWH
+    from ultralytics.utils.ops import Profile
+
+    def loop_update(kf, mean, cov, z):
+        """Per-track update() calls, stacked into (N, 8) means and (N, 8, 8) covariances."""
+        return tuple(map(np.stack, zip(*(kf.update(m, c, x) for m, c, x in zip(mean, cov, z)))))
+
+    def loop_gating(kf, mean, cov, z):
+        """Per-track gating_distance() calls, stacked into an (N, M) matrix."""
+        return (np.stack([kf.gating_distance(m, c, z) for m, c in zip(mean, cov)]),)
+
+    rng = np.random.default_rng(0)
+    y = []
+    for kf in KalmanFilterXYAH(), KalmanFilterXYWH():
+        for n in sizes:
+            z = np.concatenate([rng.uniform(0, 1000, (n, 2)), rng.uniform(10, 80, (n, 2))], 1)
+            if type(kf) is KalmanFilterXYAH:
+                z[:, 2] /= z[:, 3]  # xyah
+            mean, cov = map(np.stack, zip(*(kf.initiate(x) for x in z)))
+            mean, cov = kf.multi_predict(mean, cov)
+            z += rng.normal(0, 1, z.shape)
+            row = [type(kf).__name__, n]
+            for loop, batched in (loop_update, type(kf).multi_update), (loop_gating, type(kf).multi_gating_distance):
+                t, outputs = [], []
+                for fn in loop, batched:
+                    dt = Profile()
+                    for _ in range(runs):
+                        with dt:
+                            out = fn(kf, mean, cov, z)
+                    t.append(round(dt.t / runs * 1e3, 3))
+                    outputs.append(out if isinstance(out, tuple) else (out,))
+                same = all(np.allclose(a, b, rtol=1e-6, atol=1e-6) for a, b in zip(*outputs))
+                row += [*t, round(t[0] / t[1], 2), same]
+            y.append(row)
+
+    columns = ["Filter", "Tracks"]
+    for name in "Update", "Gating":
+        columns += [f"{name} loop (ms)", f"{name} batched (ms)", f"{name} speedup", f"{name} identical"]
+    df = pd.DataFrame(y, columns=columns)
+    LOGGER.info(f"\nKalman filter benchmarks\n{df.to_string()}\n")
+    return df
+
+
 class RF100Benchmark:
     """
     Benchmark YOLO model performance across various formats for speed and accuracy.
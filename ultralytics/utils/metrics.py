@@ -1,15 +1,18 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 """Model validation metrics."""
 
+import json
 import math
 import warnings
+from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
 import torch
 
-from ultralytics.utils import LOGGER, SimpleClass, TryExcept, plt_settings
+from ultralytics.utils import LOGGER, NUM_THREADS, SimpleClass, TryExcept, plt_settings
 
 OKS_SIGMA = (
     np.array([0.26, 0.25, 0.25, 0.35, 0.35, 0.79, 0.79, 0.72, 0.72, 0.62, 0.62, 1.07, 1.07, 0.87, 0.87, 0.89, 0.89])
@@ -55,20 +58,21 @@ def box_iou(box1, box2, eps=1e-7):
     Based on https://github.com/pytorch/vision/blob/master/torchvision/ops/boxes.py.
 
     Args:
-        box1 (torch.Tensor): A tensor of shape (N, 4) representing N bounding boxes.
-        box2 (torch.Tensor): A tensor of shape (M, 4) representing M bounding boxes.
+        box1 (torch.Tensor): A tensor of shape (..., N, 4) representing N bounding boxes.
+        box2 (torch.Tensor): A tensor of shape (..., M, 4) representing M bounding boxes, with the same leading batch
+            dimensions as box1.
         eps (float, optional): A small value to avoid division by zero. Defaults to 1e-7.
 
     Returns:
-        (torch.Tensor): An NxM tensor containing the pairwise IoU values for every element in box1 and box2.
+        (torch.Tensor): An (..., N, M) tensor containing the pairwise IoU values for every element in box1 and box2.
     """
     # NOTE: Need .float() to get accurate iou values
-    # inter(N,M) = (rb(N,M,2) - lt(N,M,2)).clamp(0).prod(2)
-    (a1, a2), (b1, b2) = box1.float().unsqueeze(1).chunk(2, 2), box2.float().unsqueeze(0).chunk(2, 2)
-    inter = (torch.min(a2, b2) - torch.max(a1, b1)).clamp_(0).prod(2)
+    # inter(N,M) = (rb(N,M,2) - lt(N,M,2)).clamp(0).prod(-1)
+    (a1, a2), (b1, b2) = box1.float().unsqueeze(-2).chunk(2, -1), box2.float().unsqueeze(-3).chunk(2, -1)
+    inter = (torch.min(a2, b2) - torch.max(a1, b1)).clamp_(0).prod(-1)
 
     # IoU = inter / (area1 + area2 - inter)
-    return inter / ((a2 - a1).prod(2) + (b2 - b1).prod(2) - inter + eps)
+    return inter / ((a2 - a1).prod(-1) + (b2 - b1).prod(-1) - inter + eps)
 
 
 def bbox_iou(box1, box2, xywh=True, GIoU=False, DIoU=False, CIoU=False, eps=1e-7):
@@ -320,13 +324,28 @@ class ConfusionMatrix:
             targets (Array[N, 1]): Ground truth class labels.
         """
         preds, targets = torch.cat(preds)[:, 0], torch.cat(targets)
-        for p, t in zip(preds.cpu().numpy(), targets.cpu().numpy()):
-            self.matrix[p][t] += 1
+        self._update(preds, targets)
+
+    def _update(self, pred_classes, true_classes):
+        """
+        Add counts for (predicted class, true class) pairs to the matrix with a single bincount.
+
+        Args:
+            pred_classes (torch.Tensor): Predicted class (row) indices, `nc` for background.
+            true_classes (torch.Tensor): True class (column) indices, `nc` for background.
+        """
+        n = self.matrix.shape[1]
+        idx = (pred_classes.long() * n + true_classes.long()).cpu().numpy()
+        self.matrix += np.bincount(idx, minlength=self.matrix.size).reshape(self.matrix.shape)
 
     def process_batch(self, detections, gt_bboxes, gt_cls):
         """
         Update confusion matrix for object detection task.
 
+        Matching runs on the device of the inputs: each detection takes its highest-IoU ground truth above
+        `iou_thres`, and each ground truth keeps the highest-IoU detection among those. Only the resulting cell indices
+        are moved to the CPU for counting.
+
         Args:
             detections (Array[N, 6] | Array[N, 7]): Detected bounding boxes and their associated information.
                                       Each row should contain (x1, y1, x2, y2, conf, class)
@@ -334,52 +353,36 @@ class ConfusionMatrix:
             gt_bboxes (Array[M, 4]| Array[N, 5]): Ground truth bounding boxes with xyxy/xyxyr format.
             gt_cls (Array[M]): The class labels.
         """
-        if gt_cls.shape[0] == 0:  # Check if labels is empty
-            if detections is not None:
-                detections = detections[detections[:, 4] > self.conf]
-                detection_classes = detections[:, 5].int()
-                for dc in detection_classes:
-                    self.matrix[dc, self.nc] += 1  # false positives
-            return
+        gt_classes = gt_cls.int()
         if detections is None:
-            gt_classes = gt_cls.int()
-            for gc in gt_classes:
-                self.matrix[self.nc, gc] += 1  # background FN
+            self._update(torch.full_like(gt_classes, self.nc), gt_classes)  # background FN
             return
-
         detections = detections[detections[:, 4] > self.conf]
-        gt_classes = gt_cls.int()
         detection_classes = detections[:, 5].int()
+        background = torch.full_like(detection_classes, self.nc)
+        if gt_cls.shape[0] == 0:  # Check if labels is empty
+            self._update(detection_classes, background)  # false positives
+            return
+        if detections.shape[0] == 0:
+            self._update(torch.full_like(gt_classes, self.nc), gt_classes)  # background FN
+            return
+
         is_obb = detections.shape[1] == 7 and gt_bboxes.shape[1] == 5  # with additional `angle` dimension
         iou = (
             batch_probiou(gt_bboxes, torch.cat([detections[:, :4], detections[:, -1:]], dim=-1))
             if is_obb
             else box_iou(gt_bboxes, detections[:, :4])
         )
-
-        x = torch.where(iou > self.iou_thres)
-        if x[0].shape[0]:
-            matches = torch.cat((torch.stack(x, 1), iou[x[0], x[1]][:, None]), 1).cpu().numpy()
-            if x[0].shape[0] > 1:
-                matches = matches[matches[:, 2].argsort()[::-1]]
-                matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
-                matches = matches[matches[:, 2].argsort()[::-1]]
-                matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
-        else:
-            matches = np.zeros((0, 3))
-
-        n = matches.shape[0] > 0
-        m0, m1, _ = matches.transpose().astype(int)
-        for i, gc in enumerate(gt_classes):
-            j = m0 == i
-            if n and sum(j) == 1:
-                self.matrix[detection_classes[m1[j]], gc] += 1  # correct
-            else:
-                self.matrix[self.nc, gc] += 1  # true background
-
-        for i, dc in enumerate(detection_classes):
-            if not any(m1 == i):
-                self.matrix[dc, self.nc] += 1  # predicted background
+        best, gi = iou.max(0)  # best ground truth for each detection
+        candidate = (gi == torch.arange(len(gt_classes), device=gi.device)[:, None]) & (best > self.iou_thres)  # (M, N)
+        matched = candidate.any(1)  # ground truth with a detection
+        di = best.expand_as(candidate).masked_fill(~candidate, -1).argmax(1)  # its highest-IoU detection
+        unmatched = torch.ones_like(detection_classes, dtype=torch.bool)
+        unmatched[di[matched]] = False
+        self._update(
+            torch.cat([detection_classes[di].masked_fill(~matched, self.nc), detection_classes[unmatched]]),
+            torch.cat([gt_classes, background[unmatched]]),
+        )  # correct or true background for each ground truth, predicted background for unmatched detections
 
     def matrix(self):
         """Returns the confusion matrix."""
@@ -568,42 +571,132 @@ def ap_per_class(
     """
     # Sort by objectness
     i = np.argsort(-conf)
-    tp, conf, pred_cls = tp[i], conf[i], pred_cls[i]
 
     # Find unique classes
     unique_classes, nt = np.unique(target_cls, return_counts=True)
     nc = unique_classes.shape[0]  # number of classes, number of detections
 
-    # Create Precision-Recall curve and compute AP for each class
-    x, prec_values = np.linspace(0, 1, 1000), []
+    # Group predictions by class keeping the confidence order, dropping classes without labels
+    ci = np.searchsorted(unique_classes, pred_cls[i]).clip(max=max(nc - 1, 0))
+    j = (unique_classes[ci] == pred_cls[i]) if nc else np.zeros(len(ci), dtype=bool)
+    ci, i = ci[j], i[j]
+    j = np.argsort(ci, kind="stable")
+    tp, conf, ci = tp[i[j]], conf[i[j]], ci[j]
 
     # Average precision, precision and recall curves
     ap, p_curve, r_curve = np.zeros((nc, tp.shape[1])), np.zeros((nc, 1000)), np.zeros((nc, 1000))
-    for ci, c in enumerate(unique_classes):
-        i = pred_cls == c
-        n_l = nt[ci]  # number of labels
-        n_p = i.sum()  # number of predictions
-        if n_p == 0 or n_l == 0:
-            continue
-
-        # Accumulate FPs and TPs
-        fpc = (1 - tp[i]).cumsum(0)
-        tpc = tp[i].cumsum(0)
-
-        # Recall
-        recall = tpc / (n_l + eps)  # recall curve
-        r_curve[ci] = np.interp(-x, -conf[i], recall[:, 0], left=0)  # negative x, xp because xp decreases
-
-        # Precision
-        precision = tpc / (tpc + fpc)  # precision curve
-        p_curve[ci] = np.interp(-x, -conf[i], precision[:, 0], left=1)  # p at pr_score
-
-        # AP from recall-precision curve
-        for j in range(tp.shape[1]):
-            ap[ci, j], mpre, mrec = compute_ap(recall[:, j], precision[:, j])
-            if j == 0:
-                prec_values.append(np.interp(x, mrec, mpre))  # precision at mAP@0.5
+    c, seg = np.unique(ci, return_inverse=True)  # classes with predictions, class segment of each prediction
+    ap[c], p_curve[c], r_curve[c], prec_values = _ap_curves(tp, np.ones(len(tp), int), conf, seg, nt[c], eps)
+    return _ap_summary(
+        ap, p_curve, r_curve, list(prec_values), nt, unique_classes, plot, on_plot, save_dir, names, eps, prefix
+    )
 
+
+def _interp_segments(x, xp, fp, seg, left=None, right=None):
+    """
+    Evaluate `np.interp` at the same query points for many concatenated curves at once, with identical results.
+
+    Args:
+        x (np.ndarray): Increasing query points of shape (Q,).
+        xp (np.ndarray): Concatenated x-coordinates of all curves of shape (L, T) or (L, 1) if shared by all columns,
+            non-decreasing within each curve.
+        fp (np.ndarray): Concatenated y-coordinates of all curves of shape (L, T).
+        seg (np.ndarray): Non-decreasing curve index of each row of shape (L,), every curve has at least one row.
+        left (float | np.ndarray, optional): Value for queries below a curve, or per-column values of shape (T, 1),
+            defaults to its first y-coordinate.
+        right (float | np.ndarray, optional): Value for queries above a curve, or per-column values of shape (T, 1),
+            defaults to its last y-coordinate.
+
+    Returns:
+        (np.ndarray): Interpolated values of shape (S, T, Q) for the S curves and the T columns of `fp`.
+    """
+    T, Q = xp.shape[1], len(x)  # T is 1 for shared x-coordinates
+    n = np.bincount(seg)  # points per curve
+    S = len(n)
+    first = np.cumsum(n) - n
+    last = first + n - 1
+
+    # Number of points of each curve at or below every query, i.e. np.interp's search index plus one
+    k = np.searchsorted(x, xp)  # (L, T) number of queries below each point
+    k = (seg[:, None] * T + np.arange(T)) * (Q + 1) + k
+    cnt = np.bincount(k.ravel(), minlength=S * T * (Q + 1)).reshape(S, T, Q + 1)[..., :Q].cumsum(-1)
+
+    # Like np.interp's search, the last point only counts once all others do, e.g. for a trailing sentinel value
+    t, tf = np.arange(T)[:, None], np.arange(fp.shape[1])[:, None]
+    xf, xl, yf, yl = (a.T[..., None] for a in (xp[first, t], xp[last, t], fp[first, tf], fp[last, tf]))
+    n, first, last = n[:, None, None], first[:, None, None], last[:, None, None]
+    cnt = np.where(cnt == n, cnt, cnt - (xl <= x))
+
+    # Linear interpolation between the bracketing points, with np.interp's exact arithmetic and edge cases
+    i0 = np.minimum(first + np.maximum(cnt - 1, 0), last)
+    i1 = np.minimum(i0 + 1, last)
+    x0, x1, y0, y1 = xp[i0, t], xp[i1, t], fp[i0, tf], fp[i1, tf]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = np.where(x0 == x, y0, (y1 - y0) / (x1 - x0) * (x - x0) + y0)
+    y = np.where(cnt == n, yl, y)
+    y = np.where(x < xf, yf if left is None else left, y)
+    return np.where(x > xl, yl if right is None else right, y)
+
+
+def _ap_curves(tp, n, conf, seg, nt, eps=1e-16):
+    """
+    Compute AP for all IoU thresholds and the precision/recall curves of many classes at once.
+
+    Args:
+        tp (np.ndarray): True positive counts of shape (N, T), sorted by class and then by decreasing confidence.
+        n (np.ndarray): Prediction counts of shape (N,), ones for individual predictions.
+        conf (np.ndarray): Confidences of shape (N,).
+        seg (np.ndarray): Non-decreasing class index in [0, S) of each row of shape (N,).
+        nt (np.ndarray): Number of labels of each class of shape (S,).
+        eps (float, optional): A small value to avoid division by zero.
+
+    Returns:
+        ap (np.ndarray): Average precision of shape (S, T).
+        p_curve (np.ndarray): Precision-confidence curves of shape (S, 1000).
+        r_curve (np.ndarray): Recall-confidence curves of shape (S, 1000).
+        prec_values (np.ndarray): Precision-recall curves at the first IoU threshold of shape (S, 1000).
+    """
+    x = np.linspace(0, 1, 1000)
+    S, T = len(nt), tp.shape[1]
+    if S == 0:
+        return np.zeros((0, T)), np.zeros((0, 1000)), np.zeros((0, 1000)), np.zeros((0, 1000))
+    m = np.bincount(seg, minlength=S)  # rows per class
+    first = np.cumsum(m) - m
+
+    # Accumulate TPs and predictions within each class, TPs + FPs is the number of predictions
+    tpc, nc = tp.cumsum(0), n.cumsum()
+    tpc -= np.repeat(np.concatenate((np.zeros((1, T), tpc.dtype), tpc[first[1:] - 1])), m, 0)
+    nc -= np.repeat(np.concatenate(([0], nc[first[1:] - 1])), m)
+
+    # Recall and precision, interpolated at increasing -x because -conf increases within each class
+    recall = tpc / (nt[seg, None] + eps)  # recall curve
+    precision = tpc / nc[:, None]  # precision curve
+    rp = np.stack((recall[:, 0], precision[:, 0]), 1)
+    rp = _interp_segments(-x[::-1], -conf[:, None], rp, seg, left=np.array([[0.0], [1.0]]))[..., ::-1]
+    r_curve, p_curve = rp[:, 0], rp[:, 1]  # recall and precision at confidences x
+
+    # Append sentinel values to beginning and end of every class, as in compute_ap()
+    seg2 = np.repeat(np.arange(S), m + 2)
+    j = np.arange(len(seg)) + 2 * seg + 1  # rows of the predictions
+    mrec, mpre = np.ones((len(seg2), T)), np.zeros((len(seg2), T))
+    mrec[j], mpre[j] = recall, precision
+    mrec[j[first] - 1], mpre[j[first] - 1] = 0.0, 1.0
+
+    # Precision envelope, a reverse cumulative max within each class using lexicographic complex ordering
+    z = np.empty(mpre.shape, dtype=complex)
+    z.real, z.imag = (S - seg2)[::-1, None], mpre[::-1]
+    mpre = np.maximum.accumulate(z, 0).imag[::-1]
+
+    # Integrate area under curve with 101-point interpolation (COCO)
+    xi = np.linspace(0, 1, 101)
+    ap = np.trapz(_interp_segments(xi, mrec, mpre, seg2), xi, axis=-1)
+    prec_values = _interp_segments(x, mrec[:, :1], mpre[:, :1], seg2)[:, 0]  # precision at mAP@0.5
+    return ap, p_curve, r_curve, prec_values
+
+
+def _ap_summary(ap, p_curve, r_curve, prec_values, nt, unique_classes, plot, on_plot, save_dir, names, eps, prefix):
+    """Compute F1 curves, max-F1 precision/recall and TP/FP counts, plot curves and return the ap_per_class tuple."""
+    x = np.linspace(0, 1, 1000)
     prec_values = np.array(prec_values) if prec_values else np.zeros((1, 1000))  # (nc, 1000)
 
     # Compute F1 (harmonic mean of precision and recall)
@@ -623,6 +716,500 @@ def ap_per_class(
     return tp, fp, p, r, f1, ap, unique_classes.astype(int), p_curve, r_curve, f1_curve, x, prec_values
 
 
+class APAccumulator:
+    """
+    Streaming accumulator of per-class confidence histograms for bounded-memory average precision.
+
+    Instead of keeping every prediction until the end of validation, predictions are counted into `bins` log-spaced
+    confidence bins per class, with true positive counts per IoU threshold, so memory is O(classes x bins) regardless
+    of dataset size. Log spacing keeps the same relative resolution for the low confidences of large validation sets.
+    AP and the precision/recall curves are computed from the cumulative bin counts in descending confidence order,
+    which matches `ap_per_class` up to the ordering of predictions within a bin. Accumulators can be merged across
+    processes and queried at any time.
+
+    Attributes:
+        nc (int): Number of classes.
+        bins (int): Number of log-spaced confidence bins over [10 ** -decades, 1].
+        decades (int): Number of decades of confidence covered by the bins, lower confidences share the first bin.
+        n (np.ndarray): Prediction counts of shape (nc, bins).
+        tp (np.ndarray): True positive counts of shape (nc, bins, niou).
+        nt (np.ndarray): Target counts per class of shape (nc,).
+        ni (np.ndarray): Counts of images containing each class of shape (nc,).
+
+    Examples:
+        >>> acc = APAccumulator(nc=80)
+        >>> acc.update(tp, conf, pred_cls, target_cls)
+        >>> mp, mr, map50, map = acc.mean_results()
+    """
+
+    def __init__(self, nc, niou=10, bins=1000, decades=6):
+        """
+        Initialize empty histograms.
+
+        Args:
+            nc (int): Number of classes.
+            niou (int): Number of IoU thresholds.
+            bins (int): Number of log-spaced confidence bins over [10 ** -decades, 1].
+            decades (int): Number of decades of confidence covered by the bins.
+        """
+        self.nc, self.bins, self.decades = nc, bins, decades
+        self.n = np.zeros((nc, bins), dtype=np.int64)
+        self.tp = np.zeros((nc, bins, niou), dtype=np.int64)
+        self.nt = np.zeros(nc, dtype=np.int64)
+        self.ni = np.zeros(nc, dtype=np.int64)
+
+    def update(self, tp, conf, pred_cls, target_cls, target_img=None):
+        """
+        Count the predictions and targets of one or more images.
+
+        Args:
+            tp (torch.Tensor | np.ndarray): Correct flags of shape (N, niou).
+            conf (torch.Tensor | np.ndarray): Confidences of shape (N,).
+            pred_cls (torch.Tensor | np.ndarray): Predicted classes of shape (N,).
+            target_cls (torch.Tensor | np.ndarray): Target classes of shape (M,).
+            target_img (torch.Tensor | np.ndarray, optional): Unique target classes of each image, counted per class.
+        """
+        tp, conf, pred_cls, target_cls, target_img = (
+            x.cpu().numpy() if isinstance(x, torch.Tensor) else x for x in (tp, conf, pred_cls, target_cls, target_img)
+        )
+        b = (np.log10(np.maximum(conf, 10.0**-self.decades)) / self.decades + 1) * self.bins
+        k = pred_cls.astype(int) * self.bins + np.clip(b.astype(int), 0, self.bins - 1)
+        self.n += np.bincount(k, minlength=self.n.size).reshape(self.n.shape)
+        t = self.tp.shape[2]
+        idx = (k[:, None] * t + np.arange(t))[tp.astype(bool)]
+        self.tp += np.bincount(idx, minlength=self.tp.size).reshape(self.tp.shape)
+        self.nt += np.bincount(target_cls.astype(int), minlength=self.nc)
+        if target_img is not None:
+            self.ni += np.bincount(target_img.astype(int), minlength=self.nc)
+
+    def merge(self, other):
+        """Add the counts of another accumulator, e.g. from another process or shard."""
+        for k in "n", "tp", "nt", "ni":
+            setattr(self, k, getattr(self, k) + getattr(other, k))
+        return self
+
+    def all_reduce(self, device="cpu"):
+        """Sum the counts across all processes of the default torch.distributed process group, if initialized."""
+        if torch.distributed.is_available() and torch.distributed.is_initialized():
+            for k in "n", "tp", "nt", "ni":
+                x = torch.from_numpy(getattr(self, k)).to(device)
+                torch.distributed.all_reduce(x)
+                setattr(self, k, x.cpu().numpy())
+        return self
+
+    def results(self, plot=False, on_plot=None, save_dir=Path(), names={}, eps=1e-16, prefix=""):
+        """
+        Compute average precision per class from the accumulated histograms.
+
+        Args:
+            plot (bool, optional): Whether to plot PR curves or not.
+            on_plot (func, optional): A callback to pass plots path and data when they are rendered.
+            save_dir (Path, optional): Directory to save the PR curves.
+            names (dict, optional): Dict of class names to plot PR curves.
+            eps (float, optional): A small value to avoid division by zero.
+            prefix (str, optional): A prefix string for saving the plot files.
+
+        Returns:
+            (tuple): The same (tp, fp, p, r, f1, ap, unique_classes, p_curve, r_curve, f1_curve, x, prec_values) tuple
+                as `ap_per_class`.
+        """
+        unique_classes = np.nonzero(self.nt)[0]
+        nt = self.nt[unique_classes]
+        conf = 10 ** (((np.arange(self.bins)[::-1] + 0.5) / self.bins - 1) * self.decades)  # bin centers, descending
+        n, tp = self.n[unique_classes, ::-1], self.tp[unique_classes, ::-1]
+        ci, b = np.nonzero(n)  # non-empty bins by class, then by descending confidence
+        ap, p_curve, r_curve = np.zeros((len(nt), tp.shape[2])), np.zeros((len(nt), 1000)), np.zeros((len(nt), 1000))
+        c, seg = np.unique(ci, return_inverse=True)  # classes with predictions, class segment of each bin
+        ap[c], p_curve[c], r_curve[c], prec_values = _ap_curves(tp[ci, b], n[ci, b], conf[b], seg, nt[c], eps)
+        return _ap_summary(
+            ap, p_curve, r_curve, list(prec_values), nt, unique_classes, plot, on_plot, save_dir, names, eps, prefix
+        )
+
+    def mean_results(self):
+        """Return the running mean precision, recall, mAP50 and mAP50-95, e.g. for progress reporting mid-run."""
+        p, r, _, ap = self.results()[2:6]
+        return [p.mean(), r.mean(), ap[:, 0].mean(), ap.mean()] if len(ap) else [0.0, 0.0, 0.0, 0.0]
+
+
+class COCOEvaluator:
+    """
+    Vectorized COCO-style bounding box evaluator that reproduces `pycocotools.cocoeval.COCOeval` results.
+
+    Predictions and ground truth are collected image by image from in-memory arrays. At evaluation every (image,
+    category) pair is matched greedily for all IoU thresholds and area ranges at once, and precision is accumulated per
+    category with 101-point interpolation. Ignore rules for crowd and out-of-range objects, score ordering, maxDets
+    truncation and the 12 summary statistics follow COCOeval for `iouType='bbox'`.
+
+    Attributes:
+        iou_thrs (np.ndarray): IoU thresholds 0.50:0.05:0.95.
+        rec_thrs (np.ndarray): Recall thresholds 0.00:0.01:1.00 for 101-point interpolation.
+        max_dets (Tuple[int, int, int]): Detections per image used for AR, the last one is also used for AP.
+        area_rngs (Dict[str, Tuple[float, float]]): Object area ranges for all, small, medium and large objects.
+        memory (int): Approximate memory budget in bytes for one batch of matched (image, category) pairs.
+        image_ids (List): Image ids in update order, images are evaluated in sorted id order like COCOeval.
+        precision (np.ndarray): Precision of shape (T, R, K, A, M) after `evaluate()`, -1 where undefined.
+        recall (np.ndarray): Recall of shape (T, K, A, M) after `evaluate()`, -1 where undefined.
+        stats (np.ndarray): The 12 COCO summary statistics after `evaluate()`.
+
+    Methods:
+        reset: Clear all collected images.
+        update: Add the predictions and ground truth of one image.
+        merge: Append the images collected by another evaluator.
+        evaluate: Match, accumulate and summarize all collected images.
+        summary: Return the COCOeval-style summary table.
+        from_coco: Build an evaluator from COCO-format annotation and result JSON.
+
+    Examples:
+        >>> evaluator = COCOEvaluator()
+        >>> evaluator.update(pred_boxes, scores, pred_cls, gt_boxes, gt_cls)
+        >>> stats = evaluator.evaluate()
+        >>> print(evaluator.summary())
+    """
+
+    def __init__(self, max_dets=(1, 10, 100), memory=2**26):
+        """
+        Initialize the evaluator with COCO parameters.
+
+        Args:
+            max_dets (Tuple[int, int, int]): Maximum detections per image for AR, the last value is also used for AP.
+            memory (int): Approximate memory budget in bytes for one batch of matched (image, category) pairs.
+        """
+        self.iou_thrs = np.linspace(0.5, 0.95, int(np.round((0.95 - 0.5) / 0.05)) + 1, endpoint=True)
+        self.rec_thrs = np.linspace(0.0, 1.00, int(np.round((1.00 - 0.0) / 0.01)) + 1, endpoint=True)
+        self.max_dets = tuple(sorted(int(x) for x in max_dets))
+        assert len(self.max_dets) == 3, f"expected 3 max_dets values, got {max_dets}"
+        self.area_rngs = {"all": (0, 1e10), "small": (0, 32**2), "medium": (32**2, 96**2), "large": (96**2, 1e10)}
+        self.memory = memory
+        self.precision = self.recall = self.stats = None
+        self.reset()
+
+    @property
+    def keys(self):
+        """Return the names of the 12 summary statistics."""
+        m0, m1, m2 = self.max_dets
+        return ["AP", "AP50", "AP75", "APs", "APm", "APl", f"AR{m0}", f"AR{m1}", f"AR{m2}", "ARs", "ARm", "ARl"]
+
+    @property
+    def results_dict(self):
+        """Return a dictionary mapping summary statistic names to their values."""
+        return dict(zip(self.keys, self.stats.tolist() if self.stats is not None else [-1.0] * 12))
+
+    def reset(self):
+        """Clear all collected predictions and ground truth."""
+        self.image_ids = []
+        self.data = {k: [] for k in ("dt_box", "dt_score", "dt_cls", "gt_box", "gt_cls", "gt_crowd", "gt_area")}
+
+    @staticmethod
+    def _to_numpy(x, shape=(-1,)):
+        """Convert a tensor or array-like to a float64 numpy array of the given shape."""
+        x = x.detach().cpu().numpy() if isinstance(x, torch.Tensor) else np.asarray(x)
+        return x.astype(np.float64).reshape(shape)
+
+    def update(self, pred_boxes, scores, pred_cls, gt_boxes, gt_cls, gt_crowd=None, gt_area=None, image_id=None):
+        """
+        Add the predictions and ground truth of one image.
+
+        Args:
+            pred_boxes (torch.Tensor | np.ndarray): Predicted boxes of shape (N, 4) in (x1, y1, x2, y2) format.
+            scores (torch.Tensor | np.ndarray): Prediction confidences of shape (N,).
+            pred_cls (torch.Tensor | np.ndarray): Predicted class indices of shape (N,).
+            gt_boxes (torch.Tensor | np.ndarray): Ground truth boxes of shape (M, 4) in (x1, y1, x2, y2) format.
+            gt_cls (torch.Tensor | np.ndarray): Ground truth class indices of shape (M,).
+            gt_crowd (torch.Tensor | np.ndarray, optional): Crowd flags of shape (M,), crowd objects are ignored.
+            gt_area (torch.Tensor | np.ndarray, optional): Object areas of shape (M,) for the area ranges, defaults to
+                the box areas.
+            image_id (int | str, optional): Image id used for evaluation order, defaults to the update index.
+        """
+        gt_boxes = self._to_numpy(gt_boxes, (-1, 4))
+        gt_crowd = np.zeros(len(gt_boxes), dtype=bool) if gt_crowd is None else self._to_numpy(gt_crowd).astype(bool)
+        if gt_area is None:
+            gt_area = (gt_boxes[:, 2] - gt_boxes[:, 0]) * (gt_boxes[:, 3] - gt_boxes[:, 1])
+        self.image_ids.append(len(self.image_ids) if image_id is None else image_id)
+        values = (
+            self._to_numpy(pred_boxes, (-1, 4)),
+            self._to_numpy(scores),
+            self._to_numpy(pred_cls).astype(np.int64),
+            gt_boxes,
+            self._to_numpy(gt_cls).astype(np.int64),
+            gt_crowd,
+            self._to_numpy(gt_area),
+        )
+        for k, v in zip(self.data, values):
+            self.data[k].append(v)
+
+    def merge(self, other):
+        """Append the images of another evaluator, e.g. from another process or shard, keeping their image ids."""
+        self.image_ids += other.image_ids
+        for k, v in other.data.items():
+            self.data[k] += v
+        return self
+
+    @staticmethod
+    def _iou(dt, gt, crowd):
+        """
+        Compute COCO bounding box IoU, using the detection area as union for crowd ground truth.
+
+        Args:
+            dt (np.ndarray): Detection boxes of shape (P, D, 4) in (x1, y1, x2, y2) format.
+            gt (np.ndarray): Ground truth boxes of shape (P, G, 4) in (x1, y1, x2, y2) format.
+            crowd (np.ndarray): Crowd flags of shape (P, G).
+
+        Returns:
+            (np.ndarray): IoU of shape (P, D, G).
+        """
+        dt, gt = dt[:, :, None], gt[:, None]
+        w = np.minimum(dt[..., 2], gt[..., 2]) - np.maximum(dt[..., 0], gt[..., 0])
+        h = np.minimum(dt[..., 3], gt[..., 3]) - np.maximum(dt[..., 1], gt[..., 1])
+        inter = np.where((w > 0) & (h > 0), w * h, 0.0)
+        dt_area = (dt[..., 2] - dt[..., 0]) * (dt[..., 3] - dt[..., 1])
+        gt_area = (gt[..., 2] - gt[..., 0]) * (gt[..., 3] - gt[..., 1])
+        union = np.where(crowd[:, None], dt_area, dt_area + gt_area - inter)
+        return np.divide(inter, union, out=np.zeros_like(inter), where=inter > 0)
+
+    def _match(self, dt_box, dt_ig, gt_box, gt_crowd, gt_ig, di, dv, gi, gv):
+        """
+        Greedily match a batch of padded (image, category) pairs for all area ranges and IoU thresholds.
+
+        Detections are visited in descending score order. Each one takes the available non-ignored ground truth with
+        the highest IoU above the threshold, falling back to ignored ground truth, where crowd objects can be matched
+        repeatedly. Ties resolve to the last ground truth, as in COCOeval.
+
+        Args:
+            dt_box (np.ndarray): All detection boxes of shape (Nd, 4).
+            dt_ig (np.ndarray): Detection out-of-area flags of shape (Nd, A).
+            gt_box (np.ndarray): All ground truth boxes of shape (Ng, 4).
+            gt_crowd (np.ndarray): Ground truth crowd flags of shape (Ng,).
+            gt_ig (np.ndarray): Ground truth ignore flags of shape (Ng, A).
+            di (np.ndarray): Detection indices of shape (P, D), sorted by descending score within each pair.
+            dv (np.ndarray): Detection validity mask of shape (P, D).
+            gi (np.ndarray): Ground truth indices of shape (P, G).
+            gv (np.ndarray): Ground truth validity mask of shape (P, G).
+
+        Returns:
+            dtm (np.ndarray): Detection matched flags of shape (P, D, A, T).
+            dtig (np.ndarray): Detection ignored flags of shape (P, D, A, T).
+        """
+        (P, D), G, A, T = di.shape, gi.shape[1], dt_ig.shape[1], len(self.iou_thrs)
+        dtm = np.zeros((P, A, T, D), dtype=bool)
+        dtig = np.zeros((P, A, T, D), dtype=bool)
+        if G:
+            crowd = (gt_crowd[gi] & gv)[:, None, None]  # (P, 1, 1, G)
+            ig = np.broadcast_to((gt_ig[gi] | ~gv[..., None]).transpose(0, 2, 1)[:, :, None], (P, A, T, G))
+            iou = np.where(dv[..., None] & gv[:, None], self._iou(dt_box[di], gt_box[gi], gt_crowd[gi]), -1.0)
+            thr = np.minimum(self.iou_thrs, 1 - 1e-10)[:, None]  # (T, 1)
+            gtm = np.zeros((P, A, T, G), dtype=bool)
+            for d in range(D):
+                x = iou[:, None, None, d]  # (P, 1, 1, G)
+                ok = (x >= thr) & (~gtm | crowd)
+                cand = ok & ~ig
+                cand = np.where(cand.any(-1, keepdims=True), cand, ok & ig)  # non-ignored first
+                sel = cand & (x == np.where(cand, x, -1.0).max(-1, keepdims=True))
+                hit = sel.any(-1)
+                m = G - 1 - sel[..., ::-1].argmax(-1)  # last best match
+                p, a, t = np.nonzero(hit)
+                gtm[p, a, t, m[p, a, t]] = True
+                dtm[..., d] = hit
+                dtig[..., d] = hit & np.take_along_axis(ig, m[..., None], -1)[..., 0]
+        dtig |= ~dtm & dt_ig[di].transpose(0, 2, 1)[:, :, None]  # unmatched detections outside the area range
+        return dtm.transpose(0, 3, 1, 2), dtig.transpose(0, 3, 1, 2)
+
+    def _chunks(self, gn, dn):
+        """
+        Group (image, category) pairs into batches of similar size that fit the memory budget.
+
+        Pairs are bucketed by the powers of two of their ground truth and detection counts so that padding each batch
+        to its largest pair at most doubles the work, then buckets are split to fit `self.memory`.
+
+        Args:
+            gn (np.ndarray): Ground truth count of each pair.
+            dn (np.ndarray): Detection count of each pair.
+
+        Returns:
+            (List[np.ndarray]): Pair indices of each batch.
+        """
+        cost = len(self.area_rngs) * len(self.iou_thrs) * 8  # bytes per padded ground truth per pair
+        bg, bd = np.ceil(np.log2(gn + 1)), np.ceil(np.log2(dn + 1))
+        order = np.lexsort((dn, gn, bd, bg))
+        splits = np.nonzero((np.diff(bg[order]) != 0) | (np.diff(bd[order]) != 0))[0] + 1
+        chunks = []
+        for group in np.split(order, splits) if len(order) else []:
+            step = max(1, self.memory // (max(gn[group[-1]], 1) * (cost + dn[group].max())))
+            chunks.extend(group[i : i + step] for i in range(0, len(group), step))
+        return chunks
+
+    def evaluate(self):
+        """
+        Match, accumulate and summarize all collected images.
+
+        Returns:
+            (np.ndarray): The 12 COCO summary statistics, AP and AR over IoU thresholds and area ranges.
+        """
+        T, R, A, M = len(self.iou_thrs), len(self.rec_thrs), len(self.area_rngs), len(self.max_dets)
+        data = {k: np.concatenate(v) if v else np.zeros((0, 4) if "box" in k else 0) for k, v in self.data.items()}
+        n = len(self.image_ids)
+        img_rank = np.empty(n, dtype=np.int64)
+        img_rank[sorted(range(n), key=self.image_ids.__getitem__)] = np.arange(n)
+        dt_img = np.repeat(img_rank, [len(x) for x in self.data["dt_score"]]).astype(np.int64)
+        gt_img = np.repeat(img_rank, [len(x) for x in self.data["gt_cls"]]).astype(np.int64)
+        rngs = np.array(list(self.area_rngs.values()), dtype=np.float64)
+
+        # Ground truth sorted by (image, category), categories are those with ground truth
+        cats, gt_cat = np.unique(data["gt_cls"].astype(np.int64), return_inverse=True)
+        K = len(cats)
+        i = np.lexsort((gt_cat, gt_img))
+        gt_box, gt_crowd, gt_area, gt_cat = (
+            data["gt_box"][i],
+            data["gt_crowd"][i].astype(bool),
+            data["gt_area"][i],
+            gt_cat[i],
+        )
+        gt_key = gt_img[i] * K + gt_cat
+        gt_ig = gt_crowd[:, None] | (gt_area[:, None] < rngs[:, 0]) | (gt_area[:, None] > rngs[:, 1])  # (Ng, A)
+        npig = np.stack([np.bincount(gt_cat[~gt_ig[:, a]], minlength=K) for a in range(A)], 1)  # (K, A)
+
+        # Detections sorted by (image, category, -score) and truncated to the last maxDets per pair
+        keep = np.isin(data["dt_cls"], cats)
+        dt_box, score, dt_img = data["dt_box"][keep], data["dt_score"][keep], dt_img[keep]
+        dt_cat = np.searchsorted(cats, data["dt_cls"][keep])
+        i = np.lexsort((-score, dt_cat, dt_img))  # stable, equal scores keep their input order
+        dt_box, score, dt_img, dt_cat = dt_box[i], score[i], dt_img[i], dt_cat[i]
+        dt_key = dt_img * K + dt_cat
+        _, first, inverse = np.unique(dt_key, return_index=True, return_inverse=True)
+        rank = np.arange(len(dt_key)) - first[inverse.reshape(-1)]
+        keep = rank < self.max_dets[-1]
+        dt_box, score, dt_img, dt_cat, dt_key, rank = (x[keep] for x in (dt_box, score, dt_img, dt_cat, dt_key, rank))
+        dt_area = (dt_box[:, 2] - dt_box[:, 0]) * (dt_box[:, 3] - dt_box[:, 1])
+        dt_ig = (dt_area[:, None] < rngs[:, 0]) | (dt_area[:, None] > rngs[:, 1])  # (Nd, A)
+
+        # Match all (image, category) pairs in size-sorted batches
+        keys = np.union1d(dt_key, gt_key)
+        ds, gs = np.searchsorted(dt_key, keys), np.searchsorted(gt_key, keys)
+        dn, gn = np.searchsorted(dt_key, keys, side="right") - ds, np.searchsorted(gt_key, keys, side="right") - gs
+        dtm = np.zeros((len(score), A, T), dtype=bool)
+        dtig = np.zeros((len(score), A, T), dtype=bool)
+
+        def match(idx):
+            """Match one batch of pairs and scatter the results to the flat detection arrays."""
+            dr, gr = np.arange(dn[idx].max(initial=0)), np.arange(gn[idx].max(initial=0))
+            dv, gv = dr < dn[idx, None], gr < gn[idx, None]
+            di, gi = np.where(dv, ds[idx, None] + dr, 0), np.where(gv, gs[idx, None] + gr, 0)
+            m, ig = self._match(dt_box, dt_ig, gt_box, gt_crowd, gt_ig, di, dv, gi, gv)
+            dtm[di[dv]], dtig[di[dv]] = m[dv], ig[dv]
+
+        with ThreadPool(NUM_THREADS) as pool:
+            pool.map(match, self._chunks(gn, dn))
+
+        # Accumulate per category over detections from all images in descending score order
+        self.precision = -np.ones((T, R, K, A, M))
+        self.recall = -np.ones((T, K, A, M))
+        i = np.lexsort((rank, dt_img, -score, dt_cat))  # stable sort of the per-image concatenation, as COCOeval
+        bounds = np.searchsorted(dt_cat[i], np.arange(K + 1))
+
+        def accumulate(k):
+            """Compute interpolated precision and recall for one category."""
+            for mi, md in enumerate(self.max_dets):
+                j = i[bounds[k] : bounds[k + 1]]
+                j = j[rank[j] < md]
+                nd = len(j)
+                tp = np.cumsum(dtm[j] & ~dtig[j], 0).astype(float)  # (nd, A, T)
+                fp = np.cumsum(~dtm[j] & ~dtig[j], 0).astype(float)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    rc = tp / npig[k, :, None]
+                pr = tp / (fp + tp + np.spacing(1))
+                pr = np.maximum.accumulate(pr[::-1], 0)[::-1]  # precision envelope
+                for a in np.nonzero(npig[k])[0]:
+                    self.recall[:, k, a, mi] = rc[-1, a] if nd else 0
+                    for t in range(T):
+                        q = np.zeros(R)
+                        ri = np.searchsorted(rc[:, a, t], self.rec_thrs, side="left")
+                        q[ri < nd] = pr[ri[ri < nd], a, t]
+                        self.precision[t, :, k, a, mi] = q
+
+        with ThreadPool(NUM_THREADS) as pool:
+            pool.map(accumulate, range(K))
+
+        self.stats = np.array([self._summarize(*x) for x in self._specs()])
+        return self.stats
+
+    def _specs(self):
+        """Return (ap, iou_thr, area, max_dets) for each of the 12 summary statistics."""
+        m0, m1, m2 = self.max_dets
+        return (
+            (True, None, "all", m2),
+            (True, 0.5, "all", m2),
+            (True, 0.75, "all", m2),
+            (True, None, "small", m2),
+            (True, None, "medium", m2),
+            (True, None, "large", m2),
+            (False, None, "all", m0),
+            (False, None, "all", m1),
+            (False, None, "all", m2),
+            (False, None, "small", m2),
+            (False, None, "medium", m2),
+            (False, None, "large", m2),
+        )
+
+    def _summarize(self, ap, iou_thr, area, max_dets):
+        """Average defined precision or recall values for one IoU threshold (or all), area range and maxDets."""
+        a, m = list(self.area_rngs).index(area), self.max_dets.index(max_dets)
+        s = self.precision[..., a, m] if ap else self.recall[..., a, m]
+        if iou_thr is not None:
+            s = s[np.where(iou_thr == self.iou_thrs)[0]]
+        s = s[s > -1]
+        return float(np.mean(s)) if len(s) else -1.0
+
+    def summary(self):
+        """Return the summary statistics formatted as the COCOeval summary table."""
+        lines = []
+        for (ap, iou_thr, area, max_dets), v in zip(self._specs(), self.stats):
+            iou = f"{self.iou_thrs[0]:0.2f}:{self.iou_thrs[-1]:0.2f}" if iou_thr is None else f"{iou_thr:0.2f}"
+            title, kind = ("Average Precision", "(AP)") if ap else ("Average Recall", "(AR)")
+            lines.append(f" {title:<18} {kind} @[ IoU={iou:<9} | area={area:>6s} | maxDets={max_dets:>3d} ] = {v:0.3f}")
+        return "\n".join(lines)
+
+    @classmethod
+    def from_coco(cls, anno, pred, **kwargs):
+        """
+        Build an evaluator from COCO-format annotations and detection results.
+
+        Args:
+            anno (str | Path | Dict): Annotation JSON file or loaded dict with 'images' and 'annotations'.
+            pred (str | Path | List[Dict]): Result JSON file or loaded list of detections with 'image_id',
+                'category_id', 'bbox' in (x, y, w, h) format and 'score'.
+            **kwargs (Any): Arguments passed to the evaluator.
+
+        Returns:
+            (COCOEvaluator): Evaluator updated with every annotated image.
+        """
+        anno, pred = (json.loads(Path(x).read_text()) if isinstance(x, (str, Path)) else x for x in (anno, pred))
+        gts, dts = defaultdict(list), defaultdict(list)
+        for x in anno["annotations"]:
+            gts[x["image_id"]].append(x)
+        for x in pred:
+            dts[x["image_id"]].append(x)
+
+        def xyxy(boxes):
+            """Convert COCO (x, y, w, h) boxes to (x1, y1, x2, y2)."""
+            b = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+            b[:, 2:] += b[:, :2]
+            return b
+
+        evaluator = cls(**kwargs)
+        for image_id in (x["id"] for x in anno["images"]):
+            g, d = gts[image_id], dts[image_id]
+            evaluator.update(
+                xyxy([x["bbox"] for x in d]),
+                [x["score"] for x in d],
+                [x["category_id"] for x in d],
+                xyxy([x["bbox"] for x in g]),
+                [x["category_id"] for x in g],
+                gt_crowd=[x.get("iscrowd", 0) for x in g],
+                gt_area=[x["area"] for x in g],
+                image_id=image_id,
+            )
+        return evaluator
+
+
 class Metric(SimpleClass):
     """
     Class for computing evaluation metrics for YOLOv8 model.
@@ -814,6 +1401,7 @@ class DetMetrics(SimpleClass):
 
     Methods:
         process(tp, conf, pred_cls, target_cls): Updates the metric results with the latest batch of predictions.
+        process_accumulator(accumulator): Updates the metric results from streamed confidence histograms.
         keys: Returns a list of keys for accessing the computed detection metrics.
         mean_results: Returns a list of mean values for the computed detection metrics.
         class_result(i): Returns a list of values for the computed detection metrics for a specific class.
@@ -849,6 +1437,12 @@ class DetMetrics(SimpleClass):
         self.box.nc = len(self.names)
         self.box.update(results)
 
+    def process_accumulator(self, accumulator, on_plot=None):
+        """Update metrics from an APAccumulator of streamed confidence histograms."""
+        results = accumulator.results(plot=self.plot, save_dir=self.save_dir, names=self.names, on_plot=on_plot)[2:]
+        self.box.nc = len(self.names)
+        self.box.update(results)
+
     @property
     def keys(self):
         """Returns a list of keys for accessing specific metrics."""
@@ -1242,6 +1836,12 @@ class OBBMetrics(SimpleClass):
         self.box.nc = len(self.names)
         self.box.update(results)
 
+    def process_accumulator(self, accumulator, on_plot=None):
+        """Update metrics from an APAccumulator of streamed confidence histograms."""
+        results = accumulator.results(plot=self.plot, save_dir=self.save_dir, names=self.names, on_plot=on_plot)[2:]
+        self.box.nc = len(self.names)
+        self.box.update(results)
+
     @property
     def keys(self):
         """Returns a list of keys for accessing specific metrics."""
@@ -11,7 +11,7 @@ import torch
 import torch.nn.functional as F
 
 from ultralytics.utils import LOGGER
-from ultralytics.utils.metrics import batch_probiou
+from ultralytics.utils.metrics import batch_probiou, probiou
 
 
 class Profile(contextlib.ContextDecorator):
@@ -139,7 +139,7 @@ def make_divisible(x, divisor):
     return math.ceil(x / divisor) * divisor
 
 
-def nms_rotated(boxes, scores, threshold=0.45, use_triu=True):
+def nms_rotated(boxes, scores, threshold=0.45, use_triu=True, sparse=True, chunk=1 << 20):
     """
     NMS for oriented bounding boxes using probiou and fast-nms.
 
@@ -149,12 +149,18 @@ def nms_rotated(boxes, scores, threshold=0.45, use_triu=True):
         threshold (float, optional): IoU threshold. Defaults to 0.45.
         use_triu (bool, optional): Whether to use `torch.triu` operator. It'd be useful for disable it
             when exporting obb models to some formats that do not support `torch.triu`.
+        sparse (bool, optional): Whether to compute probiou only for box pairs that can reach `threshold` instead of
+            the dense (N, N) matrix. Results are identical, but it has data-dependent shapes so must be disabled
+            when exporting. Ignored if `use_triu=False`.
+        chunk (int, optional): Maximum number of box pairs evaluated at once in sparse mode, bounding peak memory.
 
     Returns:
         (torch.Tensor): Indices of boxes to keep after NMS.
     """
     sorted_idx = torch.argsort(scores, descending=True)
     boxes = boxes[sorted_idx]
+    if sparse and use_triu and 0 < threshold < 1:
+        return sorted_idx[_nms_rotated_sparse(boxes, threshold, chunk)]
     ious = batch_probiou(boxes, boxes)
     if use_triu:
         ious = ious.triu_(diagonal=1)
@@ -174,6 +180,52 @@ def nms_rotated(boxes, scores, threshold=0.45, use_triu=True):
     return sorted_idx[pick]
 
 
+def _nms_rotated_sparse(boxes, threshold, chunk):
+    """
+    Fast-NMS for score-sorted oriented bounding boxes that only evaluates probiou for pairs that can overlap.
+
+    probiou >= `threshold` requires a Bhattacharyya distance of at most `bd = -ln(1 - (1 - threshold) ** 2)`, and since
+    that distance is at least 1/8 of the squared Mahalanobis distance between box centers, two boxes can only be
+    suppressed if their centers are closer than the sum of the radii `max(w, h) * sqrt(bd / 3)`. Candidate pairs are
+    found with a sort-and-sweep over these circles along the widest axis, filtered by the exact circle test, and scored
+    with probiou in chunks of at most `chunk` pairs, so the result matches the dense (N, N) computation.
+
+    Args:
+        boxes (torch.Tensor): Rotated bounding boxes sorted by descending score, shape (N, 5), format xywhr.
+        threshold (float): IoU threshold, 0 < threshold < 1.
+        chunk (int): Maximum number of box pairs evaluated at once.
+
+    Returns:
+        (torch.Tensor): Indices of boxes to keep, in score order.
+    """
+    n = boxes.shape[0]
+    device = boxes.device
+    bd = -math.log(1 - (1 - threshold) ** 2)
+    r = boxes[:, 2:4].amax(1) * math.sqrt(bd / 3) * 1.01  # 1% margin for the eps terms in probiou
+    xy = boxes[:, :2]
+    axis = int((xy.amax(0) - xy.amin(0)).argmax()) if n else 0  # sweep along the axis with the widest spread
+    order = (xy[:, axis] - r).argsort()  # sweep order by leading edge
+    lo, hi = (xy[order, axis] - r[order]), (xy[order, axis] + r[order])
+    count = torch.searchsorted(lo, hi, right=True) - torch.arange(1, n + 1, device=device)  # overlaps after each box
+    cum = count.cumsum(0)
+
+    suppressed = torch.zeros(n, dtype=torch.bool, device=device)
+    k0 = 0
+    while k0 < n:
+        start = int(cum[k0] - count[k0])
+        k1 = max(int(torch.searchsorted(cum, start + chunk, right=True)), k0 + 1)  # boxes in this chunk
+        c = count[k0:k1]
+        k = torch.arange(k0, k1, device=device).repeat_interleave(c)  # sweep position of first box in each pair
+        m = k + 1 + torch.arange(len(k), device=device) - (c.cumsum(0) - c).repeat_interleave(c)  # second box
+        i, j = order[k], order[m]
+        close = (xy[i] - xy[j]).pow(2).sum(1) <= (r[i] + r[j]).pow(2)
+        i, j = i[close], j[close]
+        overlap = probiou(boxes[i], boxes[j]).squeeze(-1) >= threshold
+        suppressed[torch.maximum(i, j)[overlap]] = True  # lower-scored box of each overlapping pair
+        k0 = k1
+    return torch.nonzero(~suppressed).squeeze_(-1)
+
+
 def non_max_suppression(
     prediction,
     conf_thres=0.25,
@@ -190,6 +242,7 @@ def non_max_suppression(
     in_place=True,
     rotated=False,
     end2end=False,
+    batched=False,
 ):
     """
     Perform non-maximum suppression (NMS) on a set of boxes, with support for masks and multiple labels per box.
@@ -217,6 +270,10 @@ def non_max_suppression(
         in_place (bool): If True, the input prediction tensor will be modified in place.
         rotated (bool): If Oriented Bounding Boxes (OBB) are being passed for NMS.
         end2end (bool): If the model doesn't require NMS.
+        batched (bool): If True, run a single NMS call over the candidates of all images, offsetting boxes by image
+            index as well as class, instead of looping over images. Removes per-image Python overhead when candidates
+            are few (i.e. predict-time `conf_thres`), but NMS cost grows with the total number of candidates, so
+            low-confidence validation is better served by the default loop. Ignored if apriori `labels` are passed.
 
     Returns:
         (List[torch.Tensor]): A list of length batch_size, where each element is a tensor of
@@ -250,6 +307,11 @@ def non_max_suppression(
     time_limit = 2.0 + max_time_img * bs  # seconds to quit after
     multi_label &= nc > 1  # multiple labels per box (adds 0.5ms/img)
 
+    if batched and not labels:
+        return _batched_nms(
+            prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, max_nms, max_wh, rotated
+        )
+
     prediction = prediction.transpose(-1, -2)  # shape(1,84,6300) to shape(1,6300,84)
     if not rotated:
         if in_place:
@@ -328,6 +390,68 @@ def non_max_suppression(
     return output
 
 
+def _batched_nms(
+    prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, max_nms, max_wh, rotated
+):
+    """
+    Vectorized counterpart of the per-image loop in `non_max_suppression()`, running one NMS call for the whole batch.
+
+    Candidates of all images are gathered into a single set before any other work, so box conversion only touches
+    candidates and `prediction` is never modified. Boxes are offset along x by class (as in the per-image path) and
+    along y by image index so that neither classes nor images suppress each other, then `max_nms` and `max_det` are
+    enforced per image on the score-sorted output.
+
+    Args:
+        prediction (torch.Tensor): Predictions of shape (batch_size, 4 + num_classes + num_masks, num_boxes) with xywh
+            boxes, and a trailing angle if `rotated`.
+        xc (torch.Tensor): Boolean candidate mask of shape (batch_size, num_boxes).
+
+    Returns:
+        (List[torch.Tensor]): Same as `non_max_suppression()`.
+    """
+    import torchvision  # scope for faster 'import ultralytics'
+
+    bs = prediction.shape[0]
+    nm = prediction.shape[1] - nc - 4
+    bi, ai = torch.nonzero(xc, as_tuple=True)  # image and anchor index of candidates
+    box, cls, mask = prediction.transpose(-1, -2)[bi, ai].split((4, nc, nm), 1)
+    if not rotated:
+        box = xywh2xyxy(box)  # xywh to xyxy
+    if multi_label:
+        i, j = torch.where(cls > conf_thres)
+        x, bi = torch.cat((box[i], cls[i, j, None], j[:, None].float(), mask[i]), 1), bi[i]
+    else:  # best class only
+        conf, j = cls.max(1, keepdim=True)
+        i = conf.view(-1) > conf_thres
+        x, bi = torch.cat((box, conf, j.float(), mask), 1)[i], bi[i]
+    if classes is not None:
+        i = (x[:, 5:6] == classes).any(1)
+        x, bi = x[i], bi[i]
+
+    def per_image(i, n):
+        """Keep the first `n` indices `i` of each image, with `i` already sorted by descending score."""
+        i = i[torch.sort(bi[i], stable=True)[1]]  # group by image, preserving score order
+        counts = torch.bincount(bi[i], minlength=bs)
+        rank = torch.arange(len(i), device=i.device) - (counts.cumsum(0) - counts)[bi[i]]
+        return i[rank < n]
+
+    i = per_image(x[:, 4].argsort(descending=True), max_nms)  # sort by confidence and remove excess boxes
+    x, bi = x[i], bi[i]
+
+    # Batched NMS
+    c = x[:, 5] * (0 if agnostic else max_wh)  # classes
+    scores = x[:, 4]  # scores
+    b = bi * max_wh  # images
+    if rotated:
+        boxes = torch.cat((x[:, :1] + c[:, None], x[:, 1:2] + b[:, None], x[:, 2:4], x[:, -1:]), dim=-1)  # xywhr
+        i = nms_rotated(boxes, scores, iou_thres)
+    else:
+        boxes = x[:, :4] + torch.stack((c, b, c, b), 1)  # boxes (offset by class and image)
+        i = torchvision.ops.nms(boxes, scores, iou_thres)  # NMS
+    i = per_image(i, max_det)  # limit detections
+    return list(x[i].split(torch.bincount(bi[i], minlength=bs).tolist()))
+
+
 def clip_boxes(boxes, shape):
     """
     Takes a list of bounding boxes and a shape (height, width) and clips the bounding boxes to the shape.